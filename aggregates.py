@@ -0,0 +1,128 @@
+from collections import Counter, defaultdict
+import pandas as pd
+
+from aspects import parse_aspects
+
+# Bucket for rows that haven't been scored yet; never reported as a sentiment
+UNSCORED = "UNSCORED"
+
+def _days(dates):
+    """Calendar day (YYYY-MM-DD) of each date string, parsing every distinct value only once"""
+    values = dates.astype(object)
+    uniques = pd.unique(values.dropna())
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors="coerce", format="mixed")
+    lookup = dict(zip(uniques, parsed.dt.strftime("%Y-%m-%d").fillna("Unknown")))
+    return values.map(lookup).fillna("Unknown")
+
+class ReviewAggregates:
+    """Running review statistics, updated from the rows added or removed instead of rescanning the dataset"""
+
+    def __init__(self):
+        self.total = 0
+        self.counts = Counter()
+        self.confidence_sums = defaultdict(float)
+        self.confidence_counts = Counter()
+        self.by_source = defaultdict(Counter)
+        self.by_day = defaultdict(Counter)
+        self.by_aspect = defaultdict(Counter)  # (source, aspect) -> sentiment counts
+
+    @classmethod
+    def from_frame(cls, df):
+        aggregates = cls()
+        aggregates.add_frame(df)
+        return aggregates
+
+    def add_frame(self, df):
+        self._update(df, 1)
+
+    def remove_frame(self, df):
+        self._update(df, -1)
+
+    def add_rows(self, rows, columns):
+        """Add rows laid out like the given columns, e.g. a batch of scraper results"""
+        self.add_frame(pd.DataFrame(rows, columns=columns))
+
+    def _update(self, df, sign):
+        if df is None or len(df) == 0:
+            return
+        sentiment = df["sentiment"].astype(object)
+        frame = pd.DataFrame({
+            "sentiment": sentiment.where(sentiment.notna(), UNSCORED),
+            "confidence": pd.to_numeric(df["confidence"], errors="coerce").astype("float64"),
+            "source": df["source"].astype(object).fillna("Unknown"),
+            "day": _days(df["date"]),
+        })
+        self.total += sign * len(frame)
+
+        # One grouped pass per breakdown; only the group totals touch the running counters
+        by_sentiment = frame.groupby("sentiment", sort=False)["confidence"].agg(["size", "sum", "count"])
+        for label, size, confidence_sum, confidence_count in by_sentiment.itertuples():
+            self.counts[label] += sign * int(size)
+            self.confidence_sums[label] += sign * float(confidence_sum)
+            self.confidence_counts[label] += sign * int(confidence_count)
+        for (source, label), size in frame.groupby(["source", "sentiment"], sort=False).size().items():
+            self.by_source[source][label] += sign * int(size)
+        for (day, label), size in frame.groupby(["day", "sentiment"], sort=False).size().items():
+            self.by_day[day][label] += sign * int(size)
+        if "aspects" in df.columns:
+            # Few distinct aspect strings exist, so each is parsed once per source
+            aspects = pd.DataFrame({"source": frame["source"], "aspects": df["aspects"].astype(object)}).dropna()
+            for (source, value), size in aspects.groupby(["source", "aspects"], sort=False).size().items():
+                for aspect, label in parse_aspects(value):
+                    self.by_aspect[(source, aspect)][label] += sign * int(size)
+
+        if sign < 0:
+            self._prune()
+
+    def _prune(self):
+        # Drop groups whose rows have all been removed
+        for label in [label for label, count in self.counts.items() if count <= 0]:
+            del self.counts[label]
+            self.confidence_sums.pop(label, None)
+            self.confidence_counts.pop(label, None)
+        for breakdown in (self.by_source, self.by_day, self.by_aspect):
+            for key in list(breakdown):
+                breakdown[key] = +breakdown[key]  # unary plus drops zero counts
+                if not breakdown[key]:
+                    del breakdown[key]
+
+    def sentiment_counts(self):
+        """Reviews per sentiment label, largest first (unscored rows are left out)"""
+        counts = {label: count for label, count in self.counts.items() if label != UNSCORED}
+        return pd.Series(counts, dtype="int64").sort_values(ascending=False)
+
+    @property
+    def unscored(self):
+        return self.counts.get(UNSCORED, 0)
+
+    def mean_confidence(self, sentiment=None):
+        """Mean model confidence overall or for one sentiment, or None without any scores"""
+        if sentiment is None:
+            labels = [label for label in self.confidence_counts if label != UNSCORED]
+        else:
+            labels = [sentiment]
+        count = sum(self.confidence_counts.get(label, 0) for label in labels)
+        if count == 0:
+            return None
+        return sum(self.confidence_sums.get(label, 0.0) for label in labels) / count
+
+    def _breakdown(self, groups):
+        frame = pd.DataFrame.from_dict({key: dict(counts) for key, counts in groups.items()}, orient="index")
+        frame = frame.drop(columns=[UNSCORED], errors="ignore").fillna(0).astype("int64")
+        return frame.sort_index().sort_index(axis=1)
+
+    def source_breakdown(self):
+        """DataFrame of review counts with one row per source and one column per sentiment"""
+        return self._breakdown(self.by_source)
+
+    def daily_breakdown(self):
+        """DataFrame of review counts with one row per day and one column per sentiment"""
+        return self._breakdown(self.by_day)
+
+    def aspect_breakdown(self, source=None):
+        """DataFrame of aspect mentions with one row per aspect and one column per sentiment, for one or all sources"""
+        by_aspect = defaultdict(Counter)
+        for (aspect_source, aspect), counts in self.by_aspect.items():
+            if source is None or aspect_source == source:
+                by_aspect[aspect].update(counts)
+        return self._breakdown(by_aspect)
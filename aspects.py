@@ -0,0 +1,106 @@
+import re
+import bisect
+
+# Terms that tag a sentence with an aspect; a trailing * matches any word ending
+ASPECT_LEXICON = {
+    "delivery": [
+        "deliver*", "shipping", "shipped", "shipment*", "dispatch*", "arriv*", "courier*", "parcel*",
+        "package*", "tracking", "late", "delay*", "on time",
+    ],
+    "price": [
+        "price*", "pricing", "cost*", "expensive", "cheap*", "overpriced", "overcharg*", "value for money",
+        "worth the money", "fee*", "discount*", "afford*",
+    ],
+    "quality": [
+        "quality", "damaged", "broken", "broke", "defect*", "faulty", "material*", "durab*", "flimsy",
+        "sturdy", "well made", "poorly made", "stopped working", "fell apart",
+    ],
+    "support": [
+        "customer service", "customer care", "support", "help desk", "helpline", "refund*", "return*",
+        "agent*", "representative*", "staff", "complain*", "respond*", "response*", "replacement",
+    ],
+}
+ASPECTS = list(ASPECT_LEXICON)
+
+def _term_pattern(term):
+    if term.endswith("*"):
+        return re.escape(term[:-1]) + r"\w*"
+    return re.escape(term).replace(r"\ ", r"\s+")
+
+# One alternation per aspect as a named group, so a single scan finds every aspect in a text;
+# the shared leading \b lets most positions fail before any term is tried
+ASPECT_REGEX = re.compile(
+    r"\b(?:" + "|".join(
+        rf"(?P<{aspect}>{'|'.join(_term_pattern(term) for term in terms)})"
+        for aspect, terms in ASPECT_LEXICON.items()
+    ) + r")\b",
+    re.IGNORECASE,
+)
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def find_aspect_mentions(texts, max_words=60):
+    """
+    Sentences of each text that mention an aspect.
+
+    Each text is scanned once; only texts with a lexicon match are split into sentences, and
+    every match is attributed to the sentence it falls in.
+
+    Returns:
+        list: (text index, aspect, sentence) tuples; a sentence naming two aspects appears once for each
+    """
+    mentions = []
+    for position, text in enumerate(texts):
+        if not isinstance(text, str):
+            continue
+        matches = [(match.start(), match.lastgroup) for match in ASPECT_REGEX.finditer(text)]
+        if not matches:
+            continue
+        boundaries = [boundary.span() for boundary in SENTENCE_BOUNDARY.finditer(text)]
+        ends = [start for start, _ in boundaries] + [len(text)]
+        starts = [0] + [end for _, end in boundaries]
+        found = {}
+        for start, aspect in matches:
+            sentence = bisect.bisect_right(ends, start)
+            found.setdefault(sentence, set()).add(aspect)
+        for sentence, aspects in found.items():
+            words = text[starts[sentence]:ends[sentence]].split()[:max_words]
+            mentions.extend((position, aspect, " ".join(words)) for aspect in ASPECTS if aspect in aspects)
+    return mentions
+
+def combine_aspects(mentions, scores, count):
+    """
+    One label per aspect and text from the scores of its sentences.
+
+    When a review mentions an aspect in several sentences, the label with the highest total
+    confidence wins.
+
+    Args:
+        mentions (list): (text index, aspect, sentence) tuples from find_aspect_mentions
+        scores (list): (sentiment, confidence) of each mention's sentence
+        count (int): Number of texts
+
+    Returns:
+        list: Aspect string of each text (see format_aspects), None where no aspect was mentioned
+    """
+    totals = [None] * count
+    for (position, aspect, _), (sentiment, confidence) in zip(mentions, scores):
+        if totals[position] is None:
+            totals[position] = {}
+        by_label = totals[position].setdefault(aspect, {})
+        by_label[sentiment] = by_label.get(sentiment, 0.0) + float(confidence)
+    return [
+        None if by_aspect is None else
+        format_aspects({aspect: max(by_label, key=by_label.get) for aspect, by_label in by_aspect.items()})
+        for by_aspect in totals
+    ]
+
+def format_aspects(labels):
+    """Compact column value for {aspect: sentiment}, e.g. 'delivery:NEGATIVE;price:POSITIVE'"""
+    return ";".join(f"{aspect}:{labels[aspect]}" for aspect in sorted(labels))
+
+def parse_aspects(value):
+    """(aspect, sentiment) pairs of an aspects column value; empty for missing values"""
+    if not isinstance(value, str) or not value:
+        return []
+    return [tuple(item.split(":", 1)) for item in value.split(";")]
@@ -0,0 +1,100 @@
+"""Benchmark the vectorized clean_csv_data against the original row-by-row implementation.
+
+Usage: python benchmark_cleaning.py [rows]
+"""
+import re
+import sys
+import time
+import numpy as np
+import pandas as pd
+from utils import clean_csv_data
+
+SAMPLE_TEXTS = [
+    "This product exceeded my expectations! The quality is outstanding and delivery was super fast.",
+    "Terrible experience. The item arrived damaged and customer service was unhelpful.",
+    "It's okay, nothing special. Does what it's supposed to do but doesn't stand out.",
+    "Shop by Price Under 999 Above 4999",
+    "boAt Headphones with 40mm drivers",
+    "Rockerz 450 Pro Wireless Headphone | Bluetooth v5.0 | 15 Hours Playback",
+    "© 2024 Imagine Marketing Limited. All Rights Reserved",
+    "Q. Does it support fast charging?",
+    "Get 20% OFF on your first order",
+    "Home Cart",
+    "search",
+    "Equipped with a 500 mAh battery and Bluetooth 5.3, these earbuds deliver up to 40 hours of playback "
+    "and feature ENx technology for crystal clear calls.",
+    "Great sound for the price, battery easily lasts a week of commuting. Would buy again.",
+    "Most Recent Highest Rating Lowest Rating",
+    None,
+]
+
+def legacy_clean_csv_data(df):
+    """The original per-row implementation, kept here for comparison"""
+    non_review_patterns = [
+        r'^Shop by (Price|Features|Identity)',
+        r'Under \d+',
+        r'Above \d+',
+        r'^[a-zA-Z]+ (Headphones|Speakers|Earbuds|Soundbars|Smartwatch|Power Bank)',
+        r'^\w+ [A-Z]\w+ \d+',
+        r'^© \d+ .* All Rights Reserved',
+        r'^Address Unit No',
+        r'^For Consumer Complaints',
+        r'^Q\.\s',
+        r'^Net Content \d+ UNIT',
+        r'^Get \d+% OFF',
+        r'^Redeem upto \d+% off',
+        r'^Most Recent Highest Rating Lowest Rating',
+        r'^Download user manual',
+    ]
+
+    def is_not_review(text):
+        if not isinstance(text, str):
+            return True
+        for pattern in non_review_patterns:
+            if re.search(pattern, text):
+                return True
+        if len(text) > 100 and ('mAh' in text or 'Bluetooth' in text) and ('hours' in text.lower() or 'playback' in text.lower()):
+            product_spec_indicators = ['equipped with', 'designed for', 'features', 'technology', 'battery capacity']
+            if any(indicator in text.lower() for indicator in product_spec_indicators):
+                return True
+        nav_elements = ['home', 'about', 'contact', 'login', 'register', 'cart', 'checkout', 'search']
+        words = text.lower().split()
+        if len(words) <= 3 and any(word in nav_elements for word in words):
+            return True
+        if text.count('|') > 0 and ('wireless' in text.lower() or 'bluetooth' in text.lower()):
+            return True
+        return False
+
+    original_count = len(df)
+    df_cleaned = df[~df['text'].apply(is_not_review)]
+    return df_cleaned, original_count - len(df_cleaned)
+
+def make_frame(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    texts = np.array(SAMPLE_TEXTS, dtype=object)[rng.integers(0, len(SAMPLE_TEXTS), rows)]
+    # Append a row number so the frame isn't just a handful of repeated strings
+    suffixes = rng.integers(0, 1_000_000, rows).astype(str)
+    texts = [text if text is None else f"{text} {suffix}" for text, suffix in zip(texts, suffixes)]
+    return pd.DataFrame({"text": pd.Series(texts, dtype=object), "sentiment": "POSITIVE"})
+
+def main(rows=1_000_000):
+    df = make_frame(rows)
+    print(f"Benchmarking clean_csv_data on {rows:,} rows")
+
+    start = time.perf_counter()
+    legacy_df, legacy_removed = legacy_clean_csv_data(df)
+    legacy_time = time.perf_counter() - start
+    print(f"  row-by-row: {legacy_time:.2f}s ({legacy_removed:,} removed)")
+
+    start = time.perf_counter()
+    vectorized_df, vectorized_removed = clean_csv_data(df)
+    vectorized_time = time.perf_counter() - start
+    print(f"  vectorized: {vectorized_time:.2f}s ({vectorized_removed:,} removed)")
+
+    identical = legacy_df.index.equals(vectorized_df.index)
+    print(f"  identical results: {identical}")
+    print(f"  speedup: {legacy_time / vectorized_time:.1f}x")
+    return 0 if identical else 1
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,132 @@
+import io
+from collections import OrderedDict
+import matplotlib.style as mplstyle
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from wordcloud import WordCloud
+from PyQt5.QtCore import QThread, pyqtSignal
+
+CHART_DPI = 300
+
+SENTIMENT_COLORS = {"POSITIVE": "#4CAF50", "NEGATIVE": "#F44336"}
+NEUTRAL_COLOR = "#FF9800"
+
+WORDCLOUD_COLORMAPS = {"POSITIVE": "Greens", "NEGATIVE": "Reds"}
+
+def _png_bytes(fig, dpi):
+    # Figures drawn through the Agg canvas directly never touch pyplot's global state or the GUI
+    FigureCanvasAgg(fig)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+def render_sentiment_chart(sentiment_counts, dpi=CHART_DPI):
+    """Bar and pie chart of the sentiment distribution, returned as PNG bytes"""
+    with mplstyle.context("seaborn-v0_8"):
+        fig = Figure(figsize=(15, 6))
+        ax1, ax2 = fig.subplots(1, 2)
+
+        # Bar chart
+        colors = [SENTIMENT_COLORS.get(label, NEUTRAL_COLOR) for label in sentiment_counts.index]
+        bars = ax1.bar(sentiment_counts.index, sentiment_counts.values, color=colors, alpha=0.8)
+
+        # Add count labels on top of bars
+        for bar in bars:
+            height = bar.get_height()
+            ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                     f'{int(height)}', ha='center', va='bottom', fontweight='bold')
+
+        ax1.set_title("Sentiment Distribution", fontsize=14, fontweight='bold')
+        ax1.set_xlabel("Sentiment", fontweight='bold')
+        ax1.set_ylabel("Count", fontweight='bold')
+        ax1.grid(True, alpha=0.3)
+
+        # Pie chart
+        ax2.pie(sentiment_counts.values, labels=sentiment_counts.index, colors=colors,
+                autopct='%1.1f%%', startangle=90, textprops={'fontweight': 'bold'})
+        ax2.set_title("Sentiment Percentage", fontsize=14, fontweight='bold')
+
+        fig.tight_layout()
+        return _png_bytes(fig, dpi)
+
+def render_wordcloud(frequencies, choice, dpi=CHART_DPI):
+    """Word cloud from precomputed token frequencies, returned as PNG bytes"""
+    wordcloud = WordCloud(
+        width=1200, height=600,
+        background_color="white",
+        max_words=150,
+        colormap=WORDCLOUD_COLORMAPS.get(choice, "viridis"),
+        relative_scaling=0.5,
+        min_font_size=10
+    ).generate_from_frequencies(frequencies)
+
+    fig = Figure(figsize=(15, 8))
+    ax = fig.subplots()
+    ax.imshow(wordcloud, interpolation="bilinear")
+    ax.axis("off")
+    ax.set_title(f"Word Cloud - {choice.title()} Reviews", fontsize=16, fontweight='bold', pad=20)
+    fig.tight_layout()
+    return _png_bytes(fig, dpi)
+
+def render_trend_chart(trends, dpi=CHART_DPI):
+    """Rolling sentiment ratios and confidence-weighted score over time, returned as PNG bytes"""
+    with mplstyle.context("seaborn-v0_8"):
+        fig = Figure(figsize=(15, 8))
+        ax1, ax2 = fig.subplots(2, 1, sharex=True)
+
+        ax1.plot(trends.index, trends["positive_ratio"] * 100, color=SENTIMENT_COLORS["POSITIVE"],
+                 linewidth=2, label="Positive")
+        ax1.plot(trends.index, trends["negative_ratio"] * 100, color=SENTIMENT_COLORS["NEGATIVE"],
+                 linewidth=2, label="Negative")
+        ax1.set_title("Sentiment Share Over Time (rolling)", fontsize=14, fontweight='bold')
+        ax1.set_ylabel("Share of Reviews (%)", fontweight='bold')
+        ax1.set_ylim(0, 100)
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+
+        ax2.plot(trends.index, trends["score"], color="#2196F3", linewidth=2)
+        ax2.axhline(0, color="#6c757d", linewidth=1)
+        ax2.set_title("Confidence-Weighted Sentiment Score", fontsize=14, fontweight='bold')
+        ax2.set_ylabel("Score (-1 to 1)", fontweight='bold')
+        ax2.set_ylim(-1, 1)
+        ax2.grid(True, alpha=0.3)
+
+        fig.tight_layout()
+        return _png_bytes(fig, dpi)
+
+class ChartCache:
+    """Rendered charts keyed by dataset version and chart parameters, least recently used dropped first"""
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+class ChartRenderThread(QThread):
+    """Render a chart to PNG bytes off the GUI thread"""
+    finished_signal = pyqtSignal(object, bytes)  # cache key, PNG data
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, key, render, *args, **kwargs):
+        super().__init__()
+        self.key = key
+        self.render = render
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            self.finished_signal.emit(self.key, self.render(*self.args, **self.kwargs))
+        except Exception as e:
+            self.error_signal.emit(f"Failed to render chart:\n\n{str(e)}")
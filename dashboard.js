@@ -46,12 +46,75 @@ let reviewsPerPage = 10;
 let sentimentChart = null;
 let timelineChart = null;
 
+// Exported data (summary.json plus paged review shards), when the Python app has written it
+let dataSummary = null;
+let shardKey = 'all';
+let shardOrder = 'newest';
+let shardPagesLoaded = 0;
+// Bumped whenever the filter or sort order changes, so shards fetched for an earlier one are dropped
+let shardGeneration = 0;
+// The shard request in flight, shared by callers of the same generation so a page isn't appended twice
+let shardRequest = null;
+
 // Initialize dashboard when page loads
-document.addEventListener('DOMContentLoaded', function() {
+document.addEventListener('DOMContentLoaded', async function() {
+    await loadExportedSummary();
     initializeDashboard();
     setupEventListeners();
 });
 
+async function loadExportedSummary() {
+    try {
+        const response = await fetch('data/summary.json');
+        if (!response.ok) return;
+        dataSummary = await response.json();
+        shardOrder = document.getElementById('sortOrder').value;
+        resetShards();
+        await fetchNextShard();
+    } catch (error) {
+        // No exported data, keep showing the sample reviews
+        dataSummary = null;
+    }
+}
+
+function resetShards() {
+    shardGeneration++;
+    shardPagesLoaded = 0;
+    currentData = [];
+}
+
+function fetchNextShard() {
+    if (!shardRequest || shardRequest.generation !== shardGeneration) {
+        const request = { generation: shardGeneration };
+        request.promise = fetchShard(request.generation).finally(() => {
+            if (shardRequest === request) shardRequest = null;
+        });
+        shardRequest = request;
+    }
+    return shardRequest.promise;
+}
+
+async function fetchShard(generation) {
+    const shard = dataSummary.shards[shardKey];
+    if (!shard || shardPagesLoaded >= shard.pages) return false;
+    const response = await fetch(`data/reviews-${shardKey.toLowerCase()}-${shardOrder}-${shardPagesLoaded}.json`);
+    if (!response.ok) return false;
+    const reviews = await response.json();
+    // The filter or order changed while this shard was in flight
+    if (generation !== shardGeneration) return false;
+    currentData = currentData.concat(reviews);
+    shardPagesLoaded++;
+    return true;
+}
+
+function totalReviewCount() {
+    // With shards only some pages are loaded, so the total comes from the summary
+    if (dataSummary && dataSummary.shards[shardKey]) {
+        return dataSummary.shards[shardKey].count;
+    }
+    return currentData.length;
+}
+
 function initializeDashboard() {
     updateLastUpdated();
     updateStatistics();
@@ -89,8 +152,28 @@ function updateLastUpdated() {
     document.getElementById('lastUpdated').textContent = timeString;
 }
 
+function currentStatistics() {
+    if (!dataSummary) return calculateStatistics(currentData);
+    
+    const counts = dataSummary.counts;
+    const total = shardKey === 'all' ? dataSummary.total : totalReviewCount();
+    const positive = shardKey === 'all' || shardKey === 'POSITIVE' ? counts.POSITIVE : 0;
+    const negative = shardKey === 'all' || shardKey === 'NEGATIVE' ? counts.NEGATIVE : 0;
+    const neutral = shardKey === 'all' || shardKey === 'NEUTRAL' ? counts.NEUTRAL : 0;
+    return {
+        total,
+        positive,
+        negative,
+        neutral,
+        positivePercent: total > 0 ? Math.round((positive / total) * 100) : 0,
+        negativePercent: total > 0 ? Math.round((negative / total) * 100) : 0,
+        neutralPercent: total > 0 ? Math.round((neutral / total) * 100) : 0,
+        avgConfidence: Math.round((dataSummary.mean_confidence || 0) * 100)
+    };
+}
+
 function updateStatistics() {
-    const stats = calculateStatistics(currentData);
+    const stats = currentStatistics();
     
     document.getElementById('totalCount').textContent = stats.total;
     document.getElementById('positiveCount').textContent = stats.positive;
@@ -131,7 +214,7 @@ function initializeCharts() {
 
 function initializeSentimentChart() {
     const ctx = document.getElementById('sentimentChart').getContext('2d');
-    const stats = calculateStatistics(currentData);
+    const stats = currentStatistics();
     
     sentimentChart = new Chart(ctx, {
         type: 'pie',
@@ -252,6 +335,15 @@ function initializeTimelineChart() {
 }
 
 function prepareTimelineData(data) {
+    if (dataSummary) {
+        // Daily buckets were precomputed by the exporter
+        const series = key => dataSummary.timeline.map(bucket => ({
+            x: new Date(bucket.date),
+            y: shardKey === 'all' || shardKey.toLowerCase() === key ? bucket[key] : 0
+        }));
+        return { positive: series('positive'), negative: series('negative'), neutral: series('neutral') };
+    }
+    
     const groupedData = {};
     
     data.forEach(review => {
@@ -286,7 +378,7 @@ function updateSentimentChart(type) {
     sentimentChart.destroy();
     
     const ctx = document.getElementById('sentimentChart').getContext('2d');
-    const stats = calculateStatistics(currentData);
+    const stats = currentStatistics();
     
     const chartConfig = {
         data: {
@@ -375,11 +467,12 @@ function renderReviews() {
     
     // Update load more button
     const loadMoreBtn = document.getElementById('loadMoreBtn');
-    if (endIndex >= currentData.length) {
+    const total = totalReviewCount();
+    if (endIndex >= total) {
         loadMoreBtn.style.display = 'none';
     } else {
         loadMoreBtn.style.display = 'block';
-        loadMoreBtn.textContent = `Load More Reviews (${currentData.length - endIndex} remaining)`;
+        loadMoreBtn.textContent = `Load More Reviews (${total - endIndex} remaining)`;
     }
 }
 
@@ -410,10 +503,18 @@ function createReviewCard(review) {
     return card;
 }
 
-function filterReviews() {
+async function filterReviews() {
     const filter = document.getElementById('sentimentFilter').value;
     
-    if (filter === 'all') {
+    if (dataSummary) {
+        // Each filter has its own shards; start again from its first page
+        shardKey = filter;
+        resetShards();
+        const generation = shardGeneration;
+        await fetchNextShard();
+        // A later filter or sort change renders its own results
+        if (generation !== shardGeneration) return;
+    } else if (filter === 'all') {
         currentData = sampleData.reviews;
     } else {
         currentData = sampleData.reviews.filter(review => review.sentiment === filter);
@@ -425,9 +526,21 @@ function filterReviews() {
     renderReviews();
 }
 
-function sortReviews() {
+async function sortReviews() {
     const sortOrder = document.getElementById('sortOrder').value;
     
+    if (dataSummary) {
+        // Only some shards are loaded, so the export's presorted shards are fetched instead
+        shardOrder = sortOrder;
+        resetShards();
+        const generation = shardGeneration;
+        await fetchNextShard();
+        if (generation !== shardGeneration) return;
+        currentPage = 0;
+        renderReviews();
+        return;
+    }
+    
     currentData.sort((a, b) => {
         switch (sortOrder) {
             case 'newest':
@@ -445,14 +558,20 @@ function sortReviews() {
     renderReviews();
 }
 
-function loadMoreReviews() {
+async function loadMoreReviews() {
     currentPage++;
+    // Fetch the next shard when the loaded reviews don't fill the next page
+    if (dataSummary && (currentPage + 1) * reviewsPerPage > currentData.length) {
+        const generation = shardGeneration;
+        await fetchNextShard();
+        if (generation !== shardGeneration) return;
+    }
     renderReviews();
 }
 
 function updateCharts() {
     if (sentimentChart) {
-        const stats = calculateStatistics(currentData);
+        const stats = currentStatistics();
         sentimentChart.data.datasets[0].data = [stats.positive, stats.negative, stats.neutral];
         sentimentChart.update();
     }
@@ -468,6 +587,8 @@ function updateCharts() {
 
 // Function to load real data (would be called from your Python app)
 function loadRealData(reviewsData) {
+    dataSummary = null;
+    shardGeneration++;
     sampleData.reviews = reviewsData;
     currentData = reviewsData;
     currentPage = 0;
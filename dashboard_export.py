@@ -0,0 +1,142 @@
+import os
+import glob
+import gzip
+import json
+from datetime import datetime
+import pandas as pd
+
+from aggregates import ReviewAggregates
+from trends import sentiment_trends
+
+try:
+    import brotli
+except ImportError:  # Brotli shards are optional; gzip is always written
+    brotli = None
+
+# Vite's build output; run the export after `npm run build`, which empties dist
+DEFAULT_EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dist", "data")
+
+SENTIMENT_LABELS = ["POSITIVE", "NEGATIVE", "NEUTRAL"]
+
+# The dashboard's sort orders, as (column, ascending); shards are written presorted for each,
+# since only some pages are ever loaded in the browser
+SORT_ORDERS = {
+    "newest": ("date", False),
+    "oldest": ("date", True),
+    "confidence": ("confidence", False),
+}
+
+def _iso_dates(dates):
+    """ISO 8601 timestamps for the dashboard, parsing every distinct date string once"""
+    values = dates.astype(object)
+    uniques = pd.unique(values.dropna())
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors="coerce", format="mixed")
+    lookup = dict(zip(uniques, parsed.dt.strftime("%Y-%m-%dT%H:%M:%S")))
+    return values.map(lookup)
+
+def _write_json(path, payload, compress=True):
+    """Write compact JSON plus precompressed .gz/.br siblings for static hosting"""
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    if compress:
+        with open(path + ".gz", "wb") as f:
+            f.write(gzip.compress(data, compresslevel=9))
+        if brotli is not None:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(data, quality=11))
+    return len(data)
+
+def _shard_frame(df):
+    frame = pd.DataFrame({
+        "text": df["text"].astype(object),
+        "sentiment": df["sentiment"].astype(object),
+        "confidence": pd.to_numeric(df["confidence"], errors="coerce").astype("float64").round(3),
+        "date": _iso_dates(df["date"]),
+        "source": df["source"].astype(object),
+    })
+    return frame[frame["sentiment"].notna() & frame["text"].notna()]
+
+def export_dashboard_data(df, out_dir=DEFAULT_EXPORT_DIR, aggregates=None, page_size=100, compress=True, trends=None):
+    """
+    Write the dashboard's data files: a summary with precomputed aggregates and paged review shards.
+
+    Shards are written for all reviews and for each sentiment, in every sort order, so the dashboard
+    can page through a filter in the chosen order without downloading the rest of the dataset.
+
+    Args:
+        df (DataFrame): Review dataset laid out like REVIEW_COLUMNS
+        out_dir (str): Directory the dashboard fetches data/ files from
+        aggregates (ReviewAggregates): Running statistics for df, computed here when not given
+        page_size (int): Reviews per shard
+        compress (bool): Also write gzip (and brotli, if installed) copies of every file
+        trends (DataFrame): Daily rolling trends from sentiment_trends, computed here when not given
+
+    Returns:
+        dict: The summary that was written
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    # Remove shards from a previous export so stale pages can't be fetched
+    for path in glob.glob(os.path.join(out_dir, "reviews-*.json*")) + glob.glob(os.path.join(out_dir, "summary.json*")):
+        os.remove(path)
+
+    if aggregates is None:
+        aggregates = ReviewAggregates.from_frame(df)
+    counts = aggregates.sentiment_counts()
+    mean_confidence = aggregates.mean_confidence()
+    daily = aggregates.daily_breakdown().reindex(columns=SENTIMENT_LABELS, fill_value=0)
+    daily = daily.drop(index="Unknown", errors="ignore")
+
+    if trends is None:
+        trends = sentiment_trends(df, freq="D", window=7)
+    trends = trends[["positive_ratio", "negative_ratio", "score"]].round(4).astype(object)
+    trends = trends.where(trends.notna(), None)
+
+    frame = _shard_frame(df)
+    shards = {}
+    for order, (column, ascending) in SORT_ORDERS.items():
+        # Rows without a date or confidence go last in every order
+        ordered = frame.sort_values(column, ascending=ascending, na_position="last", kind="stable")
+        ordered = ordered.astype(object).where(ordered.notna(), None)
+        for key in ["all"] + SENTIMENT_LABELS:
+            selected = ordered if key == "all" else ordered[ordered["sentiment"] == key]
+            records = selected.to_dict("records")
+            pages = 0
+            for start in range(0, len(records), page_size):
+                _write_json(os.path.join(out_dir, f"reviews-{key.lower()}-{order}-{pages}.json"),
+                            records[start:start + page_size], compress)
+                pages += 1
+            shards[key] = {"count": len(records), "pages": pages}
+
+    summary = {
+        "generated_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        "page_size": page_size,
+        "total": int(counts.sum()),
+        "counts": {label: int(counts.get(label, 0)) for label in SENTIMENT_LABELS},
+        "mean_confidence": None if mean_confidence is None else round(mean_confidence, 4),
+        "timeline": [
+            {"date": day, "positive": int(row.POSITIVE), "negative": int(row.NEGATIVE), "neutral": int(row.NEUTRAL)}
+            for day, row in daily.iterrows()
+        ],
+        "trend": [
+            {"date": f"{day:%Y-%m-%d}", "positive_ratio": row.positive_ratio,
+             "negative_ratio": row.negative_ratio, "score": row.score}
+            for day, row in zip(trends.index, trends.itertuples(index=False))
+        ],
+        "sources": {
+            source: int(total)
+            for source, total in aggregates.source_breakdown()
+                .reindex(columns=SENTIMENT_LABELS, fill_value=0).sum(axis=1).items()
+        },
+        "aspects": {
+            source: {
+                aspect: {label: int(row[label]) for label in SENTIMENT_LABELS if label in row.index}
+                for aspect, row in aggregates.aspect_breakdown(source).iterrows()
+            }
+            for source in sorted({source for source, _ in aggregates.by_aspect})
+        },
+        "sort_orders": list(SORT_ORDERS),
+        "shards": shards,
+    }
+    _write_json(os.path.join(out_dir, "summary.json"), summary, compress)
+    return summary
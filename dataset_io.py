@@ -0,0 +1,185 @@
+import os
+import pandas as pd
+
+# Column layout of a review dataset, matching the rows produced by process_review_batch
+REVIEW_COLUMNS = ["text", "sentiment", "source", "date", "user_id", "location", "confidence", "model_version", "aspects"]
+
+# Low-cardinality columns stored dictionary-encoded in columnar files
+CATEGORICAL_COLUMNS = ["sentiment", "source"]
+
+# Columns kept as categoricals in memory: each distinct string is stored once and rows
+# hold small integer codes (int8 for the handful of sentiment labels)
+COMPACT_CATEGORICAL_COLUMNS = ["sentiment", "source", "user_id", "location", "model_version", "aspects"]
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+FEATHER_EXTENSIONS = (".feather", ".arrow", ".ipc")
+
+FILE_DIALOG_FILTER = (
+    "Review Data (*.csv *.parquet *.pq *.feather *.arrow);;"
+    "CSV Files (*.csv);;"
+    "Parquet Files (*.parquet *.pq);;"
+    "Feather Files (*.feather *.arrow);;"
+    "All Files (*)"
+)
+EXPORT_DIALOG_FILTER = "CSV Files (*.csv);;Parquet Files (*.parquet);;Feather Files (*.feather);;All Files (*)"
+
+def file_format(path):
+    """Return 'parquet', 'feather' or 'csv' based on the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        return "parquet"
+    if extension in FEATHER_EXTENSIONS:
+        return "feather"
+    return "csv"
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet and Feather files need the pyarrow package (pip install pyarrow)")
+
+def _existing_columns(available, columns):
+    if columns is None:
+        return None
+    return [col for col in columns if col in available]
+
+def _as_categories(df):
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+def compact_reviews(df):
+    """Shrink a review DataFrame in place: categorical labels and float32 confidence.
+
+    Dates are made categorical too when most rows share a timestamp, as they do for scrapes.
+    """
+    for col in COMPACT_CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    if "date" in df.columns and not isinstance(df["date"].dtype, pd.CategoricalDtype):
+        if df["date"].nunique() <= len(df) // 2:
+            df["date"] = df["date"].astype("category")
+    if "confidence" in df.columns:
+        df["confidence"] = pd.to_numeric(df["confidence"], errors="coerce").astype("float32")
+    return df
+
+def concat_reviews(frames):
+    """Concatenate compacted chunks, merging their categories instead of falling back to objects"""
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=REVIEW_COLUMNS)
+    for col in frames[0].columns:
+        if all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = pd.api.types.union_categoricals([frame[col] for frame in frames]).categories
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+def read_columns(path):
+    """Column names of a review file, read from the header or schema only"""
+    fmt = file_format(path)
+    if fmt == "parquet":
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    if fmt == "feather":
+        _require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        with pa.memory_map(path, "r") as source:
+            return ipc.open_file(source).schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def count_rows(path):
+    """Row count of a Parquet or Feather file from its metadata (None for CSV)"""
+    fmt = file_format(path)
+    if fmt == "parquet":
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    if fmt == "feather":
+        _require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        with pa.memory_map(path, "r") as source:
+            reader = ipc.open_file(source)
+            return sum(reader.get_batch(index).num_rows for index in range(reader.num_record_batches))
+    return None
+
+def iter_review_chunks(path, columns=None, chunk_rows=100_000):
+    """Yield a review file as DataFrame chunks, reading only the requested columns.
+
+    Parquet is read one record batch at a time from its row groups, Feather through the
+    memory-mapped Arrow IPC reader, and CSV with pandas' chunked reader.
+    """
+    fmt = file_format(path)
+    if fmt == "parquet":
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        selected = _existing_columns(parquet_file.schema_arrow.names, columns)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=selected):
+            yield batch.to_pandas()
+    elif fmt == "feather":
+        _require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        with pa.memory_map(path, "r") as source:
+            reader = ipc.open_file(source)
+            selected = _existing_columns(reader.schema.names, columns)
+            for index in range(reader.num_record_batches):
+                table = pa.Table.from_batches([reader.get_batch(index)])
+                if selected is not None:
+                    table = table.select(selected)
+                for start in range(0, table.num_rows, chunk_rows):
+                    yield table.slice(start, chunk_rows).to_pandas()
+    else:
+        usecols = None if columns is None else (lambda col: col in columns)
+        for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunk_rows):
+            yield chunk
+
+def read_reviews(path, columns=None):
+    """Load a review dataset from CSV, Parquet or Feather"""
+    fmt = file_format(path)
+    if fmt == "parquet":
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        selected = _existing_columns(pq.read_schema(path).names, columns)
+        return pd.read_parquet(path, columns=selected)
+    if fmt == "feather":
+        _require_pyarrow()
+        import pyarrow.feather as feather
+        table = feather.read_table(path, memory_map=True)
+        selected = _existing_columns(table.schema.names, columns)
+        if selected is not None:
+            table = table.select(selected)
+        return table.to_pandas()
+    usecols = None if columns is None else (lambda col: col in columns)
+    return pd.read_csv(path, usecols=usecols)
+
+def write_reviews(df, path, compression="zstd", row_group_rows=500_000):
+    """Save a review dataset, choosing the format from the file extension.
+
+    Columnar formats are compressed and store sentiment/source as categoricals.
+    """
+    fmt = file_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return
+    _require_pyarrow()
+    df = _as_categories(df.reset_index(drop=True))
+    if fmt == "parquet":
+        df.to_parquet(path, index=False, compression=compression, row_group_size=row_group_rows)
+    else:
+        df.to_feather(path, compression=compression)
+
+def with_selected_extension(path, selected_filter):
+    """Make the file extension agree with the format picked in a save dialog"""
+    wanted = {"Parquet": ".parquet", "Feather": ".feather", "CSV": ".csv"}
+    for name, extension in wanted.items():
+        if selected_filter.startswith(name):
+            if file_format(path) != file_format("file" + extension):
+                path = os.path.splitext(path)[0] + extension
+            break
+    return path
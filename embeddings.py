@@ -0,0 +1,282 @@
+import os
+import sqlite3
+import threading
+import numpy as np
+
+from review_store import DEFAULT_STORE_PATH
+
+DEFAULT_VECTORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "review_vectors.f16")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    content_hash TEXT PRIMARY KEY,
+    row INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS embedding_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def normalize(vectors):
+    """Rows scaled to unit length (as float32), so dot products are cosine similarities"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def top_k_cosine(matrix, query, k=10, rows=None, block_rows=65_536):
+    """
+    Rows of a (memory-mapped) unit-vector matrix most similar to a query vector.
+
+    The matrix is read in blocks of block_rows, converted to float32 and multiplied with the query,
+    keeping only the best k per block, so memory stays bounded for any number of rows.
+
+    Args:
+        matrix (ndarray): Unit-length vectors, one per row (float16 is fine)
+        query (ndarray): Query vector
+        k (int): Number of results
+        rows (ndarray): Only search these row numbers
+        block_rows (int): Rows multiplied at once
+
+    Returns:
+        tuple: (row numbers, cosine similarities), best first
+    """
+    query = normalize(query).ravel()
+    total = len(matrix) if rows is None else len(rows)
+    best_rows = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    for start in range(0, total, block_rows):
+        if rows is None:
+            block_ids = np.arange(start, min(start + block_rows, total))
+            block = matrix[start:start + block_rows]
+        else:
+            block_ids = np.sort(rows[start:start + block_rows])  # sorted reads are sequential on disk
+            block = matrix[block_ids]
+        scores = np.asarray(block, dtype=np.float32) @ query
+        if len(scores) > k:
+            keep = np.argpartition(-scores, k)[:k]
+            block_ids, scores = block_ids[keep], scores[keep]
+        best_rows = np.concatenate([best_rows, block_ids])
+        best_scores = np.concatenate([best_scores, scores])
+        if len(best_scores) > k:
+            keep = np.argpartition(-best_scores, k)[:k]
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+    order = np.argsort(-best_scores, kind="stable")
+    return best_rows[order], best_scores[order]
+
+def _assign(matrix, centroids, rows=None, block_rows=65_536):
+    # Nearest centroid of every row, computed block by block
+    total = len(matrix) if rows is None else len(rows)
+    labels = np.empty(total, dtype=np.int32)
+    for start in range(0, total, block_rows):
+        block = matrix[start:start + block_rows] if rows is None else matrix[rows[start:start + block_rows]]
+        labels[start:start + len(block)] = np.argmax(np.asarray(block, dtype=np.float32) @ centroids.T, axis=1)
+    return labels
+
+def spherical_kmeans(vectors, k, iterations=15, seed=0):
+    """
+    k-means on unit vectors with cosine similarity.
+
+    Returns:
+        tuple: (centroids as unit vectors, cluster label of every vector)
+    """
+    vectors = normalize(vectors)
+    k = min(k, len(vectors))
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)]
+    labels = np.zeros(len(vectors), dtype=np.int64)
+    for _ in range(iterations):
+        labels = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        empty = ~sums.any(axis=1)
+        # Empty clusters restart at a random vector
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids, labels
+
+class IVFIndex:
+    """
+    Inverted-file partitioning of an embedding matrix for approximate search over millions of rows.
+
+    Rows are grouped by their nearest of about sqrt(n) k-means centroids; a query is compared
+    exactly only with the rows of its n_probe nearest groups.
+    """
+
+    def __init__(self, centroids, labels, built_rows=None):
+        self.centroids = centroids
+        self.labels = labels
+        # Rows the centroids were fitted on; rows appended later are only assigned to them
+        self.built_rows = len(labels) if built_rows is None else built_rows
+        self._partition()
+
+    def _partition(self):
+        self.order = np.argsort(self.labels, kind="stable")
+        self.offsets = np.searchsorted(self.labels[self.order], np.arange(len(self.centroids) + 1))
+
+    def __len__(self):
+        return len(self.labels)
+
+    @classmethod
+    def build(cls, matrix, n_lists=None, sample=50_000, iterations=10, seed=0):
+        n_lists = n_lists or max(1, int(np.sqrt(len(matrix))))
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(len(matrix), min(sample, len(matrix)), replace=False))
+        centroids, _ = spherical_kmeans(np.asarray(matrix[sample_rows], dtype=np.float32), n_lists, iterations, seed)
+        return cls(centroids, _assign(matrix, centroids))
+
+    def extend(self, matrix):
+        """Assign rows appended to the matrix since the index was built or last extended"""
+        if len(matrix) <= len(self.labels):
+            return
+        new_rows = np.arange(len(self.labels), len(matrix))
+        self.labels = np.concatenate([self.labels, _assign(matrix, self.centroids, new_rows)])
+        self._partition()
+
+    def candidates(self, query, n_probe=8):
+        """Row numbers in the n_probe partitions nearest to the query"""
+        nearest = np.argsort(-(self.centroids @ normalize(query).ravel()))[:n_probe]
+        return np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in nearest])
+
+class EmbeddingStore:
+    """
+    Review embeddings kept next to the review store.
+
+    Vectors are appended to a float16 file that is memory-mapped for search; the review store's
+    database maps each review's content hash to its row, so a review is encoded only once across
+    imports. Vectors are stored unit-length.
+    """
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH, vectors_path=DEFAULT_VECTORS_PATH, ivf_threshold=200_000,
+                 ivf_rebuild_growth=0.5):
+        self.db_path = db_path
+        self.vectors_path = vectors_path
+        # Searches over more than this many rows go through an IVF index
+        self.ivf_threshold = ivf_threshold
+        # Appended rows join the existing partitions until the store has grown by this fraction
+        self.ivf_rebuild_growth = ivf_rebuild_growth
+        self._ivf = None
+        # Scoring, scraping and search threads may append at once; each append reads the current
+        # row count, so computing it, writing the vectors and registering their rows is serialized
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            meta = dict(conn.execute("SELECT key, value FROM embedding_meta"))
+        self.model = meta.get("model")
+        self.dim = int(meta["dim"]) if "dim" in meta else None
+
+    def _connect(self):
+        # Short-lived connections so the store can be used from worker threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def __len__(self):
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (2 * self.dim)
+
+    def reset(self, model, dim):
+        """Drop every vector, e.g. when the encoder model changes"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM embeddings")
+            conn.executemany("INSERT OR REPLACE INTO embedding_meta (key, value) VALUES (?, ?)",
+                             [("model", model), ("dim", str(dim))])
+        open(self.vectors_path, "wb").close()
+        self.model, self.dim, self._ivf = model, dim, None
+
+    def rows(self, hashes):
+        """Vector row of each content hash, -1 where the review hasn't been encoded"""
+        hashes = list(hashes)
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(conn.execute(
+                    f"SELECT content_hash, row FROM embeddings WHERE content_hash IN ({placeholders})", chunk
+                ))
+        return np.array([found.get(h, -1) for h in hashes], dtype=np.int64)
+
+    def missing(self, hashes, model):
+        """Content hashes without a vector from the given encoder model"""
+        if model != self.model:
+            return list(dict.fromkeys(hashes))
+        hashes = list(dict.fromkeys(hashes))
+        return [h for h, row in zip(hashes, self.rows(hashes)) if row < 0]
+
+    def add(self, hashes, vectors, model):
+        """Append vectors for content hashes encoded by the given model"""
+        vectors = normalize(vectors)
+        with self._write_lock:
+            if model != self.model or vectors.shape[1] != self.dim:
+                self.reset(model, vectors.shape[1])
+            start = len(self)
+            # The file is written before the rows are registered, so no row ever points past its end
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors.astype(np.float16).tobytes())
+            with self._connect() as conn:
+                conn.executemany("INSERT OR IGNORE INTO embeddings (content_hash, row) VALUES (?, ?)",
+                                 [(h, start + i) for i, h in enumerate(hashes)])
+
+    def matrix(self):
+        """All vectors as a read-only memory map (float16, one row per encoded review)"""
+        rows = len(self)
+        if rows == 0:
+            return np.empty((0, self.dim or 0), dtype=np.float16)
+        return np.memmap(self.vectors_path, dtype=np.float16, mode="r", shape=(rows, self.dim))
+
+    def search(self, query, k=10, rows=None, n_probe=8):
+        """
+        Most similar stored reviews to a query vector.
+
+        A given set of rows is searched exactly unless it is itself larger than ivf_threshold; only
+        then, or for a search over the whole store, is the approximate IVF index used.
+
+        Args:
+            query (ndarray): Query vector from the same encoder
+            k (int): Number of results
+            rows (ndarray): Only consider these vector rows, e.g. the current dataset's
+            n_probe (int): Partitions searched when the IVF index is used
+
+        Returns:
+            tuple: (vector rows, cosine similarities), best first
+        """
+        matrix = self.matrix()
+        searched = len(matrix) if rows is None else len(rows)
+        if searched > self.ivf_threshold:
+            candidates = self._ivf_index(matrix).candidates(query, n_probe)
+            rows = candidates if rows is None else candidates[np.isin(candidates, rows)]
+        return top_k_cosine(matrix, query, k, rows)
+
+    def _ivf_index(self, matrix):
+        # Refit the partitions only after substantial growth; otherwise assign the new rows
+        if self._ivf is None or len(matrix) > self._ivf.built_rows * (1 + self.ivf_rebuild_growth):
+            self._ivf = IVFIndex.build(matrix)
+        else:
+            self._ivf.extend(matrix)
+        return self._ivf
+
+    def clusters(self, rows, k=8, sample=50_000, seed=0):
+        """
+        Theme clusters of the given vector rows, fitted on a sample and assigned in blocks.
+
+        Returns:
+            tuple: (cluster label of every row, row nearest to each cluster's centroid)
+        """
+        matrix = self.matrix()
+        rows = np.asarray(rows)
+        rng = np.random.default_rng(seed)
+        fit_rows = np.sort(rng.choice(rows, min(sample, len(rows)), replace=False))
+        centroids, _ = spherical_kmeans(np.asarray(matrix[fit_rows], dtype=np.float32), k, seed=seed)
+        labels = _assign(matrix, centroids, rows)
+        representatives = []
+        for cluster in range(len(centroids)):
+            members = rows[labels == cluster]
+            if len(members) == 0:
+                representatives.append(-1)
+                continue
+            best, _ = top_k_cosine(matrix, centroids[cluster], 1, members)
+            representatives.append(int(best[0]))
+        return labels, np.asarray(representatives, dtype=np.int64)
@@ -0,0 +1,106 @@
+import re
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+def split_sentences(texts, min_words=4, max_words=80):
+    """
+    Sentences of the given texts, deduplicated, in the order they first appear.
+
+    Very short fragments ("Great!") carry little for a summary and are dropped; very long
+    run-on sentences are cut to max_words.
+    """
+    seen = set()
+    sentences = []
+    for text in texts:
+        if not text:
+            continue
+        for sentence in SENTENCE_BOUNDARY.split(str(text)):
+            words = sentence.split()
+            if len(words) < min_words:
+                continue
+            sentence = " ".join(words[:max_words])
+            key = sentence.lower()
+            if key not in seen:
+                seen.add(key)
+                sentences.append(sentence)
+    return sentences
+
+def rank_sentences(sentences, count, diversity=0.5, duplicate_similarity=0.7, pool_factor=50, max_features=50_000):
+    """
+    Pick the sentences that best represent the set while covering different points.
+
+    Sentences are ranked by TF-IDF cosine similarity to the centroid of all sentences, then chosen
+    by maximal marginal relevance (MMR) from the best pool_factor * count candidates, so every pick
+    trades relevance against similarity to what's already picked. Candidates nearly identical to a
+    picked sentence are skipped.
+
+    Args:
+        sentences (list): Candidate sentences
+        count (int): Number of sentences to pick
+        diversity (float): 0 ranks by relevance only, 1 by novelty only
+        duplicate_similarity (float): Cosine similarity above which a candidate counts as a duplicate
+        pool_factor (int): How many candidates per picked sentence MMR considers
+        max_features (int): Vocabulary size of the TF-IDF model
+
+    Returns:
+        list: Indices of the picked sentences, in their original order
+    """
+    if len(sentences) <= count:
+        return list(range(len(sentences)))
+    vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True, max_features=max_features,
+                                 dtype=np.float32)
+    try:
+        matrix = vectorizer.fit_transform(sentences)  # rows are L2-normalized
+    except ValueError:
+        # Nothing but stopwords; keep the first sentences
+        return list(range(count))
+
+    centroid = np.asarray(matrix.mean(axis=0)).ravel()
+    norm = np.linalg.norm(centroid)
+    if norm == 0:
+        return list(range(count))
+    relevance = matrix @ (centroid / norm)
+
+    pool = np.argsort(-relevance, kind="stable")[:count * pool_factor]
+    candidates = matrix[pool]
+    pool_relevance = relevance[pool]
+    max_similarity = np.zeros(len(pool), dtype=np.float32)
+    available = np.ones(len(pool), dtype=bool)
+    picked = []
+    while len(picked) < count and available.any():
+        scores = (1 - diversity) * pool_relevance - diversity * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        picked.append(int(pool[best]))
+        similarity = (candidates @ candidates[best].T).toarray().ravel()
+        max_similarity = np.maximum(max_similarity, similarity)
+        available[best] = False
+        available &= max_similarity < duplicate_similarity
+    return sorted(picked)
+
+def select_representative(groups, max_sentences=120, **kwargs):
+    """
+    Representative sentences per group (e.g. per sentiment), for a compact summarizer input.
+
+    The sentence budget is split across groups by their number of sentences, with every
+    non-empty group getting at least a few.
+
+    Args:
+        groups (dict): Group label -> list of texts
+        max_sentences (int): Total number of sentences to return
+        **kwargs: Passed on to rank_sentences
+
+    Returns:
+        list: Selected sentences, grouped in the order of groups
+    """
+    split = {label: split_sentences(texts) for label, texts in groups.items()}
+    total = sum(len(sentences) for sentences in split.values())
+    selected = []
+    for sentences in split.values():
+        if not sentences:
+            continue
+        budget = max(5, round(max_sentences * len(sentences) / total))
+        selected.extend(sentences[i] for i in rank_sentences(sentences, budget, **kwargs))
+    return selected
@@ -0,0 +1,111 @@
+from collections import Counter, deque
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from PyQt5.QtCore import QTimer
+
+from charts import SENTIMENT_COLORS, NEUTRAL_COLOR
+
+LIVE_LABELS = ["POSITIVE", "NEGATIVE", "NEUTRAL"]
+
+class LiveSentimentChart(FigureCanvasQTAgg):
+    """
+    Sentiment counts and positive share drawn in the main window while reviews are scored.
+
+    Batches only update the pending counts; a timer redraws at most once per interval, and
+    redraws blit the changing artists over a cached background instead of drawing the whole figure.
+    """
+
+    def __init__(self, parent=None, interval_ms=100, history=300):
+        self.figure = Figure(figsize=(6, 2.6), tight_layout=True)
+        super().__init__(self.figure)
+        self.setParent(parent)
+        self.counts = Counter()
+        self.shares = deque(maxlen=history)
+        self._background = None
+        self._stale = False
+
+        self.bar_ax, self.share_ax = self.figure.subplots(1, 2, gridspec_kw={"width_ratios": [3, 2]})
+        colors = [SENTIMENT_COLORS.get(label, NEUTRAL_COLOR) for label in LIVE_LABELS]
+        self.bars = self.bar_ax.barh(LIVE_LABELS, [0] * len(LIVE_LABELS), color=colors, alpha=0.8)
+        self.bar_ax.invert_yaxis()
+        self.bar_ax.set_xlim(0, 10)
+        self.bar_ax.set_title("Reviews by Sentiment", fontsize=9, fontweight='bold')
+        self.bar_ax.tick_params(labelsize=8)
+        self.labels = [self.bar_ax.text(0, bar.get_y() + bar.get_height() / 2, "0", va="center", fontsize=8)
+                       for bar in self.bars]
+
+        self.share_ax.set_xlim(0, history - 1)
+        self.share_ax.set_ylim(0, 100)
+        self.share_ax.set_title("Positive Share (%)", fontsize=9, fontweight='bold')
+        self.share_ax.tick_params(labelsize=8, labelbottom=False)
+        self.share_ax.grid(True, alpha=0.3)
+        (self.share_line,) = self.share_ax.plot([], [], color=SENTIMENT_COLORS["POSITIVE"], linewidth=1.5)
+
+        # Animated artists are skipped by full draws and painted on top of the saved background
+        self.animated = list(self.bars) + self.labels + [self.share_line]
+        for artist in self.animated:
+            artist.set_animated(True)
+        self.mpl_connect("draw_event", self._on_draw)
+
+        # Redraws are coalesced: however many batches arrive, the chart repaints once per interval
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._refresh)
+
+    def reset(self, counts=None):
+        """Start over, optionally from the counts of an already scored dataset"""
+        self.shares.clear()
+        self.bar_ax.set_xlim(0, 10)
+        self._background = None
+        self.set_counts(counts or {})
+
+    def add_counts(self, counts):
+        """Add the sentiment counts of a newly scored batch"""
+        self.counts.update(counts)
+        self._schedule()
+
+    def set_counts(self, counts):
+        """Replace the counts, e.g. with the running aggregates after a re-scored batch"""
+        self.counts = Counter({label: int(count) for label, count in dict(counts).items()})
+        self._schedule()
+
+    def _schedule(self):
+        self._stale = True
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _on_draw(self, event):
+        # A full draw (first show, resize, rescale) leaves a new background to blit onto
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.animated:
+            self.figure.draw_artist(artist)
+
+    def _refresh(self):
+        if not self._stale:
+            return
+        self._stale = False
+
+        values = [self.counts.get(label, 0) for label in LIVE_LABELS]
+        for bar, label, value in zip(self.bars, self.labels, values):
+            bar.set_width(value)
+            label.set_x(value)
+            label.set_text(f" {value:,}")
+        scored = sum(values)
+        if scored:
+            self.shares.append(100.0 * values[0] / scored)
+        self.share_line.set_data(range(len(self.shares)), list(self.shares))
+
+        # Axis limits are part of the background, so growing them needs one full redraw
+        limit = max(values)
+        if limit > self.bar_ax.get_xlim()[1] * 0.85 or self._background is None:
+            self.bar_ax.set_xlim(0, max(10, limit * 1.5))
+            self._background = None
+            self.draw_idle()
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.figure.bbox)
@@ -0,0 +1,154 @@
+import os
+from datetime import datetime
+import pandas as pd
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from aggregates import ReviewAggregates
+from review_store import unique_reviews
+from word_index import WordFrequencyIndex
+from dataset_io import (REVIEW_COLUMNS, file_format, iter_review_chunks, count_rows, read_columns,
+                        compact_reviews, concat_reviews)
+
+REQUIRED_COLUMNS = ["text"]
+
+# Explicit dtypes so pandas doesn't have to infer types chunk by chunk
+CSV_DTYPES = {
+    "text": str,
+    "sentiment": str,
+    "source": str,
+    "date": str,
+    "user_id": str,
+    "location": str,
+    # Read as text: exports may hold "N/A" or blanks, which are coerced per chunk instead of failing the load
+    "confidence": str,
+    "model_version": str,
+    "aspects": str,
+}
+
+FORMAT_ERROR_MESSAGE = (
+    "File must contain a 'text' column\n\n"
+    "Expected format:\n"
+    "text,sentiment\n"
+    "\"Great product!\",POSITIVE\n"
+    "\"Not satisfied\",NEGATIVE\n\n"
+    "Files without a 'sentiment' column can be scored after loading."
+)
+
+def fill_missing_columns(chunk, loaded_at):
+    """Add the optional review columns a file doesn't provide"""
+    if "sentiment" not in chunk.columns:
+        # Left unscored until the reviews are run through the model
+        chunk["sentiment"] = None
+        chunk["confidence"] = float("nan")
+    if "source" not in chunk.columns:
+        chunk["source"] = "CSV Import"
+    if "date" not in chunk.columns:
+        chunk["date"] = loaded_at
+    if "user_id" not in chunk.columns:
+        chunk["user_id"] = "Unknown"
+    if "location" not in chunk.columns:
+        chunk["location"] = "Unknown"
+    if "confidence" not in chunk.columns:
+        chunk["confidence"] = 0.5
+    chunk["confidence"] = pd.to_numeric(chunk["confidence"], errors="coerce").astype("float32")
+    if "model_version" not in chunk.columns:
+        chunk["model_version"] = None
+    if "aspects" not in chunk.columns:
+        chunk["aspects"] = None
+    return chunk[REVIEW_COLUMNS]
+
+class DatasetLoaderThread(QThread):
+    """Load a review file in chunks off the GUI thread"""
+    progress_signal = pyqtSignal(int, str)
+    finished_signal = pyqtSignal(object, object, object, object)  # DataFrame, store import id, aggregates, word index
+    error_signal = pyqtSignal(str)
+    cancelled_signal = pyqtSignal()
+
+    def __init__(self, file_path, store=None, chunk_rows=100_000):
+        super().__init__()
+        self.file_path = file_path
+        self.store = store
+        self.chunk_rows = chunk_rows
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def _csv_chunks(self, columns):
+        """Read CSV chunks from a binary handle so progress can be reported in bytes"""
+        total_bytes = max(os.path.getsize(self.file_path), 1)
+        dtypes = {col: dtype for col, dtype in CSV_DTYPES.items() if col in columns}
+        with open(self.file_path, "rb") as handle:
+            reader = pd.read_csv(handle, usecols=columns, dtype=dtypes, chunksize=self.chunk_rows)
+            for chunk in reader:
+                yield chunk, handle.tell() / total_bytes
+
+    def _columnar_chunks(self, columns):
+        total_rows = max(count_rows(self.file_path), 1)
+        rows_read = 0
+        for chunk in iter_review_chunks(self.file_path, columns=columns, chunk_rows=self.chunk_rows):
+            rows_read += len(chunk)
+            yield chunk, rows_read / total_rows
+
+    def run(self):
+        try:
+            columns = [col for col in REVIEW_COLUMNS if col in read_columns(self.file_path)]
+            if not all(col in columns for col in REQUIRED_COLUMNS):
+                self.error_signal.emit(FORMAT_ERROR_MESSAGE)
+                return
+
+            if file_format(self.file_path) == "csv":
+                chunks = self._csv_chunks(columns)
+            else:
+                chunks = self._columnar_chunks(columns)
+
+            import_id = None
+            if self.store is not None:
+                try:
+                    import_id = self.store.start_import("file", self.file_path)
+                except Exception as e:
+                    print(f"Warning: Could not save reviews to the store: {str(e)}")
+
+            loaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            frames = []
+            aggregates = ReviewAggregates()
+            word_index = WordFrequencyIndex()
+            row_count = 0
+            seen = set()
+            for chunk, fraction in chunks:
+                if self._cancelled:
+                    break
+                # Compact each chunk as it arrives so the full dataset never exists as object columns
+                chunk = compact_reviews(fill_missing_columns(chunk, loaded_at))
+                # Keep the rows the store keeps, so the dataset, its statistics and the store agree
+                chunk = unique_reviews(chunk, seen)
+                frames.append(chunk)
+                aggregates.add_frame(chunk)
+                word_index.add_frame(chunk)
+                row_count += len(chunk)
+
+                # Each chunk goes into the review store in its own transaction
+                if import_id is not None:
+                    try:
+                        self.store.insert_frame(import_id, chunk)
+                    except Exception as e:
+                        print(f"Warning: Could not save reviews to the store: {str(e)}")
+                        # Don't leave the chunks saved so far behind as a partial import
+                        try:
+                            self.store.delete_import(import_id)
+                        except Exception as e:
+                            print(f"Warning: Could not remove the partial import: {str(e)}")
+                        import_id = None
+
+                self.progress_signal.emit(int(min(fraction, 1.0) * 100), f"Loaded {row_count:,} reviews...")
+
+            if self._cancelled:
+                # Don't leave a partial import behind in the store
+                if import_id is not None:
+                    self.store.delete_import(import_id)
+                self.cancelled_signal.emit()
+                return
+            df = compact_reviews(concat_reviews(frames))
+            self.finished_signal.emit(df, import_id, aggregates, word_index)
+        except Exception as e:
+            self.error_signal.emit(f"Failed to load file:\n\n{str(e)}")
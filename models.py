@@ -1,9 +1,19 @@
 import threading
 import os
+from datetime import datetime
 from PyQt5.QtCore import QThread, pyqtSignal
 from transformers import pipeline
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, AutoModel
 import torch
+import numpy as np
+
+from summarize import map_reduce_summary
+from extractive import select_representative
+from summary_cache import summary_key
+from retrieval import BM25Index
+from review_store import content_hash
+
+SENTENCE_ENCODER = "sentence-transformers/all-MiniLM-L6-v2"
 
 class ModelLoader:
     _instance = None
@@ -16,9 +26,21 @@ class ModelLoader:
                 cls._instance._initialized = False
                 cls._instance._summarizer = None
                 cls._instance._qa_pipeline = None
+                cls._instance._encoder = None
                 cls._instance._sentiment_transformer = None
+                cls._instance._model_version = None
+                cls._instance._sentiment_max_length = None
+                cls._instance._summarizer_model = None
             return cls._instance
     
+    @staticmethod
+    def _local_model_version(model_path):
+        """Version tag for a local model: its folder name plus when it was last written"""
+        config_path = os.path.join(model_path, "config.json")
+        stamp_path = config_path if os.path.exists(config_path) else model_path
+        modified = datetime.fromtimestamp(os.path.getmtime(stamp_path)).strftime("%Y%m%d%H%M%S")
+        return f"{os.path.relpath(model_path, os.path.dirname(__file__))}@{modified}"
+    
     def _initialize_transformer_sentiment(self):
         if self._sentiment_transformer is None:
             try:
@@ -33,11 +55,13 @@ class ModelLoader:
                     print(f"Using specific checkpoint: {specific_checkpoint}")
                     model = AutoModelForSequenceClassification.from_pretrained(model_checkpoint_path)
                     tokenizer = AutoTokenizer.from_pretrained(fine_tuned_model_path)
+                    model_version = self._local_model_version(model_checkpoint_path)
                 else:
                     # Fallback to main model
                     print("Specific checkpoint not found, using main model")
                     model = AutoModelForSequenceClassification.from_pretrained(fine_tuned_model_path)
                     tokenizer = AutoTokenizer.from_pretrained(fine_tuned_model_path)
+                    model_version = self._local_model_version(fine_tuned_model_path)
                 
                 # Create a custom pipeline with the fine-tuned model
                 self._sentiment_transformer = pipeline(
@@ -47,6 +71,8 @@ class ModelLoader:
                     max_length=128,
                     truncation=True
                 )
+                self._model_version = model_version
+                self._sentiment_max_length = 128
                 
                 print("Fine-tuned sentiment analysis model loaded successfully")
             except Exception as e:
@@ -54,12 +80,15 @@ class ModelLoader:
                 # Fallback to a pre-trained model if the fine-tuned one fails
                 try:
                     print("Falling back to pre-trained sentiment model")
+                    fallback_model = "distilbert-base-uncased-finetuned-sst-2-english"
                     self._sentiment_transformer = pipeline(
                         "sentiment-analysis", 
-                        model="distilbert-base-uncased-finetuned-sst-2-english",
+                        model=fallback_model,
                         max_length=512,
                         truncation=True
                     )
+                    self._model_version = fallback_model
+                    self._sentiment_max_length = 512
                     print("Pre-trained sentiment model loaded successfully")
                 except Exception as e:
                     print(f"Error loading pre-trained model: {str(e)}")
@@ -79,6 +108,7 @@ class ModelLoader:
                     min_length=30,
                     truncation=True
                 )
+                self._summarizer_model = "sshleifer/distilbart-cnn-12-6"
                 print("Summarization model loaded successfully")
             except Exception as e:
                 print(f"Error loading summarization model: {str(e)}")
@@ -92,6 +122,7 @@ class ModelLoader:
                         min_length=30,
                         truncation=True
                     )
+                    self._summarizer_model = "facebook/bart-large-cnn"
                     print("Fallback summarization model loaded successfully")
                 except Exception as e2:
                     print(f"Error loading fallback model: {str(e2)}")
@@ -112,32 +143,121 @@ class ModelLoader:
                 self._qa_pipeline = None
         return self._qa_pipeline
     
+    def _initialize_encoder(self):
+        if self._encoder is None:
+            try:
+                print("Loading sentence encoder...")
+                tokenizer = AutoTokenizer.from_pretrained(SENTENCE_ENCODER)
+                model = AutoModel.from_pretrained(SENTENCE_ENCODER)
+                model.eval()
+                self._encoder = (tokenizer, model)
+                print("Sentence encoder loaded successfully")
+            except Exception as e:
+                print(f"Error loading sentence encoder: {str(e)}")
+                self._encoder = None
+        return self._encoder
+    
     @property
     def sentiment_transformer(self):
         return self._initialize_transformer_sentiment()
     
+    @property
+    def model_version(self):
+        """Identifies the sentiment model in use, so scores from older models can be found"""
+        self._initialize_transformer_sentiment()
+        return self._model_version
+    
+    @property
+    def sentiment_max_length(self):
+        """Tokens the sentiment model reads per input; longer reviews are scored in windows of this size"""
+        self._initialize_transformer_sentiment()
+        return self._sentiment_max_length
+    
     @property
     def summarizer(self):
         return self._initialize_summarizer()
     
+    @property
+    def summarizer_model(self):
+        """Name of the summarization model in use, so cached summaries from another model aren't reused"""
+        self._initialize_summarizer()
+        return self._summarizer_model
+    
     @property
     def qa_pipeline(self):
         return self._initialize_qa()
+    
+    @property
+    def sentence_encoder(self):
+        return self._initialize_encoder()
 
 # Create a global model loader instance
 model_loader = ModelLoader()
 
+def encode_texts(texts, batch_size=64, max_length=256):
+    """Sentence embeddings (mean-pooled, unit length) for a list of texts, as a float32 array"""
+    encoder = model_loader.sentence_encoder
+    if encoder is None:
+        raise RuntimeError("Sentence encoder could not be loaded.")
+    tokenizer, model = encoder
+    vectors = []
+    with torch.no_grad():
+        for start in range(0, len(texts), batch_size):
+            batch = tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                              max_length=max_length, return_tensors="pt")
+            hidden = model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            vectors.append(torch.nn.functional.normalize(pooled, dim=1).cpu().numpy())
+    return np.vstack(vectors).astype(np.float32)
+
+def embed_missing(store, texts, batch_size=64, progress=None):
+    """
+    Encode the texts the embedding store doesn't have yet, in batches.
+    
+    Returns:
+        ndarray: Vector row of every text (-1 for empty texts)
+    """
+    hashes = [content_hash(text) if isinstance(text, str) and text.strip() else None for text in texts]
+    by_hash = {h: text for h, text in zip(hashes, texts) if h is not None}
+    missing = store.missing(by_hash, SENTENCE_ENCODER)
+    chunk = batch_size * 16
+    for start in range(0, len(missing), chunk):
+        batch = missing[start:start + chunk]
+        store.add(batch, encode_texts([by_hash[h] for h in batch], batch_size), SENTENCE_ENCODER)
+        if progress is not None:
+            progress(start + len(batch), len(missing))
+    rows = store.rows([h for h in hashes if h is not None])
+    result = np.full(len(texts), -1, dtype=np.int64)
+    result[[i for i, h in enumerate(hashes) if h is not None]] = rows
+    return result
+
 class SummarizerThread(QThread):
     finished_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int)
     error_signal = pyqtSignal(str)
     
-    def __init__(self, text, max_length=150, min_length=30):
+    def __init__(self, texts, max_length=150, min_length=30, batch_size=8, max_sentences=120, cache=None):
         super().__init__()
-        self.text = text
+        # Accepts one text, a list of reviews, or a dict of sentiment -> reviews
+        if isinstance(texts, str):
+            texts = [texts]
+        self.groups = dict(texts) if isinstance(texts, dict) else {None: list(texts)}
         self.max_length = max_length
         self.min_length = min_length
+        self.batch_size = batch_size
+        # Sentences kept by the extractive pass; None sends every review to the model
+        self.max_sentences = max_sentences
+        # Optional SummaryCache for whole summaries and chunk summaries
+        self.cache = cache
         
+    def report_progress(self, done, total, level):
+        # The first pass over the reviews is most of the work; later passes fill the rest of the bar
+        if level == 1:
+            self.progress_signal.emit(40 + int(45 * done / total))
+        else:
+            self.progress_signal.emit(min(90, 85 + level))
+            
     def run(self):
         try:
             # Load model (this happens in the thread)
@@ -148,43 +268,60 @@ class SummarizerThread(QThread):
                 self.error_signal.emit("Summarization model could not be loaded. Please check your internet connection and try again.")
                 return
             
-            # Prepare text for summarization
-            self.progress_signal.emit(50)
+            texts = [text for group in self.groups.values() for text in group if text]
+            inputs = self.groups
+            model = model_loader.summarizer_model
             
-            # Limit text length to avoid memory issues
-            max_input_length = 1024  # Adjust based on model capacity
-            if len(self.text) > max_input_length:
-                # Take the first part of the text
-                self.text = self.text[:max_input_length]
-                # Try to end at a sentence boundary
-                last_period = self.text.rfind('.')
-                if last_period > max_input_length // 2:
-                    self.text = self.text[:last_period + 1]
+            # Same reviews, lengths and model as an earlier run: reuse its summary
+            key = None
+            if self.cache is not None:
+                try:
+                    key = summary_key(self.groups, model, max_length=self.max_length, min_length=self.min_length,
+                                      max_sentences=self.max_sentences)
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        self.progress_signal.emit(90)
+                        self.finished_signal.emit(cached)
+                        return
+                except Exception as e:
+                    print(f"Warning: Could not read the summary cache: {str(e)}")
             
             # Ensure minimum text length
-            if len(self.text.strip()) < 50:
+            if sum(len(text.strip()) for text in texts) < 50:
                 self.error_signal.emit("Text is too short to summarize effectively.")
                 return
             
-            # Generate summary with error handling
+            # Chunk summaries are reused only when the chunks come straight from the reviews
+            chunk_cache = self.cache if key is not None else None
+            
+            # Cheap extractive pass: the model only reads the most representative, distinct sentences
+            if self.max_sentences:
+                self.progress_signal.emit(35)
+                selected = select_representative(self.groups, self.max_sentences)
+                if selected:
+                    inputs = selected
+                    # The selection shifts whenever a review is added, so its chunks never repeat
+                    chunk_cache = None
+            
+            # Summarize chunks of reviews, then the partial summaries, until one summary is left
+            self.progress_signal.emit(40)
             try:
-                summary_result = summarizer(
-                    self.text, 
-                    max_length=min(self.max_length, len(self.text.split()) // 2),
-                    min_length=min(self.min_length, 20),
-                    do_sample=False,
-                    truncation=True
-                )
-                
-                if summary_result and len(summary_result) > 0:
-                    summary = summary_result[0]['summary_text']
-                else:
-                    self.error_signal.emit("No summary could be generated from the provided text.")
-                    return
-                    
+                summary = map_reduce_summary(summarizer, inputs, self.max_length, self.min_length,
+                                             batch_size=self.batch_size, progress=self.report_progress,
+                                             cache=chunk_cache, model=model)
             except Exception as model_error:
                 self.error_signal.emit(f"Error during summarization: {str(model_error)}")
                 return
+                
+            if not summary:
+                self.error_signal.emit("No summary could be generated from the provided text.")
+                return
+            
+            if key is not None:
+                try:
+                    self.cache.put(key, summary)
+                except Exception as e:
+                    print(f"Warning: Could not save the summary to the cache: {str(e)}")
             
             self.progress_signal.emit(90)
             self.finished_signal.emit(summary)
@@ -219,4 +356,117 @@ class QAThread(QThread):
             self.progress_signal.emit(90)
             self.finished_signal.emit(answer)
         except Exception as e:
-            self.error_signal.emit(f"Error during Q&A processing: {str(e)}")
\ No newline at end of file
+            self.error_signal.emit(f"Error during Q&A processing: {str(e)}")
+
+class CorpusQAThread(QThread):
+    """Answer a question from the whole review set: BM25 retrieval, then one batched reader call"""
+    finished_signal = pyqtSignal(list)
+    index_signal = pyqtSignal(object)
+    progress_signal = pyqtSignal(int)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, question, texts=None, index=None, top_k=8, max_answers=3):
+        super().__init__()
+        self.question = question
+        self.texts = texts
+        # A BM25Index from an earlier question on the same reviews; built here when missing
+        self.index = index
+        self.top_k = top_k
+        self.max_answers = max_answers
+        
+    def run(self):
+        try:
+            self.progress_signal.emit(10)
+            if self.index is None:
+                self.index = BM25Index.build(self.texts)
+                self.index_signal.emit(self.index)
+                
+            # The reader only ever sees top_k short passages, however many reviews there are
+            self.progress_signal.emit(40)
+            hits = self.index.search(self.question, self.top_k)
+            if not hits:
+                self.error_signal.emit("No reviews mention the words in your question. Try rephrasing it.")
+                return
+                
+            qa_pipeline = model_loader.qa_pipeline
+            if qa_pipeline is None:
+                self.error_signal.emit("Q&A model could not be loaded. Please check your internet connection and try again.")
+                return
+                
+            self.progress_signal.emit(60)
+            contexts = [self.index.passages[passage] for passage, _ in hits]
+            results = qa_pipeline(question=[self.question] * len(contexts), context=contexts, batch_size=len(contexts))
+            if isinstance(results, dict):
+                results = [results]
+                
+            answers = []
+            seen = set()
+            for result, (passage, retrieval_score) in sorted(zip(results, hits), key=lambda pair: -pair[0]["score"]):
+                key = result["answer"].strip().lower()
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                answers.append({
+                    "answer": result["answer"].strip(),
+                    "score": float(result["score"]),
+                    "passage": self.index.passages[passage],
+                    "review": int(self.index.positions[passage]),
+                    "retrieval_score": retrieval_score,
+                })
+                if len(answers) >= self.max_answers:
+                    break
+                    
+            self.progress_signal.emit(90)
+            self.finished_signal.emit(answers)
+        except Exception as e:
+            self.error_signal.emit(f"Error during Q&A processing: {str(e)}")
+
+class EmbeddingSearchThread(QThread):
+    """Find reviews similar to a text, or group reviews into themes, using stored embeddings"""
+    finished_signal = pyqtSignal(object)
+    progress_signal = pyqtSignal(int)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, store, texts, query=None, top_k=10, themes=8):
+        super().__init__()
+        self.store = store
+        self.texts = texts
+        # With a query this finds similar reviews; without one it clusters the reviews into themes
+        self.query = query
+        self.top_k = top_k
+        self.themes = themes
+        
+    def report_progress(self, done, total):
+        self.progress_signal.emit(10 + int(70 * done / total))
+        
+    def run(self):
+        try:
+            # Only reviews that were never encoded before go through the model
+            self.progress_signal.emit(10)
+            rows = embed_missing(self.store, self.texts, progress=self.report_progress)
+            positions = np.flatnonzero(rows >= 0)
+            if len(positions) == 0:
+                self.error_signal.emit("No review text to search.")
+                return
+            # Duplicate reviews share a vector row; report each row at its first position
+            unique_rows, first = np.unique(rows[positions], return_index=True)
+            first_positions = positions[first]
+            position_of = dict(zip(unique_rows.tolist(), first_positions.tolist()))
+            
+            self.progress_signal.emit(85)
+            if self.query is not None:
+                query = encode_texts([self.query])[0]
+                found, scores = self.store.search(query, self.top_k, rows=unique_rows)
+                result = [(position_of[int(row)], float(score)) for row, score in zip(found, scores)]
+            else:
+                labels, representatives = self.store.clusters(unique_rows, self.themes)
+                result = [
+                    {"size": int((labels == cluster).sum()), "representative": position_of[int(row)],
+                     "members": first_positions[labels == cluster]}
+                    for cluster, row in enumerate(representatives) if row >= 0
+                ]
+                result.sort(key=lambda theme: -theme["size"])
+            self.progress_signal.emit(90)
+            self.finished_signal.emit(result)
+        except Exception as e:
+            self.error_signal.emit(f"Error during embedding search: {str(e)}")
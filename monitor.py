@@ -0,0 +1,249 @@
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper import ScraperThread
+from review_store import ReviewStore, DEFAULT_STORE_PATH
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "monitor.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    url TEXT PRIMARY KEY,
+    interval_seconds INTEGER NOT NULL,
+    next_run REAL NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    added_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    review_count INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_url ON jobs (url, status);
+"""
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+class JobQueue:
+    """Watchlist and job table persisted in a local SQLite file"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_attempts=3):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # One short-lived connection per call keeps the queue safe to use from worker threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def add_url(self, url, interval_seconds):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO watchlist (url, interval_seconds, next_run, enabled, added_at) VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(url) DO UPDATE SET interval_seconds = excluded.interval_seconds, enabled = 1",
+                (url, int(interval_seconds), time.time(), _now())
+            )
+
+    def remove_url(self, url):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM watchlist WHERE url = ?", (url,))
+            conn.execute("DELETE FROM jobs WHERE url = ? AND status = 'pending'", (url,))
+
+    def watchlist(self):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT url, interval_seconds, next_run, enabled FROM watchlist ORDER BY url"
+            ).fetchall()
+
+    def recover_interrupted(self):
+        """Put jobs that were running when the service stopped back in the queue"""
+        with self._connect() as conn:
+            cursor = conn.execute("UPDATE jobs SET status = 'pending', started_at = NULL WHERE status = 'running'")
+            return cursor.rowcount
+
+    def schedule_due(self):
+        """Queue a job for every watchlist URL whose interval has elapsed"""
+        now = time.time()
+        queued = 0
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            due = conn.execute(
+                "SELECT url, interval_seconds FROM watchlist WHERE enabled = 1 AND next_run <= ?", (now,)
+            ).fetchall()
+            for url, interval_seconds in due:
+                # Don't pile up jobs for a URL that is still queued or being scraped
+                active = conn.execute(
+                    "SELECT 1 FROM jobs WHERE url = ? AND status IN ('pending', 'running') LIMIT 1", (url,)
+                ).fetchone()
+                if not active:
+                    conn.execute("INSERT INTO jobs (url, status, created_at) VALUES (?, 'pending', ?)", (url, _now()))
+                    queued += 1
+                conn.execute("UPDATE watchlist SET next_run = ? WHERE url = ?", (now + interval_seconds, url))
+        return queued
+
+    def claim_next(self):
+        """Atomically mark the oldest pending job as running and return (id, url)"""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT id, url FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ? WHERE id = ?",
+                (_now(), row[0])
+            )
+            return row
+
+    def complete(self, job_id, review_count):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, review_count = ?, error = NULL WHERE id = ?",
+                (_now(), review_count, job_id)
+            )
+
+    def fail(self, job_id, error):
+        """Requeue a failed job until it runs out of attempts"""
+        with self._connect() as conn:
+            attempts = conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            status = 'pending' if attempts < self.max_attempts else 'failed'
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                (status, _now(), error, job_id)
+            )
+            return status
+
+def scrape_url(url, progress=None):
+    """Run the scrape-and-score pipeline of ScraperThread synchronously in the calling thread"""
+    result = {"data": None, "error": None}
+    scraper = ScraperThread(url)
+    scraper.finished_signal.connect(lambda data: result.update(data=data))
+    scraper.error_signal.connect(lambda message: result.update(error=message))
+    if progress is not None:
+        scraper.progress_signal.connect(progress)
+    # Calling run() directly executes the scraper here instead of starting a new QThread
+    scraper.run()
+    if result["data"]:
+        return result["data"]
+    raise RuntimeError(result["error"] or "No reviews found")
+
+class MonitorService:
+    """Scheduler loop that feeds queued scrape jobs to a worker pool"""
+
+    def __init__(self, queue, store, workers=2, poll_interval=5.0):
+        self.queue = queue
+        self.store = store
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_job(self, job_id, url):
+        print(f"[job {job_id}] Scraping {url}")
+        try:
+            rows = scrape_url(url, progress=lambda message: print(f"[job {job_id}] {message}"))
+            # Results are appended to the review store as one import per job run
+            import_id = self.store.start_import("monitor", url)
+            stored = self.store.insert_rows(import_id, rows)
+            self.queue.complete(job_id, stored)
+            print(f"[job {job_id}] Stored {stored} reviews")
+        except Exception as e:
+            status = self.queue.fail(job_id, str(e))
+            print(f"[job {job_id}] Failed ({status}): {str(e)}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(job_id)
+
+    def run(self):
+        recovered = self.queue.recover_interrupted()
+        if recovered:
+            print(f"Resuming {recovered} interrupted job(s)")
+        print(f"Monitoring {len(self.queue.watchlist())} URL(s) with {self.workers} worker(s)")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stop.is_set():
+                self.queue.schedule_due()
+                # Only claim as many jobs as there are idle workers so the rest stay pending on disk
+                while True:
+                    with self._lock:
+                        if len(self._in_flight) >= self.workers:
+                            break
+                    job = self.queue.claim_next()
+                    if job is None:
+                        break
+                    with self._lock:
+                        self._in_flight.add(job[0])
+                    executor.submit(self.run_job, *job)
+                self._stop.wait(self.poll_interval)
+            print("Stopping monitor, waiting for running jobs to finish...")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless review watchlist monitor")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the SQLite job database")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="Path to the SQLite review store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = subparsers.add_parser("add", help="Add or update a watched URL")
+    add_parser.add_argument("url")
+    add_parser.add_argument("--interval", type=int, default=3600, help="Seconds between scrapes")
+
+    remove_parser = subparsers.add_parser("remove", help="Stop watching a URL")
+    remove_parser.add_argument("url")
+
+    subparsers.add_parser("list", help="Show the watchlist")
+
+    run_parser = subparsers.add_parser("run", help="Run the monitoring service")
+    run_parser.add_argument("--workers", type=int, default=2)
+    run_parser.add_argument("--poll", type=float, default=5.0, help="Seconds between scheduler ticks")
+
+    history_parser = subparsers.add_parser("history", help="Show stored results for a URL")
+    history_parser.add_argument("url")
+    history_parser.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    queue = JobQueue(args.db)
+
+    if args.command == "add":
+        queue.add_url(args.url, args.interval)
+        print(f"Watching {args.url} every {args.interval} seconds")
+    elif args.command == "remove":
+        queue.remove_url(args.url)
+        print(f"Removed {args.url}")
+    elif args.command == "list":
+        for url, interval_seconds, next_run, enabled in queue.watchlist():
+            next_time = datetime.fromtimestamp(next_run).strftime("%Y-%m-%d %H:%M:%S")
+            state = "enabled" if enabled else "disabled"
+            print(f"{url}  every {interval_seconds}s  next run {next_time}  ({state})")
+    elif args.command == "history":
+        for date, sentiment, confidence, text in ReviewStore(args.store).recent(args.url, args.limit):
+            print(f"{date}  {sentiment:<8} {confidence or 0:.2f}  {text[:80]}")
+    elif args.command == "run":
+        service = MonitorService(queue, ReviewStore(args.store), workers=args.workers, poll_interval=args.poll)
+        try:
+            service.run()
+        except KeyboardInterrupt:
+            service.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
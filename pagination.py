@@ -0,0 +1,154 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse, urljoin
+from bs4 import BeautifulSoup
+from review_api import PAGE_PARAMS, OFFSET_PARAMS, LIMIT_PARAMS
+
+# Path forms such as /page/4, /page-4, /p4 or /reviews/4
+PATH_PAGE_PATTERN = re.compile(r'(?i)(/(?:page|p|pg)[/\-_]?)(\d+)(?=/|$)')
+
+# Numeric parameters that never address a page, even when they are the only one that changed
+NON_PAGE_PARAMS = LIMIT_PARAMS + ('sort', 'sortby', 'order', 'orderby', 'filter', 'rating', 'stars', 'ts', 'timestamp',
+                                  'sessionid', 'sid', 'id', 'pid', 'productid', 'v', 'version')
+
+class PagePattern:
+    """How a site addresses review pages in its URLs"""
+
+    def __init__(self, base_url, kind, key, next_page, prefix='', step=1):
+        self.base_url = base_url
+        self.kind = kind  # 'query' or 'path'
+        self.key = key  # query parameter name, or path segment index
+        self.next_page = next_page
+        self.prefix = prefix  # text before the number in a path segment, e.g. 'page-'
+        self.step = step  # change of the number from one page to the next, e.g. 20 for offset=20
+
+    def page_value(self, index):
+        """URL number of the index-th page after the current one (0 is the next page)"""
+        return self.next_page + index * self.step
+
+    def url_for(self, page):
+        parsed = urlparse(self.base_url)
+        if self.kind == 'query':
+            query = [(name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+                     if name != self.key]
+            query.append((self.key, str(page)))
+            return urlunparse(parsed._replace(query=urlencode(query)))
+        segments = parsed.path.split('/')
+        segments[self.key] = f"{self.prefix}{page}"
+        return urlunparse(parsed._replace(path='/'.join(segments)))
+
+def detect_page_pattern(current_url, next_url):
+    """Work out the page-number pattern by comparing the current URL with the next-page link.
+
+    Supports query parameters (?page=2, pageNumber=3, offset=20) and numeric path segments
+    (/page/4). A query parameter with another name is only used when it is the single numeric
+    parameter that changed and it moved forward by a whole step (2 -> 3, or 20 -> 40), so ids,
+    timestamps or sort options that happen to differ are never crawled.
+    Returns a PagePattern or None when the next page is not addressed by URL.
+    """
+    next_url = urljoin(current_url, next_url)
+    current, following = urlparse(current_url), urlparse(next_url)
+    if current.netloc != following.netloc:
+        return None
+
+    # Numeric query parameters whose value changes (or appears) on the next page
+    current_query = dict(parse_qsl(current.query, keep_blank_values=True))
+    changed = [(name, int(value)) for name, value in parse_qsl(following.query, keep_blank_values=True)
+               if value.isdigit() and current_query.get(name) != value]
+    for name, value in changed:
+        previous = current_query.get(name, '')
+        if name.lower() in PAGE_PARAMS:
+            step = value - int(previous) if previous.isdigit() else 1
+        elif name.lower() in OFFSET_PARAMS:
+            # The first page usually has no offset at all, i.e. offset 0
+            step = value - int(previous) if previous.isdigit() else value
+        else:
+            continue
+        if step > 0:
+            return PagePattern(next_url, 'query', name, value, step=step)
+    if (len(changed) == 1 and changed[0][0].lower() not in NON_PAGE_PARAMS
+            and current_query.get(changed[0][0], '').isdigit()):
+        name, value = changed[0]
+        step = value - int(current_query[name])
+        if step > 0 and value % step == 0:
+            return PagePattern(next_url, 'query', name, value, step=step)
+
+    # Numeric path segment that differs between the two URLs
+    current_segments = current.path.split('/')
+    next_segments = following.path.split('/')
+    if len(current_segments) == len(next_segments):
+        for index, (old, new) in enumerate(zip(current_segments, next_segments)):
+            if old != new:
+                match = re.fullmatch(r'(?i)(?:page|p|pg)?[\-_]?(\d+)', new)
+                if match:
+                    return PagePattern(next_url, 'path', index, int(match.group(1)), new[:match.start(1)])
+                break
+    else:
+        # First page often has no page segment at all: /reviews -> /reviews/page/2
+        match = PATH_PAGE_PATTERN.search(following.path)
+        if match:
+            segment_index = following.path[:match.start(2)].count('/')
+            segment = next_segments[segment_index]
+            prefix = segment[:len(segment) - len(match.group(2))]
+            return PagePattern(next_url, 'path', segment_index, int(match.group(2)), prefix)
+    return None
+
+def extract_reviews_from_html(html, selectors, min_chars=30):
+    """Extract review container texts from static HTML with the scraper's CSS selectors"""
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    texts = set()
+    for selector in selectors:
+        try:
+            elements = soup.select(selector)
+        except Exception:
+            continue
+        for element in elements:
+            text = ' '.join(element.get_text(" ").split())
+            if len(text) > min_chars:
+                texts.add(text)
+    return texts
+
+def _fetch_page(session, url, selectors, timeout):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return extract_reviews_from_html(response.text, selectors)
+
+def fetch_pages_concurrently(pattern, session, selectors, max_pages=10, max_workers=4,
+                             seen=None, timeout=15, progress=None):
+    """Fetch review pages in waves of at most max_workers concurrent requests.
+
+    Pages are consumed in order and crawling stops at the first page that is empty, fails,
+    or only repeats reviews already collected (sites that ignore an out-of-range page number).
+    """
+    seen = set(seen or ())
+    collected = set()
+    page = 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while page < max_pages:
+            wave = [pattern.page_value(index) for index in range(page, min(page + max_workers, max_pages))]
+            futures = [executor.submit(_fetch_page, session, pattern.url_for(number), selectors, timeout)
+                       for number in wave]
+            for number, future in zip(wave, futures):
+                try:
+                    texts = future.result()
+                except Exception as e:
+                    texts = set()
+                    if progress:
+                        progress(f"Failed to fetch page {number}: {str(e)}")
+                new_texts = texts - seen
+                if not new_texts:
+                    # Let the rest of the wave finish, but don't use pages past the end
+                    for pending in futures:
+                        pending.cancel()
+                    if progress:
+                        progress(f"Page {number} has no new reviews, stopping pagination")
+                    return collected
+                seen.update(new_texts)
+                collected.update(new_texts)
+                if progress:
+                    progress(f"Fetched page {number}: {len(new_texts)} reviews ({len(collected)} from extra pages)")
+            page += len(wave)
+    return collected
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from models import model_loader, embed_missing
+from utils import clean_text_series, get_aspect_sentiment_batch
+
+# Which rows a scoring run covers, with the label shown in the GUI
+RESCORE_MODES = {
+    "missing": "Reviews without a sentiment",
+    "outdated": "Reviews scored by an older model",
+    "all": "All reviews",
+}
+
+def rows_to_score(df, mode, model_version=None):
+    """Index labels of the rows a scoring run in the given mode should cover"""
+    if mode == "all":
+        return df.index
+    missing = df["sentiment"].isna()
+    if mode == "missing":
+        return df.index[missing]
+    if mode == "outdated":
+        outdated = df["model_version"].astype(object) != model_version
+        return df.index[missing | outdated]
+    raise ValueError(f"Unknown scoring mode: {mode}")
+
+def _add_categories(df, col, values):
+    # Categorical columns only accept labels they already know
+    if isinstance(df[col].dtype, pd.CategoricalDtype):
+        new = pd.Index(pd.unique(pd.Series(values, dtype=object).dropna()))
+        new = new.difference(df[col].cat.categories)
+        if len(new):
+            df[col] = df[col].cat.add_categories(new)
+
+def apply_scores(df, index, sentiments, confidences, model_version, aspects=None):
+    """Write a batch of scores, and optionally the reviews' aspect labels, into the dataset in place"""
+    _add_categories(df, "sentiment", sentiments)
+    _add_categories(df, "model_version", [model_version])
+    if aspects is not None:
+        _add_categories(df, "aspects", aspects)
+        df.loc[index, "aspects"] = list(aspects)
+    df.loc[index, "sentiment"] = list(sentiments)
+    df.loc[index, "confidence"] = np.asarray(confidences, dtype=df["confidence"].dtype)
+    df.loc[index, "model_version"] = model_version
+
+class RescoreThread(QThread):
+    """Score or re-score the reviews of a loaded dataset with batched model inference"""
+    progress_signal = pyqtSignal(int, str)
+    batch_signal = pyqtSignal(object, object, object, str, object)  # index labels, sentiments, confidences, model version, aspects
+    finished_signal = pyqtSignal(int)
+    error_signal = pyqtSignal(str)
+    cancelled_signal = pyqtSignal()
+
+    def __init__(self, df, mode="missing", store=None, import_id=None, batch_size=32, chunk_rows=256, embeddings=None):
+        super().__init__()
+        # Work on a snapshot so the GUI can keep updating its DataFrame while this runs
+        self.reviews = df[["text", "sentiment", "model_version"]].copy()
+        self.mode = mode
+        self.store = store
+        self.import_id = import_id
+        self.batch_size = batch_size
+        self.chunk_rows = chunk_rows
+        # Optional EmbeddingStore; reviews are encoded alongside scoring so search never waits on them
+        self.embeddings = embeddings
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            self.progress_signal.emit(0, "Loading sentiment model...")
+            if model_loader.sentiment_transformer is None:
+                self.error_signal.emit("Sentiment model could not be loaded.")
+                return
+            model_version = model_loader.model_version or "unknown"
+
+            index = rows_to_score(self.reviews, self.mode, model_version)
+            total = len(index)
+            scored = 0
+            for start in range(0, total, self.chunk_rows):
+                if self._cancelled:
+                    self.cancelled_signal.emit()
+                    return
+                chunk_index = index[start:start + self.chunk_rows]
+                texts = self.reviews.loc[chunk_index, "text"]
+                # Score the same cleaned text the scraper scores
+                cleaned = clean_text_series(texts).fillna("").tolist()
+                scores, aspects = get_aspect_sentiment_batch(cleaned, batch_size=self.batch_size)
+                sentiments = [sentiment for sentiment, _ in scores]
+                confidences = [confidence for _, confidence in scores]
+
+                if self.store is not None and self.import_id is not None:
+                    try:
+                        self.store.update_scores(self.import_id, zip(texts, sentiments, confidences,
+                                                                     [model_version] * len(scores), aspects))
+                    except Exception as e:
+                        print(f"Warning: Could not update scores in the store: {str(e)}")
+
+                if self.embeddings is not None:
+                    try:
+                        embed_missing(self.embeddings, texts.tolist())
+                    except Exception as e:
+                        print(f"Warning: Could not store review embeddings: {str(e)}")
+                        self.embeddings = None
+                        
+                scored += len(scores)
+                self.batch_signal.emit(chunk_index, sentiments, confidences, model_version, aspects)
+                self.progress_signal.emit(int(scored / total * 100), f"Scored {scored:,} of {total:,} reviews...")
+
+            self.finished_signal.emit(scored)
+        except Exception as e:
+            self.error_signal.emit(f"Failed to score reviews:\n\n{str(e)}")
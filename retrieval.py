@@ -0,0 +1,80 @@
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+def split_passages(texts, max_words=120):
+    """
+    Cut texts into passages of at most max_words words.
+
+    Returns:
+        tuple: (passages, positions) where positions[i] is the index of the text passage i came from
+    """
+    passages, positions = [], []
+    for position, text in enumerate(texts):
+        if not isinstance(text, str):
+            continue
+        words = text.split()
+        for start in range(0, len(words), max_words):
+            passages.append(" ".join(words[start:start + max_words]))
+            positions.append(position)
+    return passages, np.asarray(positions, dtype=np.int64)
+
+class BM25Index:
+    """
+    Okapi BM25 index over review passages.
+
+    The BM25 weight of every (passage, term) pair is computed once when the index is built and
+    stored column-wise, so a query only reads the posting lists of its own terms.
+    """
+
+    def __init__(self, passages, positions, postings, vocabulary, analyzer):
+        self.passages = passages
+        self.positions = positions
+        self.postings = postings
+        self.vocabulary = vocabulary
+        self.analyzer = analyzer
+
+    @classmethod
+    def build(cls, texts, max_words=120, k1=1.5, b=0.75):
+        """Index a list of review texts"""
+        passages, positions = split_passages(texts, max_words)
+        if not passages:
+            raise ValueError("No review text to index")
+        vectorizer = CountVectorizer(stop_words="english", dtype=np.float32)
+        counts = vectorizer.fit_transform(passages).tocsr()
+
+        n = counts.shape[0]
+        lengths = np.asarray(counts.sum(axis=1)).ravel()
+        average = lengths.mean() or 1.0
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log1p((n - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        rows = np.repeat(np.arange(n), np.diff(counts.indptr))
+        tf = counts.data
+        weights = counts.copy()
+        weights.data = (idf[counts.indices] * tf * (k1 + 1) /
+                        (tf + k1 * (1 - b + b * lengths[rows] / average))).astype(np.float32)
+        return cls(passages, positions, weights.tocsc(), vectorizer.vocabulary_, vectorizer.build_analyzer())
+
+    def __len__(self):
+        return len(self.passages)
+
+    def search(self, query, k=10):
+        """
+        Best matching passages for a query.
+
+        Returns:
+            list: (passage index, BM25 score) pairs, best first
+        """
+        terms = sorted({self.vocabulary[token] for token in self.analyzer(query) if token in self.vocabulary})
+        if not terms:
+            return []
+        # Sum the query terms' posting lists; passages without any query term are never touched
+        matches = self.postings[:, terms].tocoo()
+        hits, inverse = np.unique(matches.row, return_inverse=True)
+        scores = np.bincount(inverse, weights=matches.data)
+        if len(hits) > k:
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(len(hits))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(hits[i]), float(scores[i])) for i in best]
@@ -0,0 +1,226 @@
+import json
+import re
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# Query parameters that address a page number or a row offset in review APIs
+PAGE_PARAMS = ('page', 'pagenumber', 'page_number', 'pageno', 'page_no', 'pg', 'p', 'pageindex')
+OFFSET_PARAMS = ('offset', 'start', 'skip', 'from', 'startindex', 'start_index')
+LIMIT_PARAMS = ('limit', 'size', 'pagesize', 'page_size', 'count', 'per_page', 'perpage', 'rows', 'num')
+
+# Field names that usually hold the review body, used to break ties between candidate text fields
+TEXT_KEY_HINTS = ('review', 'text', 'body', 'comment', 'content', 'description', 'message', 'feedback')
+
+MIN_REVIEW_CHARS = 30
+MIN_REVIEW_WORDS = 5
+
+def enable_network_capture(chrome_options):
+    """Ask chromedriver to record DevTools network events in the performance log"""
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+def session_from_driver(driver, pool_size=8):
+    """Create a pooled requests.Session carrying the browser's cookies and user agent"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    try:
+        user_agent = driver.execute_script("return navigator.userAgent")
+        session.headers["User-Agent"] = user_agent
+    except Exception:
+        pass
+    session.headers["Referer"] = driver.current_url
+    session.headers["Accept"] = "application/json, text/plain, */*"
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"], cookie["value"],
+            domain=cookie.get("domain"), path=cookie.get("path", "/")
+        )
+    return session
+
+def _looks_like_review(value):
+    return (isinstance(value, str) and len(value) >= MIN_REVIEW_CHARS
+            and len(value.split()) >= MIN_REVIEW_WORDS)
+
+def _flatten(item, prefix="", depth=0):
+    """Flatten nested dict fields into dotted keys (two levels deep)"""
+    flat = {}
+    for key, value in item.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and depth < 1:
+            flat.update(_flatten(value, name + ".", depth + 1))
+        else:
+            flat[name] = value
+    return flat
+
+def _best_text_key(items):
+    """Pick the field holding review-like text in a list of dicts, or None"""
+    counts = {}
+    lengths = {}
+    for item in items:
+        for key, value in _flatten(item).items():
+            if _looks_like_review(value):
+                counts[key] = counts.get(key, 0) + 1
+                lengths[key] = lengths.get(key, 0) + len(value)
+    if not counts:
+        return None
+
+    def rank(key):
+        hint = any(h in key.lower() for h in TEXT_KEY_HINTS)
+        return (counts[key], hint, lengths[key])
+
+    key = max(counts, key=rank)
+    # Most items in the list must carry the field, otherwise it's not a review list
+    if counts[key] < max(2, len(items) // 2):
+        return None
+    return key
+
+def _get_path(payload, path):
+    for step in path:
+        payload = payload[step]
+    return payload
+
+def find_review_list(payload, max_depth=6):
+    """Search a decoded JSON payload for the largest list of review-like objects.
+
+    Returns (path, text_key, texts) or None.
+    """
+    best = None
+    stack = [(payload, ())]
+    while stack:
+        node, path = stack.pop()
+        if len(path) > max_depth:
+            continue
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if isinstance(value, (dict, list)):
+                    stack.append((value, path + (key,)))
+        elif isinstance(node, list) and node:
+            dicts = [item for item in node if isinstance(item, dict)]
+            if len(dicts) >= 2:
+                text_key = _best_text_key(dicts)
+                if text_key:
+                    texts = extract_texts(node, text_key)
+                    if best is None or len(texts) > len(best[2]):
+                        best = (path, text_key, texts)
+            for index, value in enumerate(node[:5]):
+                if isinstance(value, (dict, list)):
+                    stack.append((value, path + (index,)))
+    return best
+
+def extract_texts(items, text_key):
+    texts = []
+    for item in items:
+        if isinstance(item, dict):
+            value = _flatten(item).get(text_key)
+            if _looks_like_review(value):
+                texts.append(' '.join(value.split()))
+    return texts
+
+class ReviewEndpoint:
+    """A JSON endpoint discovered in the browser's network traffic that returns reviews"""
+
+    def __init__(self, url, path, text_key, texts):
+        self.url = url
+        self.path = path
+        self.text_key = text_key
+        self.texts = texts
+        self.param, self.kind, self.value, self.step = self._detect_paging()
+
+    def _detect_paging(self):
+        """Find the query parameter that advances through pages: (name, kind, value, step)"""
+        query = parse_qsl(urlparse(self.url).query, keep_blank_values=True)
+        lowered = {name.lower(): (name, value) for name, value in query}
+        for candidates, kind in ((PAGE_PARAMS, 'page'), (OFFSET_PARAMS, 'offset')):
+            for candidate in candidates:
+                if candidate in lowered and re.fullmatch(r'\d+', lowered[candidate][1] or ''):
+                    name, value = lowered[candidate]
+                    step = 1
+                    if kind == 'offset':
+                        limit = next((lowered[l][1] for l in LIMIT_PARAMS if l in lowered), None)
+                        step = int(limit) if limit and limit.isdigit() else max(len(self.texts), 1)
+                    return name, kind, int(value), step
+        return None, None, None, None
+
+    @property
+    def pageable(self):
+        return self.param is not None
+
+    def page_url(self, index):
+        """URL of the page `index` steps after the captured one"""
+        parsed = urlparse(self.url)
+        query = [
+            (name, str(self.value + index * self.step) if name == self.param else value)
+            for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        ]
+        return urlunparse(parsed._replace(query=urlencode(query)))
+
+    def parse(self, payload):
+        try:
+            items = _get_path(payload, self.path)
+        except (KeyError, IndexError, TypeError):
+            found = find_review_list(payload)
+            return found[2] if found else []
+        return extract_texts(items, self.text_key) if isinstance(items, list) else []
+
+def discover_review_endpoints(driver):
+    """Inspect the performance log for JSON responses that contain lists of reviews"""
+    requests_by_id = {}
+    responses = []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            requests_by_id[params.get("requestId")] = params.get("request", {}).get("method", "GET")
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            if "json" in response.get("mimeType", "").lower() and params.get("type") in ("XHR", "Fetch"):
+                responses.append((params.get("requestId"), response.get("url")))
+
+    endpoints = []
+    seen = set()
+    for request_id, url in responses:
+        # Only GET endpoints can be replayed page by page without knowing the request body format
+        if requests_by_id.get(request_id, "GET") != "GET" or url in seen:
+            continue
+        seen.add(url)
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+            payload = json.loads(body.get("body", ""))
+        except Exception:
+            continue
+        found = find_review_list(payload)
+        if found:
+            endpoints.append(ReviewEndpoint(url, *found))
+    endpoints.sort(key=lambda endpoint: len(endpoint.texts), reverse=True)
+    return endpoints
+
+def fetch_endpoint_pages(endpoint, session, max_pages=50, timeout=15, progress=None):
+    """Page through a discovered endpoint over HTTP until a page is empty or repeats"""
+    texts = list(endpoint.texts)
+    if not endpoint.pageable:
+        return texts
+    seen = set(texts)
+    for index in range(1, max_pages):
+        url = endpoint.page_url(index)
+        try:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+            page_texts = endpoint.parse(response.json())
+        except Exception as e:
+            if progress:
+                progress(f"Stopped paging review API at page {index + 1}: {str(e)}")
+            break
+        new_texts = [text for text in page_texts if text not in seen]
+        if not new_texts:
+            break
+        seen.update(new_texts)
+        texts.extend(new_texts)
+        if progress:
+            progress(f"Fetched review API page {index + 1} ({len(texts)} reviews so far)")
+    return texts
@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import hashlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from dataset_io import REVIEW_COLUMNS
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reviews.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS imports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    origin TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    import_id INTEGER NOT NULL REFERENCES imports (id),
+    text TEXT NOT NULL,
+    sentiment TEXT,
+    source TEXT,
+    date TEXT,
+    user_id TEXT,
+    location TEXT,
+    confidence REAL,
+    model_version TEXT,
+    aspects TEXT,
+    content_hash TEXT NOT NULL,
+    UNIQUE (import_id, content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_source ON reviews (source);
+CREATE INDEX IF NOT EXISTS idx_reviews_sentiment ON reviews (sentiment);
+CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews (date);
+CREATE INDEX IF NOT EXISTS idx_reviews_hash ON reviews (content_hash);
+CREATE INDEX IF NOT EXISTS idx_reviews_import_sentiment ON reviews (import_id, sentiment);
+"""
+
+def content_hash(text):
+    """Stable hash of a review's text, ignoring whitespace differences"""
+    return hashlib.sha1(' '.join(str(text).split()).encode('utf-8')).hexdigest()
+
+def _value(value):
+    # SQLite can't bind NaN/NA or numpy scalars
+    if pd.isna(value):
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+def unique_reviews(df, seen=None):
+    """
+    Rows of a review DataFrame the store keeps for one import: one per distinct text, in order.
+
+    The store deduplicates by content hash, so applying the same rule to the in-memory dataset
+    keeps its counts in line with the store. Rows without text are dropped as well.
+
+    Args:
+        df (DataFrame): Reviews with a 'text' column
+        seen (set): Content hashes kept from earlier chunks of the same import, updated in place
+    """
+    seen = set() if seen is None else seen
+    keep = np.zeros(len(df), dtype=bool)
+    for i, text in enumerate(df["text"].astype(object)):
+        if isinstance(text, str):
+            key = content_hash(text)
+            if key not in seen:
+                seen.add(key)
+                keep[i] = True
+    return df[keep]
+
+class ReviewStore:
+    """Local SQLite store that keeps every scraped or imported review"""
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Stores created before scores were tagged with a model version or aspects lack the columns
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(reviews)")]
+            for column in ("model_version", "aspects"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE reviews ADD COLUMN {column} TEXT")
+
+    def _connect(self):
+        # Short-lived connections so the store can be used from worker threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start_import(self, kind, origin=None):
+        """Register a scrape or file load and return its import id"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO imports (kind, origin, created_at) VALUES (?, ?, ?)",
+                (kind, origin, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            return cursor.lastrowid
+
+    def delete_import(self, import_id):
+        """Remove an import and its reviews, e.g. after a cancelled load"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM reviews WHERE import_id = ?", (import_id,))
+            conn.execute("DELETE FROM imports WHERE id = ?", (import_id,))
+
+    def insert_rows(self, import_id, rows):
+        """Bulk insert rows laid out like REVIEW_COLUMNS in a single transaction"""
+        records = []
+        for row in rows:
+            text = row[0]
+            if not isinstance(text, str):
+                continue
+            values = [_value(v) for v in row[1:9]]
+            values += [None] * (8 - len(values))  # Rows from before model versions or aspects were recorded
+            records.append((import_id, text, *values, content_hash(text)))
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO reviews (import_id, text, sentiment, source, date, user_id, location, "
+                "confidence, model_version, aspects, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records
+            )
+            return conn.total_changes - before
+
+    def insert_frame(self, import_id, df, chunk_rows=50_000):
+        """Insert a review DataFrame in chunked transactions"""
+        columns = [col for col in REVIEW_COLUMNS if col in df.columns]
+        frame = df[columns].reindex(columns=REVIEW_COLUMNS)
+        inserted = 0
+        for start in range(0, len(frame), chunk_rows):
+            chunk = frame.iloc[start:start + chunk_rows]
+            inserted += self.insert_rows(import_id, chunk.itertuples(index=False, name=None))
+        return inserted
+
+    def update_scores(self, import_id, scores):
+        """Overwrite the scores of (text, sentiment, confidence, model version, aspects) rows"""
+        records = [
+            (sentiment, _value(confidence), model_version, aspects, import_id, content_hash(text))
+            for text, sentiment, confidence, model_version, aspects in scores
+            if isinstance(text, str)
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE reviews SET sentiment = ?, confidence = ?, model_version = ?, aspects = ? "
+                "WHERE import_id = ? AND content_hash = ?",
+                records
+            )
+            
+    def _where(self, import_id=None, sentiment=None, source=None):
+        clauses, params = [], []
+        if import_id is not None:
+            clauses.append("import_id = ?")
+            params.append(import_id)
+        if sentiment is not None:
+            clauses.append("sentiment = ?")
+            params.append(sentiment)
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def texts(self, import_id=None, sentiment=None, source=None, limit=None):
+        where, params = self._where(import_id, sentiment, source)
+        query = f"SELECT text FROM reviews{where} ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(query, params)]
+
+    def recent(self, source, limit=20):
+        """Latest stored reviews for a source URL, newest first"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT date, sentiment, confidence, text FROM reviews WHERE source = ? ORDER BY id DESC LIMIT ?",
+                (source, limit)
+            ).fetchall()
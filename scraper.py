@@ -11,20 +11,246 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from utils import process_review_batch, is_non_review_content, thread_local
+from utils import process_review_batch, drop_non_reviews, thread_local
+from models import embed_missing
+from review_api import enable_network_capture, discover_review_endpoints, fetch_endpoint_pages, session_from_driver
+from pagination import detect_page_pattern, fetch_pages_concurrently
+
+# XPath patterns for cookie/consent acceptance controls
+CONSENT_XPATHS = [
+    "//*[contains(text(), 'Accept') or contains(text(), 'I agree') or contains(text(), 'Allow') or contains(text(), 'Got it') or contains(text(), 'OK')]",
+    "//button[contains(@id, 'cookie') or contains(@class, 'cookie')]",
+    "//a[contains(@id, 'cookie') or contains(@class, 'cookie')]",
+    "//div[contains(@id, 'consent') or contains(@class, 'consent')]//button",
+    "//div[contains(@id, 'gdpr') or contains(@class, 'gdpr')]//button",
+    "//div[contains(@id, 'privacy') or contains(@class, 'privacy')]//button",
+    "//button[contains(@id, 'accept') or contains(@class, 'accept')]",
+    "//button[contains(@id, 'agree') or contains(@class, 'agree')]"
+]
+
+# XPath patterns for "Read More" style controls that expand truncated reviews
+EXPAND_XPATHS = [
+    "//*[contains(text(), 'Read More')]",
+    "//*[contains(text(), '... More')]",
+    "//*[contains(text(), 'Show Full Review')]",
+    "//*[contains(text(), 'See More')]",
+    "//*[contains(text(), 'Continue Reading')]",
+    "//*[contains(text(), 'Expand Review')]",
+    "//*[contains(@class, 'expand')]",
+    "//*[contains(@class, 'more')]",
+    "//button[contains(@aria-label, 'expand')]",
+    "//a[contains(@class, 'read-more')]",
+    "//span[contains(@class, 'read-more')]"
+]
+
+# CSS selectors for review containers, shared with the HTTP page fetcher
+REVIEW_CONTAINER_SELECTORS = [
+    "div.review", "div.comment", "div.feedback", "div.testimonial",
+    "div[class*='review']", "div[class*='comment']", "div[class*='feedback']",
+    "div[itemprop='review']", "div[data-hook='review']",
+    "li[class*='review']", "article[class*='review']",
+    ".review-card", ".review-container", ".review-wrapper",
+    "[data-testid*='review']", "[data-test*='review']",
+    "div.review-content", "div.review-text", "div.review-body",
+    "div[class*='reviewText']", "div[class*='reviewContent']",
+    "div[class*='reviewBody']", "div[class*='review-text']",
+    "div[class*='review-content']", "div[class*='review-body']"
+]
+
+# XPath patterns for "Next page" controls
+NEXT_PAGE_XPATHS = [
+    "//a[contains(text(), 'Next')]",
+    "//button[contains(text(), 'Next')]",
+    "//a[contains(@class, 'next')]",
+    "//button[contains(@class, 'next')]",
+    "//a[contains(@aria-label, 'Next')]",
+    "//button[contains(@aria-label, 'Next')]",
+    "//a[contains(@rel, 'next')]",
+    "//li[contains(@class, 'next')]/a",
+    "//div[contains(@class, 'pagination')]//a[contains(@class, 'next')]",
+    "//div[contains(@class, 'pagination')]//button[contains(@class, 'next')]",
+    "//a[.//i[contains(@class, 'arrow') or contains(@class, 'next')]]",
+    "//button[.//i[contains(@class, 'arrow') or contains(@class, 'next')]]",
+    "//a[contains(@class, 'pagination-next')]",
+    "//button[contains(@class, 'pagination-next')]"
+]
+
+# Returns the href of the first visible "Next page" link matching one of the given XPaths
+NEXT_PAGE_URL_SCRIPT = """
+for (const xpath of arguments[0]) {
+    let snapshot;
+    try {
+        snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        const node = snapshot.snapshotItem(i);
+        const link = node.closest ? node.closest('a[href]') : null;
+        if (link && link.getClientRects().length && !link.getAttribute('href').startsWith('#')) {
+            return link.href;
+        }
+    }
+}
+return null;
+"""
+
+# Async script: clicks the first visible control of each consent pattern and every visible expand
+# control in one pass, then resolves once the DOM has been quiet for quietMs (or timeoutMs elapses).
+# Arguments: consentXPaths, expandXPaths, quietMs, timeoutMs, callback
+PREPARE_PAGE_SCRIPT = """
+const [consentXPaths, expandXPaths, quietMs, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+
+function isVisible(el) {
+    if (!el.getClientRects().length) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+
+function matches(xpath) {
+    try {
+        const snapshot = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+        return nodes;
+    } catch (e) {
+        return [];
+    }
+}
+
+let consent = 0;
+for (const xpath of consentXPaths) {
+    const button = matches(xpath).find(isVisible);
+    if (button) {
+        try { button.click(); consent++; } catch (e) {}
+    }
+}
+
+// Collect candidates from all patterns, then keep only the innermost ones so a wrapper
+// and the button inside it are not both clicked (which would collapse the text again)
+const candidates = new Set();
+for (const xpath of expandXPaths) {
+    for (const el of matches(xpath)) {
+        if (el.nodeType === Node.ELEMENT_NODE && isVisible(el)) candidates.add(el);
+    }
+}
+const all = Array.from(candidates);
+const innermost = all.filter(el => !all.some(other => other !== el && el.contains(other)));
+
+let expanded = 0;
+for (const el of innermost) {
+    try { el.click(); expanded++; } catch (e) {}
+}
+
+if (!consent && !expanded) {
+    done({consent: 0, expanded: 0});
+} else {
+    let quietTimer = null;
+    const finish = () => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(hardTimer);
+        done({consent: consent, expanded: expanded});
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(finish, quietMs);
+    });
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    quietTimer = setTimeout(finish, quietMs);
+    const hardTimer = setTimeout(finish, timeoutMs);
+}
+"""
+
+# Single-pass block classifier used when the selector-based extraction finds too few reviews.
+# Walks the DOM once with an explicit stack, attributes every text node to its nearest block-level
+# ancestor and keeps blocks that look like prose (enough words, a sentence mark, few link characters).
+# Text stops accumulating once a block exceeds maxChars, so memory stays bounded on huge pages.
+# Arguments: minChars, maxChars, minWords, maxLinkDensity, maxBlocks
+TEXT_DENSITY_SCRIPT = """
+const [minChars, maxChars, minWords, maxLinkDensity, maxBlocks] = arguments;
+const SKIP = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'SVG', 'CANVAS', 'IFRAME',
+                      'NAV', 'FOOTER', 'HEADER', 'FORM', 'SELECT', 'BUTTON', 'INPUT', 'TEXTAREA']);
+const BLOCKS = new Set(['P', 'DIV', 'LI', 'ARTICLE', 'SECTION', 'BLOCKQUOTE', 'TD', 'DD', 'MAIN',
+                        'ASIDE', 'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'PRE', 'FIGCAPTION', 'BODY']);
+
+const stats = new Map();
+const order = [];
+const stack = [[document.body, document.body, false]];
+while (stack.length) {
+    const [node, block, inLink] = stack.pop();
+    if (node.nodeType === Node.TEXT_NODE) {
+        const text = node.nodeValue;
+        if (!text.trim()) continue;
+        let entry = stats.get(block);
+        if (!entry) {
+            entry = {parts: [], chars: 0, linkChars: 0, overflow: false};
+            stats.set(block, entry);
+            order.push(block);
+        }
+        if (entry.overflow) continue;
+        entry.chars += text.length;
+        if (inLink) entry.linkChars += text.length;
+        if (entry.chars > maxChars) {
+            entry.overflow = true;
+            entry.parts = null;
+        } else {
+            entry.parts.push(text);
+        }
+        continue;
+    }
+    if (node.nodeType !== Node.ELEMENT_NODE) continue;
+    const tag = node.tagName.toUpperCase();
+    if (SKIP.has(tag) || node.hidden || node.getAttribute('aria-hidden') === 'true') continue;
+    const nextBlock = BLOCKS.has(tag) ? node : block;
+    const nextInLink = inLink || tag === 'A';
+    for (let child = node.lastChild; child; child = child.previousSibling) {
+        stack.push([child, nextBlock, nextInLink]);
+    }
+}
+
+const results = [];
+for (const block of order) {
+    if (results.length >= maxBlocks) break;
+    const entry = stats.get(block);
+    if (entry.overflow || entry.chars < minChars) continue;
+    if (entry.linkChars / entry.chars > maxLinkDensity) continue;
+    const text = entry.parts.join(' ').replace(/\\s+/g, ' ').trim();
+    if (text.length < minChars || !/[.!?]/.test(text)) continue;
+    if (text.split(' ').length < minWords) continue;
+    if (!block.getClientRects().length) continue;
+    results.push(text);
+}
+return results;
+"""
 
 class ScraperThread(QThread):
     # Define signals at the class level
     progress_signal = pyqtSignal(str)
     finished_signal = pyqtSignal(list)
+    batch_signal = pyqtSignal(list)  # Rows of each scored batch as soon as it completes
     error_signal = pyqtSignal(str)
     
-    def __init__(self, url):
+    def __init__(self, url, embeddings=None):
         super().__init__()
         self.url = url
+        # Optional EmbeddingStore; scored reviews are encoded as they come in, like during rescoring
+        self.embeddings = embeddings
         self.driver = None
         self.scroll_pause_time = 2.0  # Time to pause between scrolls
         self.max_scrolls = 15  # Maximum number of scrolls to perform
+        self.settle_quiet_ms = 500  # DOM must be quiet this long after bulk clicks
+        self.settle_timeout_ms = 5000  # Upper bound on waiting for the DOM to settle
+        # Thresholds for the text-density fallback extractor
+        self.density_min_chars = 50
+        self.density_max_chars = 3000
+        self.density_min_words = 10
+        self.density_max_link_density = 0.3
+        self.density_max_blocks = 1000
+        self.max_api_pages = 50  # Maximum pages to fetch from a discovered review JSON API
+        self.max_pages = 10  # Maximum review pages to crawl when pages are addressed by URL
+        self.page_workers = 4  # Concurrent page requests
         
     
     def run(self):
@@ -38,6 +264,8 @@ class ScraperThread(QThread):
             chrome_options.add_argument("--disable-logging")
             chrome_options.add_argument("--disable-notifications")
             chrome_options.page_load_strategy = 'eager'  # Load faster by not waiting for all resources
+            # Record network events so review JSON endpoints can be discovered and replayed over HTTP
+            enable_network_capture(chrome_options)
             
             # More aggressive GPU disabling to prevent GLES errors
             chrome_options.add_argument("--disable-gpu")
@@ -68,31 +296,11 @@ class ScraperThread(QThread):
             # Wait for page to load - increase initial wait time
             time.sleep(5)
             
-            # Try to accept cookies if present (common blocker for scraping) - enhanced with more patterns
+            # Accept cookies/consent dialogs (common blocker for scraping) in a single injected script
             try:
-                # More comprehensive list of cookie acceptance patterns
-                cookie_selectors = [
-                    "//*[contains(text(), 'Accept') or contains(text(), 'I agree') or contains(text(), 'Allow') or contains(text(), 'Got it') or contains(text(), 'OK')]",
-                    "//button[contains(@id, 'cookie') or contains(@class, 'cookie')]",
-                    "//a[contains(@id, 'cookie') or contains(@class, 'cookie')]",
-                    "//div[contains(@id, 'consent') or contains(@class, 'consent')]//button",
-                    "//div[contains(@id, 'gdpr') or contains(@class, 'gdpr')]//button",
-                    "//div[contains(@id, 'privacy') or contains(@class, 'privacy')]//button",
-                    "//button[contains(@id, 'accept') or contains(@class, 'accept')]",
-                    "//button[contains(@id, 'agree') or contains(@class, 'agree')]"
-                ]
-                
-                for selector in cookie_selectors:
-                    try:
-                        cookie_buttons = self.driver.find_elements(By.XPATH, selector)
-                        for button in cookie_buttons:
-                            if button.is_displayed():
-                                self.driver.execute_script("arguments[0].click();", button)
-                                time.sleep(2)
-                                self.progress_signal.emit("Accepted cookies/consent dialog")
-                                break
-                    except:
-                        continue
+                consent_count, _ = self.prepare_page(consent=True)
+                if consent_count:
+                    self.progress_signal.emit("Accepted cookies/consent dialog")
             except Exception as e:
                 print(f"Cookie button error: {e}")  # Log but continue
                 
@@ -135,59 +343,27 @@ class ScraperThread(QThread):
                 
             self.progress_signal.emit(f"Completed {scroll_count} scrolls")
             
-            # Expand review text if possible - try multiple patterns for "Read More" buttons
+            # Expand review text if possible - click every "Read More" control at once and wait for the DOM to settle
             try:
                 self.progress_signal.emit("Expanding review texts...")
-                expand_patterns = [
-                    "//*[contains(text(), 'Read More')]",
-                    "//*[contains(text(), '... More')]",
-                    "//*[contains(text(), 'Show Full Review')]",
-                    "//*[contains(text(), 'See More')]",
-                    "//*[contains(text(), 'Continue Reading')]",
-                    "//*[contains(text(), 'Expand Review')]",
-                    "//*[contains(@class, 'expand')]",
-                    "//*[contains(@class, 'more')]",
-                    "//button[contains(@aria-label, 'expand')]",
-                    "//a[contains(@class, 'read-more')]",
-                    "//span[contains(@class, 'read-more')]"
-                ]
-                
-                for pattern in expand_patterns:
-                    expand_buttons = self.driver.find_elements(By.XPATH, pattern)
-                    for button in expand_buttons:
-                        if button.is_displayed():
-                            try:
-                                # Scroll to the button first
-                                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-                                time.sleep(0.5)
-                                self.driver.execute_script("arguments[0].click();", button)
-                                time.sleep(0.5)
-                            except:
-                                pass  # Continue if one button fails
+                _, expanded_count = self.prepare_page(expand=True)
+                self.progress_signal.emit(f"Expanded {expanded_count} truncated reviews")
             except Exception as e:
                 print(f"Expand review error: {e}")  # Log but continue
         
             # Extract review content with improved selectors
             self.progress_signal.emit("Extracting review content...")
             
-            # First try to identify the main review container
             reviews = set()  # Use set to avoid duplicates
             
-            # Try to find review containers first - this is more reliable than individual elements
-            container_selectors = [
-                "div.review", "div.comment", "div.feedback", "div.testimonial",
-                "div[class*='review']", "div[class*='comment']", "div[class*='feedback']",
-                "div[itemprop='review']", "div[data-hook='review']",
-                "li[class*='review']", "article[class*='review']",
-                ".review-card", ".review-container", ".review-wrapper",
-                "[data-testid*='review']", "[data-test*='review']",
-                "div.review-content", "div.review-text", "div.review-body",
-                "div[class*='reviewText']", "div[class*='reviewContent']",
-                "div[class*='reviewBody']", "div[class*='review-text']",
-                "div[class*='review-content']", "div[class*='review-body']"
-            ]
+            # If the page loaded its reviews from a JSON API, page through it directly instead of rendering
+            api_reviews = self.collect_api_reviews()
+            if api_reviews:
+                reviews.update(api_reviews)
+                self.progress_signal.emit(f"Collected {len(api_reviews)} reviews from the site's review API")
             
-            for selector in container_selectors:
+            # Try to find review containers first - this is more reliable than individual elements
+            for selector in REVIEW_CONTAINER_SELECTORS:
                 containers = self.driver.find_elements(By.CSS_SELECTOR, selector)
                 if containers:
                     self.progress_signal.emit(f"Found {len(containers)} review containers with selector: {selector}")
@@ -217,6 +393,7 @@ class ScraperThread(QThread):
                     'div[class*="description"], div[class*="content"]'
                 ]
                 
+                candidates = []
                 for selector in review_selectors:
                     elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
                     if elements:
@@ -224,9 +401,13 @@ class ScraperThread(QThread):
                         for element in elements:
                             text = element.text.strip()
                             if len(text) > 30:  # Only consider substantial text
-                                cleaned_text = ' '.join(text.split())
-                                if not is_non_review_content(cleaned_text):
-                                    reviews.add(cleaned_text)
+                                candidates.append(' '.join(text.split()))
+                # Filter all candidates in one vectorized pass
+                reviews.update(drop_non_reviews(candidates))
+            
+            # Fetch further pages concurrently when the "Next" link addresses pages by URL
+            if reviews and self.max_pages > 1:
+                reviews.update(self.crawl_paginated_pages(reviews))
             
             # Move this outside the if block so it always runs
             # Add this code to process the reviews after extraction
@@ -259,45 +440,64 @@ class ScraperThread(QThread):
                 self.driver.quit()
                 self.driver = None
         
-    def go_to_next_page(self):
-            """Try to navigate to the next page of reviews"""
-            try:
-                # Common patterns for next page buttons
-                next_page_selectors = [
-                    "//a[contains(text(), 'Next')]",
-                    "//button[contains(text(), 'Next')]",
-                    "//a[contains(@class, 'next')]",
-                    "//button[contains(@class, 'next')]",
-                    "//a[contains(@aria-label, 'Next')]",
-                    "//button[contains(@aria-label, 'Next')]",
-                    "//a[contains(@rel, 'next')]",
-                    "//li[contains(@class, 'next')]/a",
-                    "//div[contains(@class, 'pagination')]//a[contains(@class, 'next')]",
-                    "//div[contains(@class, 'pagination')]//button[contains(@class, 'next')]",
-                    "//a[.//i[contains(@class, 'arrow') or contains(@class, 'next')]]",
-                    "//button[.//i[contains(@class, 'arrow') or contains(@class, 'next')]]",
-                    "//a[contains(@class, 'pagination-next')]",
-                    "//button[contains(@class, 'pagination-next')]"
-                ]
-                
-                for selector in next_page_selectors:
-                    next_buttons = self.driver.find_elements(By.XPATH, selector)
-                    for button in next_buttons:
-                        if button.is_displayed() and button.is_enabled():
-                            try:
-                                # Scroll to the button first
-                                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-                                time.sleep(1)
-                                self.driver.execute_script("arguments[0].click();", button)
-                                time.sleep(3)  # Wait for the next page to load
-                                return True
-                            except:
-                                continue
-                
-                return False
-            except Exception as e:
-                self.progress_signal.emit(f"Error navigating to next page: {str(e)}")
-                return False
+    def prepare_page(self, consent=False, expand=False):
+        """Click consent and/or "Read More" controls in bulk and wait once for the DOM to settle.
+
+        Returns a (consent_clicked, expanded) tuple of click counts.
+        """
+        self.driver.set_script_timeout(self.settle_timeout_ms / 1000 + 5)
+        result = self.driver.execute_async_script(
+            PREPARE_PAGE_SCRIPT,
+            CONSENT_XPATHS if consent else [],
+            EXPAND_XPATHS if expand else [],
+            self.settle_quiet_ms,
+            self.settle_timeout_ms
+        ) or {}
+        return result.get("consent", 0), result.get("expanded", 0)
+        
+    def collect_api_reviews(self):
+        """Detect review JSON endpoints in the captured network traffic and page through them over HTTP"""
+        try:
+            endpoints = discover_review_endpoints(self.driver)
+        except Exception as e:
+            print(f"Network capture error: {e}")  # Log but continue with DOM extraction
+            return set()
+        if not endpoints:
+            return set()
+            
+        endpoint = endpoints[0]
+        self.progress_signal.emit(f"Found review API with {len(endpoint.texts)} reviews: {endpoint.url}")
+        session = session_from_driver(self.driver)
+        try:
+            texts = fetch_endpoint_pages(endpoint, session, max_pages=self.max_api_pages,
+                                         progress=self.progress_signal.emit)
+        finally:
+            session.close()
+        return set(drop_non_reviews(texts))
+        
+    def crawl_paginated_pages(self, seen_reviews):
+        """Detect the page-number URL pattern from the Next link and fetch further pages concurrently"""
+        try:
+            next_url = self.driver.execute_script(NEXT_PAGE_URL_SCRIPT, NEXT_PAGE_XPATHS)
+        except Exception as e:
+            print(f"Next page lookup error: {e}")  # Log but continue
+            return set()
+        pattern = detect_page_pattern(self.driver.current_url, next_url) if next_url else None
+        if pattern is None:
+            return set()
+            
+        self.progress_signal.emit(f"Detected paginated reviews, fetching up to {self.max_pages - 1} more pages...")
+        session = session_from_driver(self.driver, pool_size=self.page_workers)
+        try:
+            return fetch_pages_concurrently(
+                pattern, session, REVIEW_CONTAINER_SELECTORS,
+                max_pages=self.max_pages - 1,
+                max_workers=self.page_workers,
+                seen=seen_reviews,
+                progress=self.progress_signal.emit
+            )
+        finally:
+            session.close()
         
     def extract_reviews_alternative(self):
             """Alternative method to extract reviews when standard methods fail"""
@@ -305,53 +505,19 @@ class ScraperThread(QThread):
             reviews = set()
             
             try:
-                # Try more aggressive XPath queries
-                xpath_queries = [
-                    "//div[string-length() > 100]",
-                    "//p[string-length() > 80]",
-                    "//span[string-length() > 100]",
-                    "//article//p",
-                    "//section//p",
-                    "//main//p[string-length() > 50]",
-                    "//*[contains(@class, 'review') or contains(@class, 'comment') or contains(@class, 'feedback')]//p",
-                    "//*[contains(@class, 'review') or contains(@class, 'comment') or contains(@class, 'feedback')]//div[not(.//div)]",
-                    "//*[contains(@id, 'review') or contains(@id, 'comment') or contains(@id, 'feedback')]//p",
-                    "//div[contains(text(), '.') and string-length() > 100 and not(.//div)]"
-                ]
-                
-                for query in xpath_queries:
-                    elements = self.driver.find_elements(By.XPATH, query)
-                    self.progress_signal.emit(f"Found {len(elements)} potential review elements with query: {query}")
-                    
-                    for element in elements:
-                        text = element.text.strip()
-                        if len(text) > 50 and len(text) < 3000:  # Reasonable review length
-                            # Check if it looks like a review (contains periods, not just navigation text)
-                            if "." in text and len(text.split()) > 10:
-                                cleaned_text = ' '.join(text.split())
-                                if not is_non_review_content(cleaned_text):
-                                    reviews.add(cleaned_text)
+                # One linear pass over the DOM in the browser classifies text blocks by length,
+                # word count and link density, so no per-element .text round trips are needed
+                blocks = self.driver.execute_script(
+                    TEXT_DENSITY_SCRIPT,
+                    self.density_min_chars,
+                    self.density_max_chars,
+                    self.density_min_words,
+                    self.density_max_link_density,
+                    self.density_max_blocks
+                ) or []
+                self.progress_signal.emit(f"Text-density pass found {len(blocks)} candidate blocks")
                 
-                # If still no reviews, try to find any substantial text on the page
-                if len(reviews) < 5:
-                    self.progress_signal.emit("Still not enough reviews, trying to capture any substantial text...")
-                    
-                    # Get all text from the page body
-                    body_text = self.driver.find_element(By.TAG_NAME, "body").text
-                    
-                    # Split by common separators and look for review-like chunks
-                    potential_reviews = []
-                    for separator in ["\n\n", "\n", ". ", "! ", "? "]:
-                        chunks = body_text.split(separator)
-                        for chunk in chunks:
-                            if len(chunk) > 100 and len(chunk) < 2000:
-                                potential_reviews.append(chunk)
-                    
-                    # Process potential reviews
-                    for text in potential_reviews:
-                        cleaned_text = ' '.join(text.split())
-                        if len(cleaned_text) > 50 and "." in cleaned_text and not is_non_review_content(cleaned_text):
-                            reviews.add(cleaned_text)
+                reviews.update(drop_non_reviews(' '.join(text.split()) for text in blocks))
                             
                 self.progress_signal.emit(f"Found {len(reviews)} potential reviews from page text")
                 
@@ -392,6 +558,13 @@ class ScraperThread(QThread):
                     batch_results = future.result()
                     if batch_results:
                         data.extend(batch_results)
+                        self.batch_signal.emit(batch_results)
+                        if self.embeddings is not None:
+                            try:
+                                embed_missing(self.embeddings, [row[0] for row in batch_results])
+                            except Exception as e:
+                                print(f"Warning: Could not store review embeddings: {str(e)}")
+                                self.embeddings = None
                         self.progress_signal.emit(f"Processed batch {i+1}/{len(futures)} - Found {len(batch_results)} valid reviews")
                     else:
                         self.progress_signal.emit(f"Batch {i+1}/{len(futures)} contained no valid reviews")
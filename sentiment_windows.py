@@ -0,0 +1,82 @@
+import numpy as np
+
+# How the windows of one review are combined into its score
+WINDOW_RULES = {
+    "mean": "Average of the windows' label probabilities",
+    "weighted": "Average weighted by each window's confidence",
+    "max": "The most confident window decides",
+}
+
+def window_texts(texts, tokenizer, max_tokens, overlap=0.25, max_windows=8):
+    """
+    Split texts longer than max_tokens model tokens into overlapping windows.
+
+    All texts are tokenized in one batched call. Texts that fit are kept as they are. A long text
+    gets windows of max_tokens tokens that overlap by the given fraction; when more than
+    max_windows would be needed, max_windows windows are spread evenly from its start to its
+    end instead, so the cost per review stays bounded without ignoring the end of the review.
+
+    Returns:
+        tuple: (windows, owners) where owners[i] is the index of the text window i came from
+    """
+    token_ids = tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+    step = max(1, int(max_tokens * (1 - overlap)))
+    windows, owners = [], []
+    for position, (text, ids) in enumerate(zip(texts, token_ids)):
+        if len(ids) <= max_tokens:
+            windows.append(text)
+            owners.append(position)
+            continue
+        last = len(ids) - max_tokens
+        starts = list(range(0, last, step)) + [last]
+        if len(starts) > max_windows:
+            starts = np.linspace(0, last, max_windows).round().astype(int).tolist()
+        windows.extend(tokenizer.decode(ids[start:start + max_tokens]) for start in starts)
+        owners.extend([position] * len(starts))
+    return windows, np.asarray(owners, dtype=np.int64)
+
+def _probabilities(output):
+    # Label -> score, from either all label scores (top_k=None) or the top label only
+    if isinstance(output, dict):
+        return {output["label"]: float(output["score"])}
+    return {item["label"]: float(item["score"]) for item in output}
+
+def aggregate_windows(outputs, owners, count, rule="mean"):
+    """
+    One pipeline-style result ({"label", "score"}) per text from the outputs of its windows.
+
+    Args:
+        outputs (list): Pipeline output of every window, with all label scores or the top one
+        owners (ndarray): Index of the text each window came from
+        count (int): Number of texts
+        rule (str): One of WINDOW_RULES
+
+    Returns:
+        list: Result per text, None for texts without windows
+    """
+    if rule not in WINDOW_RULES:
+        raise ValueError(f"Unknown window rule: {rule}")
+    totals = [None] * count
+    weights = np.zeros(count)
+    for position, output in zip(owners, outputs):
+        probabilities = _probabilities(output)
+        confidence = max(probabilities.values())
+        if rule == "max":
+            if totals[position] is None or confidence > weights[position]:
+                totals[position], weights[position] = probabilities, confidence
+            continue
+        weight = confidence if rule == "weighted" else 1.0
+        if totals[position] is None:
+            totals[position] = {}
+        for label, score in probabilities.items():
+            totals[position][label] = totals[position].get(label, 0.0) + weight * score
+        weights[position] += weight
+    results = []
+    for by_label, weight in zip(totals, weights):
+        if by_label is None:
+            results.append(None)
+            continue
+        label = max(by_label, key=by_label.get)
+        score = by_label[label] if rule == "max" else by_label[label] / weight
+        results.append({"label": label, "score": float(score)})
+    return results
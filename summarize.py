@@ -0,0 +1,103 @@
+from summary_cache import chunk_key
+
+def chunk_token_limit(tokenizer, limit=1024, margin=16):
+    """Tokens per chunk: the model's input size (at most limit) minus room for special tokens"""
+    model_max = getattr(tokenizer, "model_max_length", limit) or limit
+    return min(model_max, limit) - margin
+
+def chunk_texts(texts, tokenizer, max_tokens):
+    """
+    Pack whole texts into chunks of at most max_tokens model tokens, in their original order.
+
+    All texts are tokenized in one batched call. A text longer than max_tokens is split into
+    windows of max_tokens tokens instead of being cut off.
+
+    Returns:
+        list: Chunk strings, each short enough to be summarized without truncation
+    """
+    texts = [text.strip() for text in texts if text and text.strip()]
+    if not texts:
+        return []
+    token_ids = tokenizer(texts, add_special_tokens=False)["input_ids"]
+
+    chunks = []
+    current, current_tokens = [], 0
+    for text, ids in zip(texts, token_ids):
+        if len(ids) > max_tokens:
+            pieces = [tokenizer.decode(ids[start:start + max_tokens]) for start in range(0, len(ids), max_tokens)]
+            lengths = [min(max_tokens, len(ids) - start) for start in range(0, len(ids), max_tokens)]
+        else:
+            pieces, lengths = [text], [len(ids)]
+        for piece, length in zip(pieces, lengths):
+            # +1 for the space joining texts within a chunk
+            if current and current_tokens + length + 1 > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += length + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def summarize_batch(summarizer, chunks, max_length, min_length, batch_size=8):
+    """Summarize chunks with batched generate calls, one summary per chunk"""
+    results = summarizer(chunks, max_length=max_length, min_length=min(min_length, max_length - 1),
+                         do_sample=False, truncation=True, batch_size=batch_size)
+    return [result["summary_text"].strip() for result in results]
+
+def map_reduce_summary(summarizer, texts, max_length=150, min_length=30, partial_length=80,
+                       batch_size=8, progress=None, cache=None, model=None):
+    """
+    Summarize any number of texts hierarchically.
+
+    Texts are packed into chunks that fit the model, every chunk is summarized, and the partial
+    summaries are packed and summarized again until a single chunk is left, which gets the final
+    summary. Each round shrinks the input roughly by chunk size / partial_length, so the number of
+    generate calls grows linearly with the total length of the texts.
+
+    Args:
+        summarizer: Hugging Face summarization pipeline
+        texts (list or dict): Texts to summarize, e.g. one review each, or group label -> texts;
+            groups are packed into chunks separately
+        max_length (int): Maximum tokens of the final summary
+        min_length (int): Minimum tokens of the final summary
+        partial_length (int): Maximum tokens of each intermediate summary
+        batch_size (int): Chunks per generate call
+        progress (callable): Called with (chunks done, chunks in this round, round number)
+        cache (SummaryCache): Reuse intermediate summaries of chunks that were summarized before;
+            only useful when texts keep their order between runs, such as reviews in load order
+        model (str): Summarizer model identity, part of the chunk cache keys
+
+    Returns:
+        str: The summary
+    """
+    tokenizer = summarizer.tokenizer
+    max_tokens = chunk_token_limit(tokenizer)
+    groups = texts.values() if isinstance(texts, dict) else [texts]
+    chunks = [chunk for group in groups for chunk in chunk_texts(group, tokenizer, max_tokens)]
+    level = 1
+    while len(chunks) > 1:
+        partial_min = min(min_length, partial_length // 2)
+        partials = [None] * len(chunks)
+        if cache is not None:
+            # Each group is packed in order, so reviews appended to a group only change its last chunk
+            keys = [chunk_key(chunk, model, partial_length, partial_min) for chunk in chunks]
+            cached = cache.get_many(keys)
+            partials = [cached.get(key) for key in keys]
+        missing = [i for i, partial in enumerate(partials) if partial is None]
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            summaries = summarize_batch(summarizer, [chunks[i] for i in batch], partial_length, partial_min, batch_size)
+            for i, summary in zip(batch, summaries):
+                partials[i] = summary
+            if cache is not None:
+                cache.put_many([(keys[i], summary) for i, summary in zip(batch, summaries)], kind="chunk")
+            if progress is not None:
+                progress(len(chunks) - len(missing) + start + len(batch), len(chunks), level)
+        chunks = chunk_texts(partials, tokenizer, max_tokens)
+        level += 1
+    if not chunks:
+        return ""
+    # A short final input gets a proportionally short summary
+    max_length = min(max_length, max(len(chunks[0].split()) // 2, min_length + 10))
+    return summarize_batch(summarizer, chunks, max_length, min_length, batch_size)[0]
@@ -0,0 +1,100 @@
+import os
+import time
+import sqlite3
+import hashlib
+import json
+
+from review_store import content_hash
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "summaries.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries (last_used);
+"""
+
+def _digest(parts):
+    return hashlib.sha1(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def summary_key(groups, model, **params):
+    """
+    Key of a full summary: the reviews it covers, the summarizer model, and the length parameters.
+
+    Reviews are identified by their content hash, the same id the review store uses, so reloading
+    the same data hits the cache; the order of reviews within a group doesn't matter.
+    """
+    review_ids = {str(label): sorted(content_hash(text) for text in texts if text) for label, texts in groups.items()}
+    return _digest(["summary", model, sorted(params.items()), sorted(review_ids.items())])
+
+def chunk_key(chunk, model, max_length, min_length):
+    """Key of an intermediate summary of one chunk of text"""
+    return _digest(["chunk", model, max_length, min_length, chunk])
+
+class SummaryCache:
+    """Persistent cache of generated summaries and chunk summaries, least recently used evicted first"""
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, max_bytes=50 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # Short-lived connections so the cache can be used from worker threads
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """Cached summaries for the keys that have one, marking them as recently used"""
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        with self._connect() as conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(conn.execute(f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})", chunk))
+            conn.executemany("UPDATE summaries SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+        return found
+
+    def put(self, key, summary, kind="summary"):
+        self.put_many([(key, summary)], kind)
+
+    def put_many(self, items, kind="summary"):
+        """Store (key, summary) pairs, then evict the least recently used entries over the size limit"""
+        now = time.time()
+        records = [(key, kind, summary, len(summary.encode("utf-8")), now) for key, summary in items]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, kind, summary, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                records
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        removed = []
+        for key, size in conn.execute("SELECT key, size FROM summaries ORDER BY last_used"):
+            removed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM summaries WHERE key = ?", removed)
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM summaries")
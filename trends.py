@@ -0,0 +1,139 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+TREND_COLUMNS = ["positive", "negative", "scored", "positive_ratio", "negative_ratio", "score"]
+
+def parse_dates(dates):
+    """
+    Parse review date strings into datetime64, parsing every distinct value only once.
+
+    Categorical date columns (see compact_reviews) only have their categories parsed.
+    Unparseable or missing dates become NaT.
+    """
+    if isinstance(dates.dtype, pd.CategoricalDtype):
+        categories = dates.cat.categories.astype(object)
+        parsed = pd.to_datetime(pd.Series(categories, dtype=object), errors="coerce", format="mixed").to_numpy()
+        codes = dates.cat.codes.to_numpy()
+        values = np.where(codes >= 0, parsed[codes], np.datetime64("NaT"))
+        return pd.Series(values, index=dates.index, dtype="datetime64[ns]")
+    values = dates.astype(object)
+    uniques = pd.unique(values.dropna())
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors="coerce", format="mixed")
+    return values.map(dict(zip(uniques, parsed))).astype("datetime64[ns]")
+
+def _codes(values):
+    """Integer codes and labels of a column, reusing the codes of categorical columns"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values.astype(object))
+
+def _label_code(labels, label):
+    return labels.get_loc(label) if label in labels else -2
+
+def sentiment_trends(df, dates=None, freq="D", window=7, by_source=False):
+    """
+    Rolling sentiment ratios and confidence-weighted scores over time.
+
+    Reviews are binned by calendar day with integer arithmetic, so the cost over the rows is a few
+    NumPy passes; resampling and rolling then only touch one row per day.
+
+    Args:
+        df (DataFrame): Review dataset laid out like REVIEW_COLUMNS
+        dates (Series): Parsed dates for df's rows, parsed here when not given
+        freq (str): Pandas resampling frequency of a day or longer, e.g. "D", "W" or "MS"
+        window (int): Number of periods in the rolling window
+        by_source (bool): Compute one trend per source instead of one overall
+
+    Returns:
+        DataFrame: One row per period with TREND_COLUMNS; with by_source the columns are
+        (metric, source) pairs. Ratios are shares of the scored reviews in the window, and the
+        score is the confidence-weighted mean of +1 (positive), -1 (negative) and 0 (neutral).
+    """
+    if dates is None:
+        dates = parse_dates(df["date"])
+    sentiment_codes, labels = _codes(df["sentiment"])
+    positive = sentiment_codes == _label_code(labels, "POSITIVE")
+    negative = sentiment_codes == _label_code(labels, "NEGATIVE")
+    days = dates.to_numpy().astype("datetime64[D]")
+    keep = (sentiment_codes >= 0) & ~np.isnat(days)
+    if not keep.any():
+        return pd.DataFrame(columns=TREND_COLUMNS)
+
+    day_numbers = days[keep].astype("int64")
+    first = day_numbers.min()
+    span = int(day_numbers.max() - first) + 1
+    keys = day_numbers - first
+    sources = pd.Index([None])
+    if by_source:
+        source_codes, sources = _codes(df["source"])
+        if (source_codes[keep] < 0).any():
+            # Rows without a source go in an extra "Unknown" column
+            sources = pd.Index(list(sources) + ["Unknown"]).drop_duplicates(keep="first")
+            source_codes = np.where(source_codes >= 0, source_codes, sources.get_loc("Unknown"))
+        keys = keys * len(sources) + source_codes[keep]
+
+    # One bincount per metric over (day, source) keys replaces grouping the rows
+    confidence = np.nan_to_num(pd.to_numeric(df["confidence"], errors="coerce").to_numpy(dtype="float64"))[keep]
+    positive, negative = positive[keep], negative[keep]
+    size = span * len(sources)
+    metrics = {
+        "positive": np.bincount(keys, weights=positive, minlength=size),
+        "negative": np.bincount(keys, weights=negative, minlength=size),
+        "scored": np.bincount(keys, minlength=size).astype("float64"),
+        "weight": np.bincount(keys, weights=confidence, minlength=size),
+        "signed": np.bincount(keys, weights=confidence * (positive.astype("int8") - negative.astype("int8")),
+                              minlength=size),
+    }
+    index = pd.date_range(pd.Timestamp(np.datetime64(int(first), "D")), periods=span, freq="D")
+    totals = pd.concat({
+        name: pd.DataFrame(values.reshape(span, len(sources)), index=index, columns=sources)
+        for name, values in metrics.items()
+    }, axis=1)
+    if freq != "D":
+        totals = totals.resample(freq).sum()
+    rolling = totals.rolling(window, min_periods=1).sum()
+
+    scored_totals = rolling["scored"].where(rolling["scored"] > 0)
+    weights = rolling["weight"].where(rolling["weight"] > 0)
+    parts = {
+        "positive": totals["positive"].astype("int64"),
+        "negative": totals["negative"].astype("int64"),
+        "scored": totals["scored"].astype("int64"),
+        "positive_ratio": rolling["positive"] / scored_totals,
+        "negative_ratio": rolling["negative"] / scored_totals,
+        "score": rolling["signed"] / weights,
+    }
+    result = pd.concat(parts, axis=1)
+    if not by_source:
+        result.columns = result.columns.droplevel(1)
+    return result
+
+class TrendCache:
+    """Parsed dates of the current dataset, and trend tables keyed by dataset version and parameters"""
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.dates = None
+        self._entries = OrderedDict()
+
+    def reset(self):
+        """Forget everything, e.g. when a different dataset is loaded"""
+        self.dates = None
+        self._entries.clear()
+
+    def trends(self, df, version, freq="D", window=7, by_source=False):
+        key = (version, freq, window, by_source)
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+            return result
+
+        # Re-scoring changes sentiments but never dates, so dates are parsed once per dataset
+        if self.dates is None or len(self.dates) != len(df):
+            self.dates = parse_dates(df["date"])
+        result = sentiment_trends(df, self.dates, freq, window, by_source)
+        self._entries[key] = result
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
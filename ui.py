@@ -1,7 +1,7 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud, STOPWORDS
 import textwrap
+import copy
+from collections import Counter
 import os
 import sys
 import webbrowser
@@ -15,21 +15,42 @@ from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QRect, QThread, pyqtSignal
 from PyQt5.QtGui import QFont, QPixmap, QPalette, QColor, QIcon, QPainter, QBrush, QDesktopServices
 from PyQt5.QtCore import QUrl
-from models import SummarizerThread
+from models import SummarizerThread, CorpusQAThread, EmbeddingSearchThread
 from scraper import ScraperThread
 from utils import clean_csv_data
+from dataset_io import (write_reviews, with_selected_extension, compact_reviews, REVIEW_COLUMNS,
+                        FILE_DIALOG_FILTER, EXPORT_DIALOG_FILTER)
+from review_store import ReviewStore, unique_reviews
+from summary_cache import SummaryCache
+from embeddings import EmbeddingStore
+from loader import DatasetLoaderThread
+from rescore import RescoreThread, RESCORE_MODES, apply_scores
+from aggregates import ReviewAggregates, UNSCORED
+from dashboard_export import export_dashboard_data
+from word_index import WordFrequencyIndex
+from live_chart import LiveSentimentChart
+from trends import TrendCache
+from charts import (ChartCache, ChartRenderThread, render_sentiment_chart, render_wordcloud,
+                    render_trend_chart, CHART_DPI)
 
 class DeploymentStatusThread(QThread):
     """Thread to check deployment status"""
     status_updated = pyqtSignal(dict)
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, deploy_id=None):
+    def __init__(self, deploy_id=None, df=None, aggregates=None):
         super().__init__()
         self.deploy_id = deploy_id
+        self.df = df
+        self.aggregates = aggregates
         
     def run(self):
         try:
+            # Write the summary and paged review shards the dashboard fetches
+            if self.df is not None:
+                summary = export_dashboard_data(self.df, aggregates=self.aggregates)
+                print(f"Exported {summary['total']} reviews for the dashboard")
+            
             # This would normally call the deployment status API
             # For now, we'll simulate the response
             status = {
@@ -344,15 +365,38 @@ class SentimentAnalysisApp(QMainWindow):
             }
         """)
         
-        # Initialize data storage
-        self.data = []
+        # Initialize data storage (the DataFrame is the only in-memory copy of the reviews)
         self.df = None
         self.scraper_thread = None
         self.summarizer_thread = None
+        self.qa_thread = None
+        self.loader_thread = None
+        self.rescore_thread = None
         self.deployment_thread = None
         self.progress_dialog = None
         self.stats_cards = []
         
+        # Every scrape and file load is kept in the local review store
+        self.review_store = ReviewStore()
+        # Generated summaries are kept across sessions and reused for unchanged selections
+        self.summary_cache = SummaryCache()
+        # Review vectors for similarity search and themes, encoded once per review
+        self.embedding_store = EmbeddingStore()
+        self.embedding_thread = None
+        self.current_import_id = None
+        # Running counts for the stats cards and charts, updated as rows change
+        self.aggregates = ReviewAggregates()
+        # Token frequencies per sentiment and source for the word cloud
+        self.word_index = WordFrequencyIndex()
+        
+        # Rendered charts are reused until the dataset changes
+        self.dataset_version = 0
+        self.chart_cache = ChartCache()
+        self.trend_cache = TrendCache()
+        # Search index for questions about the current reviews, built on the first question
+        self.qa_index = None
+        self.chart_threads = set()
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -440,7 +484,7 @@ class SentimentAnalysisApp(QMainWindow):
         
         self.load_button = ModernButton("📁 Load CSV")
         self.load_button.clicked.connect(self.load_csv)
-        self.load_button.setToolTip("Load previously saved review data from CSV file")
+        self.load_button.setToolTip("Load previously saved review data from a CSV, Parquet or Feather file")
         
         button_layout.addWidget(self.scrape_button)
         button_layout.addWidget(self.load_button)
@@ -494,15 +538,40 @@ class SentimentAnalysisApp(QMainWindow):
         self.wordcloud_button.setEnabled(False)
         self.wordcloud_button.setToolTip("Create visual word cloud from review text")
         
+        self.trends_button = ModernButton("📈 Sentiment Trends")
+        self.trends_button.clicked.connect(self.show_sentiment_trends)
+        self.trends_button.setEnabled(False)
+        self.trends_button.setToolTip("Chart rolling sentiment ratios and scores over the review dates")
+        
         self.summarize_button = ModernButton("📝 Summarize Reviews")
         self.summarize_button.clicked.connect(self.summarize_reviews)
         self.summarize_button.setEnabled(False)
         self.summarize_button.setToolTip("Generate AI-powered summary of reviews")
         
+        self.ask_button = ModernButton("❓ Ask the Reviews")
+        self.ask_button.clicked.connect(self.ask_question)
+        self.ask_button.setEnabled(False)
+        self.ask_button.setToolTip("Ask a question and get answers found in the reviews")
+        
+        self.similar_button = ModernButton("🔎 Find Similar Reviews")
+        self.similar_button.clicked.connect(self.find_similar_reviews)
+        self.similar_button.setEnabled(False)
+        self.similar_button.setToolTip("Find reviews that say something similar to a text you enter")
+        
+        self.themes_button = ModernButton("🧩 Review Themes")
+        self.themes_button.clicked.connect(self.show_review_themes)
+        self.themes_button.setEnabled(False)
+        self.themes_button.setToolTip("Group reviews into themes by meaning")
+        
         self.export_button = ModernButton("💾 Export Results")
         self.export_button.clicked.connect(self.export_results)
         self.export_button.setEnabled(False)
-        self.export_button.setToolTip("Save analysis results to CSV file")
+        self.export_button.setToolTip("Save analysis results to a CSV, Parquet or Feather file")
+        
+        self.rescore_button = ModernButton("🔁 Score Reviews")
+        self.rescore_button.clicked.connect(self.rescore_reviews)
+        self.rescore_button.setEnabled(False)
+        self.rescore_button.setToolTip("Run the current sentiment model over unscored, outdated or all reviews")
         
         # Add deployment button
         self.deploy_button = ModernButton("🚀 Deploy to Web")
@@ -512,8 +581,13 @@ class SentimentAnalysisApp(QMainWindow):
         
         tools_layout.addWidget(self.sentiment_button)
         tools_layout.addWidget(self.wordcloud_button)
+        tools_layout.addWidget(self.trends_button)
         tools_layout.addWidget(self.summarize_button)
+        tools_layout.addWidget(self.ask_button)
+        tools_layout.addWidget(self.similar_button)
+        tools_layout.addWidget(self.themes_button)
         tools_layout.addWidget(self.export_button)
+        tools_layout.addWidget(self.rescore_button)
         tools_layout.addWidget(self.deploy_button)
         
         # Add all groups to left layout
@@ -543,6 +617,14 @@ class SentimentAnalysisApp(QMainWindow):
         
         stats_layout.addWidget(self.stats_container)
         
+        # Live chart, updated as scored batches arrive
+        chart_group = QGroupBox("📊 Live Sentiment")
+        chart_layout = QVBoxLayout(chart_group)
+        
+        self.live_chart = LiveSentimentChart(chart_group)
+        self.live_chart.setMinimumHeight(220)
+        chart_layout.addWidget(self.live_chart)
+        
         # Progress section
         progress_group = QGroupBox("⏳ Processing Status")
         progress_layout = QVBoxLayout(progress_group)
@@ -588,6 +670,7 @@ class SentimentAnalysisApp(QMainWindow):
         
         # Add all groups to right layout
         right_layout.addWidget(stats_group)
+        right_layout.addWidget(chart_group)
         right_layout.addWidget(progress_group)
         right_layout.addWidget(preview_group)
         right_layout.addStretch()
@@ -636,19 +719,48 @@ class SentimentAnalysisApp(QMainWindow):
         
         self.stats_layout.addStretch()
         
-    def update_preview(self, data_sample):
-        if not data_sample:
+    def update_preview(self, df):
+        if df is None or len(df) == 0:
             self.preview_text.clear()
             return
             
         preview_text = "Sample Reviews:\n" + "="*50 + "\n\n"
-        for i, review in enumerate(data_sample[:3]):  # Show first 3 reviews
+        # Only the first rows are read, so previews stay cheap on large datasets
+        for i, (text, sentiment) in enumerate(df[["text", "sentiment"]].head(3).itertuples(index=False)):
             preview_text += f"Review {i+1}:\n"
-            preview_text += f"Sentiment: {review[1]}\n"
-            preview_text += f"Text: {review[0][:100]}...\n\n"
+            preview_text += f"Sentiment: {sentiment}\n"
+            preview_text += f"Text: {str(text)[:100]}...\n\n"
             
         self.preview_text.setPlainText(preview_text)
 
+    def store_dataset(self, kind, origin):
+        """Insert the current DataFrame into the review store as a new import"""
+        try:
+            self.current_import_id = self.review_store.start_import(kind, origin)
+            self.review_store.insert_frame(self.current_import_id, self.df)
+        except Exception as e:
+            print(f"Warning: Could not save reviews to the store: {str(e)}")
+            self.current_import_id = None
+            
+    def sentiment_counts(self):
+        """Reviews per sentiment for the current dataset, read from the running aggregates"""
+        return self.aggregates.sentiment_counts()
+        
+    def dataset_texts(self, sentiment=None):
+        """Review texts of the current dataset, optionally for one sentiment"""
+        if self.current_import_id is not None:
+            return self.review_store.texts(self.current_import_id, sentiment)
+        if sentiment is None:
+            return self.df["text"].tolist()
+        return self.df.loc[self.df["sentiment"] == sentiment, "text"].tolist()
+
+    def review_groups(self, sentiment=None):
+        """Review texts of the current dataset per sentiment label, or for one sentiment"""
+        if sentiment is not None:
+            return {sentiment: self.dataset_texts(sentiment)}
+        labels = self.df["sentiment"].astype(object).fillna(UNSCORED)
+        return {label: texts.tolist() for label, texts in self.df["text"].astype(object).groupby(labels, sort=False)}
+
     def deploy_to_web(self):
         """Deploy the analysis results to a web dashboard"""
         if self.df is None or len(self.df) == 0:
@@ -664,7 +776,8 @@ class SentimentAnalysisApp(QMainWindow):
         self.deploy_button.setEnabled(False)
         
         # Create deployment status thread
-        self.deployment_thread = DeploymentStatusThread()
+        # Snapshots, so scoring can keep updating the live dataset while the export runs
+        self.deployment_thread = DeploymentStatusThread(df=self.df.copy(), aggregates=copy.deepcopy(self.aggregates))
         self.deployment_thread.status_updated.connect(self.handle_deployment_status)
         self.deployment_thread.error_occurred.connect(self.handle_deployment_error)
         
@@ -740,18 +853,26 @@ class SentimentAnalysisApp(QMainWindow):
         # Disable buttons
         self.scrape_button.setEnabled(False)
         self.load_button.setEnabled(False)
+        # Scoring writes into self.df, which the scraped dataset replaces
+        self.rescore_button.setEnabled(False)
         
         # Create and configure the scraper thread
-        self.scraper_thread = ScraperThread(url)
+        self.scraper_thread = ScraperThread(url, embeddings=self.embedding_store)
         
         # Connect signals properly
         self.scraper_thread.progress_signal.connect(self.update_progress)
         self.scraper_thread.finished_signal.connect(self.process_scraped_data)
+        self.scraper_thread.batch_signal.connect(self.handle_scraped_batch)
         self.scraper_thread.error_signal.connect(self.handle_scraper_error)
         
         # Start the scraper thread
+        self.live_chart.reset()
         self.scraper_thread.start()
         
+    def handle_scraped_batch(self, rows):
+        # Only the label column is counted here; the full dataset is built once scraping finishes
+        self.live_chart.add_counts(Counter(row[1] for row in rows if row[1] is not None))
+        
     def update_progress(self, message):
         self.status_label.setText(f"🔄 {message}")
         
@@ -764,10 +885,10 @@ class SentimentAnalysisApp(QMainWindow):
             self.progress_bar.setVisible(False)
             self.scrape_button.setEnabled(True)
             self.load_button.setEnabled(True)
+            self.rescore_button.setEnabled(self.df is not None)
     
     def process_scraped_data(self, data):
-        self.data = data
-        self.df = pd.DataFrame(data, columns=["text", "sentiment", "source", "date", "user_id", "location", "confidence"])
+        self.df = pd.DataFrame(data, columns=REVIEW_COLUMNS)
         
         # Update progress
         self.status_label.setText("🧹 Cleaning scraped data...")
@@ -775,26 +896,39 @@ class SentimentAnalysisApp(QMainWindow):
         # Automatically clean the data to remove non-review content
         cleaned_df, removed_count = clean_csv_data(self.df)
         
-        # Update the dataframe and data with cleaned content
-        self.df = cleaned_df
-        self.data = self.df.values.tolist()
+        # Keep the cleaned reviews with categorical labels and float32 confidence, one row per
+        # distinct text as in the review store
+        self.df = compact_reviews(unique_reviews(cleaned_df).reset_index(drop=True))
+        self.aggregates = ReviewAggregates.from_frame(self.df)
+        self.word_index = WordFrequencyIndex.from_frame(self.df)
+        self.trend_cache.reset()
+        self.qa_index = None
+        self.dataset_version += 1
+        self.store_dataset("scrape", self.scraper_thread.url if self.scraper_thread else None)
         
         # Re-enable buttons
         self.scrape_button.setEnabled(True)
         self.load_button.setEnabled(True)
         self.sentiment_button.setEnabled(True)
         self.wordcloud_button.setEnabled(True)
+        self.trends_button.setEnabled(True)
         self.summarize_button.setEnabled(True)
+        self.ask_button.setEnabled(True)
+        self.similar_button.setEnabled(True)
+        self.themes_button.setEnabled(True)
         self.export_button.setEnabled(True)
+        self.rescore_button.setEnabled(True)
         self.deploy_button.setEnabled(True)  # Enable deploy button
         
         # Update statistics
-        review_count = len(self.df)
-        positive_count = len(self.df[self.df["sentiment"] == "POSITIVE"])
-        negative_count = len(self.df[self.df["sentiment"] == "NEGATIVE"])
+        counts = self.sentiment_counts()
+        review_count = self.aggregates.total
+        positive_count = int(counts.get("POSITIVE", 0))
+        negative_count = int(counts.get("NEGATIVE", 0))
         
         self.update_stats_display(review_count, positive_count, negative_count)
-        self.update_preview(self.data)
+        self.update_preview(self.df)
+        self.live_chart.reset(counts)
         
         # Hide progress bar and update status
         self.progress_bar.setVisible(False)
@@ -811,6 +945,7 @@ class SentimentAnalysisApp(QMainWindow):
     def handle_scraper_error(self, error_message):
         self.scrape_button.setEnabled(True)
         self.load_button.setEnabled(True)
+        self.rescore_button.setEnabled(self.df is not None)
         self.progress_bar.setVisible(False)
         self.status_label.setText("❌ Scraping failed")
         
@@ -825,73 +960,192 @@ class SentimentAnalysisApp(QMainWindow):
     def load_csv(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, 
-            "Open CSV File", 
+            "Open Review Data", 
             "", 
-            "CSV Files (*.csv);;All Files (*)"
+            FILE_DIALOG_FILTER
         )
         if not file_path:
             return
             
-        try:
-            self.status_label.setText("📁 Loading CSV file...")
-            self.progress_bar.setVisible(True)
-            self.progress_bar.setRange(0, 0)
-            
-            self.df = pd.read_csv(file_path)
-            required_columns = ["text", "sentiment"]
-            
-            # Check if required columns exist
-            if not all(col in self.df.columns for col in required_columns):
-                self.progress_bar.setVisible(False)
-                QMessageBox.warning(self, "Format Error", 
-                                   "CSV file must contain 'text' and 'sentiment' columns\n\n"
-                                   "Expected format:\n"
-                                   "text,sentiment\n"
-                                   "\"Great product!\",POSITIVE\n"
-                                   "\"Not satisfied\",NEGATIVE")
-                return
-                
-            # Add missing columns if needed
-            if "source" not in self.df.columns:
-                self.df["source"] = "CSV Import"
-            if "date" not in self.df.columns:
-                self.df["date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            if "user_id" not in self.df.columns:
-                self.df["user_id"] = "Unknown"
-            if "location" not in self.df.columns:
-                self.df["location"] = "Unknown"
-            if "confidence" not in self.df.columns:
-                self.df["confidence"] = 0.5
-                
-            # Convert DataFrame back to list for consistency
-            self.data = self.df.values.tolist()
-            
-            # Enable analysis buttons
-            self.sentiment_button.setEnabled(True)
-            self.wordcloud_button.setEnabled(True)
-            self.summarize_button.setEnabled(True)
-            self.export_button.setEnabled(True)
-            self.deploy_button.setEnabled(True)  # Enable deploy button
-            
-            # Update statistics
-            review_count = len(self.df)
-            positive_count = len(self.df[self.df["sentiment"] == "POSITIVE"])
-            negative_count = len(self.df[self.df["sentiment"] == "NEGATIVE"])
-            
-            self.update_stats_display(review_count, positive_count, negative_count)
-            self.update_preview(self.data)
+        self.status_label.setText("📁 Loading review data...")
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.load_button.setEnabled(False)
+        self.scrape_button.setEnabled(False)
+        self.rescore_button.setEnabled(False)
+        
+        # Read the file in chunks on a worker thread so the window stays responsive
+        self.loader_thread = DatasetLoaderThread(file_path, store=self.review_store)
+        self.loader_thread.progress_signal.connect(self.update_load_progress)
+        self.loader_thread.finished_signal.connect(self.handle_loaded_data)
+        self.loader_thread.error_signal.connect(self.handle_load_error)
+        self.loader_thread.cancelled_signal.connect(self.handle_load_cancelled)
+        
+        self.progress_dialog = QProgressDialog("Loading review data...", "Cancel", 0, 100, self)
+        self.progress_dialog.setWindowTitle("Loading")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(500)
+        self.progress_dialog.canceled.connect(self.loader_thread.cancel)
+        
+        self.loader_thread.start()
+        
+    def update_load_progress(self, percent, message):
+        self.progress_bar.setValue(percent)
+        self.status_label.setText(f"📁 {message}")
+        if self.progress_dialog is not None:
+            self.progress_dialog.setValue(percent)
+            self.progress_dialog.setLabelText(message)
             
-            # Hide progress and update status
-            self.progress_bar.setVisible(False)
-            self.status_label.setText(f"✅ CSV loaded: {review_count} reviews ({positive_count} positive, {negative_count} negative)")
+    def close_load_progress(self):
+        self.progress_bar.setVisible(False)
+        self.load_button.setEnabled(True)
+        self.scrape_button.setEnabled(True)
+        self.rescore_button.setEnabled(self.df is not None)
+        if self.progress_dialog is not None:
+            self.progress_dialog.canceled.disconnect()
+            self.progress_dialog.close()
+            self.progress_dialog = None
             
-            QMessageBox.information(self, "CSV Loaded", 
-                                   f"Successfully loaded {review_count} reviews from CSV file!")
+    def handle_loaded_data(self, df, import_id, aggregates, word_index):
+        self.close_load_progress()
+        self.df = df
+        self.current_import_id = import_id
+        self.aggregates = aggregates
+        self.word_index = word_index
+        self.trend_cache.reset()
+        self.qa_index = None
+        self.dataset_version += 1
+        
+        # Enable analysis buttons
+        self.sentiment_button.setEnabled(True)
+        self.wordcloud_button.setEnabled(True)
+        self.trends_button.setEnabled(True)
+        self.summarize_button.setEnabled(True)
+        self.ask_button.setEnabled(True)
+        self.similar_button.setEnabled(True)
+        self.themes_button.setEnabled(True)
+        self.export_button.setEnabled(True)
+        self.rescore_button.setEnabled(True)
+        self.deploy_button.setEnabled(True)  # Enable deploy button
+        
+        # Update statistics
+        counts = self.sentiment_counts()
+        review_count = self.aggregates.total
+        positive_count = int(counts.get("POSITIVE", 0))
+        negative_count = int(counts.get("NEGATIVE", 0))
+        
+        self.update_stats_display(review_count, positive_count, negative_count)
+        self.update_preview(self.df)
+        self.live_chart.reset(counts)
+        
+        self.status_label.setText(f"✅ Data loaded: {review_count} reviews ({positive_count} positive, {negative_count} negative)")
+        
+        unscored = self.aggregates.unscored
+        if unscored:
+            reply = QMessageBox.question(self, "Data Loaded",
+                                         f"Successfully loaded {review_count} reviews!\n\n"
+                                         f"{unscored} reviews have no sentiment yet. Score them now?",
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply == QMessageBox.Yes:
+                self.start_rescore("missing")
+            return
+        
+        QMessageBox.information(self, "Data Loaded", 
+                               f"Successfully loaded {review_count} reviews!")
+        
+    def rescore_reviews(self):
+        if self.df is None or len(self.df) == 0:
+            QMessageBox.warning(self, "No Data", "No data available to score")
+            return
             
-        except Exception as e:
-            self.progress_bar.setVisible(False)
-            self.status_label.setText("❌ Failed to load CSV")
-            QMessageBox.critical(self, "Error", f"Failed to load CSV file:\n\n{str(e)}")
+        labels = list(RESCORE_MODES.values())
+        choice, ok = QInputDialog.getItem(self, "Score Reviews", "Which reviews should be scored?", labels, 0, False)
+        if not ok:
+            return
+        self.start_rescore(list(RESCORE_MODES.keys())[labels.index(choice)])
+        
+    def start_rescore(self, mode):
+        if self.rescore_thread is not None and self.rescore_thread.isRunning():
+            return
+        self.status_label.setText("🔁 Scoring reviews...")
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.rescore_button.setEnabled(False)
+        self.load_button.setEnabled(False)
+        self.scrape_button.setEnabled(False)
+        # The worker encodes reviews into the embedding store, which searches read from
+        self.similar_button.setEnabled(False)
+        self.themes_button.setEnabled(False)
+        
+        # Scores are applied batch by batch as the worker emits them
+        self.rescore_thread = RescoreThread(self.df, mode, store=self.review_store, import_id=self.current_import_id,
+                                            embeddings=self.embedding_store)
+        self.rescore_thread.progress_signal.connect(self.update_load_progress)
+        # Scores are row labels of this dataset; results arriving after it was replaced are dropped
+        self.rescore_thread.batch_signal.connect(
+            lambda index, sentiments, confidences, model_version, aspects, df=self.df:
+            self.handle_score_batch(index, sentiments, confidences, model_version, aspects, df))
+        self.rescore_thread.finished_signal.connect(
+            lambda scored_count, df=self.df: self.handle_rescore_finished(scored_count, df))
+        self.rescore_thread.error_signal.connect(self.handle_rescore_error)
+        self.rescore_thread.cancelled_signal.connect(self.handle_rescore_cancelled)
+        
+        self.progress_dialog = QProgressDialog("Scoring reviews...", "Cancel", 0, 100, self)
+        self.progress_dialog.setWindowTitle("Scoring")
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(500)
+        self.progress_dialog.canceled.connect(self.rescore_thread.cancel)
+        
+        self.rescore_thread.start()
+        
+    def handle_score_batch(self, index, sentiments, confidences, model_version, aspects, df):
+        if df is not self.df:
+            return
+        # Swap the rows' old scores for the new ones in the running aggregates
+        self.aggregates.remove_frame(self.df.loc[index])
+        self.word_index.remove_frame(self.df.loc[index])
+        apply_scores(self.df, index, sentiments, confidences, model_version, aspects)
+        self.aggregates.add_frame(self.df.loc[index])
+        self.word_index.add_frame(self.df.loc[index])
+        self.dataset_version += 1
+        counts = self.sentiment_counts()
+        self.update_stats_display(self.aggregates.total, int(counts.get("POSITIVE", 0)), int(counts.get("NEGATIVE", 0)))
+        self.live_chart.set_counts(counts)
+        
+    def close_rescore_progress(self):
+        self.close_load_progress()
+        self.rescore_button.setEnabled(True)
+        self.similar_button.setEnabled(True)
+        self.themes_button.setEnabled(True)
+        self.update_preview(self.df)
+        
+    def handle_rescore_finished(self, scored_count, df):
+        self.close_rescore_progress()
+        if df is not self.df:
+            self.status_label.setText("Scoring finished for a dataset that has since been replaced")
+            return
+        self.status_label.setText(f"✅ Scored {scored_count} reviews")
+        QMessageBox.information(self, "Scoring Complete", f"Scored {scored_count} reviews with the current model.")
+        
+    def handle_rescore_error(self, error_message):
+        self.close_rescore_progress()
+        self.status_label.setText("❌ Scoring failed")
+        QMessageBox.critical(self, "Error", error_message)
+        
+    def handle_rescore_cancelled(self):
+        self.close_rescore_progress()
+        self.status_label.setText("❌ Scoring canceled (reviews scored so far were kept)")
+        
+    def handle_load_error(self, error_message):
+        self.close_load_progress()
+        self.status_label.setText("❌ Failed to load data")
+        QMessageBox.critical(self, "Error", error_message)
+        
+    def handle_load_cancelled(self):
+        self.close_load_progress()
+        self.status_label.setText("❌ Loading canceled")
             
     def show_sentiment_analysis(self):
         if self.df is None or len(self.df) == 0:
@@ -901,66 +1155,111 @@ class SentimentAnalysisApp(QMainWindow):
         self.status_label.setText("📊 Generating sentiment analysis chart...")
         
         # Count sentiments
-        sentiment_counts = self.df["sentiment"].value_counts()
+        sentiment_counts = self.sentiment_counts()
+        total_count = int(sentiment_counts.sum())
+        mean_confidence = self.aggregates.mean_confidence()
+        aspects = self.aggregates.aspect_breakdown()
+        aspect_lines = [
+            f"• {aspect.capitalize()}: " + ", ".join(f"{count} {label.lower()}" for label, count in row.items() if count)
+            for aspect, row in aspects.iterrows()
+        ]
         
-        # Create figure with better styling
-        plt.style.use('seaborn-v0_8')
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        # Bar chart
-        colors = ['#4CAF50' if x == 'POSITIVE' else '#F44336' if x == 'NEGATIVE' else '#FF9800' 
-                 for x in sentiment_counts.index]
-        bars = ax1.bar(sentiment_counts.index, sentiment_counts.values, color=colors, alpha=0.8)
-        
-        # Add count labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                    f'{int(height)}', ha='center', va='bottom', fontweight='bold')
-        
-        ax1.set_title("Sentiment Distribution", fontsize=14, fontweight='bold')
-        ax1.set_xlabel("Sentiment", fontweight='bold')
-        ax1.set_ylabel("Count", fontweight='bold')
-        ax1.grid(True, alpha=0.3)
-        
-        # Pie chart
-        ax2.pie(sentiment_counts.values, labels=sentiment_counts.index, colors=colors,
-                autopct='%1.1f%%', startangle=90, textprops={'fontweight': 'bold'})
-        ax2.set_title("Sentiment Percentage", fontsize=14, fontweight='bold')
-        
-        plt.tight_layout()
-        
-        # Save and show the figure
         filename = "sentiment_analysis.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        self.status_label.setText("✅ Sentiment analysis complete")
-        
-        QMessageBox.information(self, "Analysis Complete", 
-                               f"Sentiment analysis chart has been saved as '{filename}'\n\n"
-                               f"Summary:\n"
-                               f"• Total reviews: {len(self.df)}\n" +
-                               "\n".join([f"• {sentiment}: {count} ({count/len(self.df)*100:.1f}%)" 
-                                        for sentiment, count in sentiment_counts.items()]))
+        message = (f"Sentiment analysis chart has been saved as '{filename}'\n\n"
+                   f"Summary:\n"
+                   f"• Total reviews: {total_count}\n" +
+                   "\n".join([f"• {sentiment}: {count} ({count/total_count*100:.1f}%)" 
+                              for sentiment, count in sentiment_counts.items()]) +
+                   (f"\n• Mean confidence: {mean_confidence:.2f}" if mean_confidence is not None else "") +
+                   ("\n\nAspect mentions:\n" + "\n".join(aspect_lines) if aspect_lines else ""))
+        
+        key = ("sentiment", self.dataset_version, CHART_DPI)
+        self.render_chart(key, filename, "Analysis Complete", message, "✅ Sentiment analysis complete",
+                          render_sentiment_chart, sentiment_counts, dpi=CHART_DPI)
+        
+    def show_sentiment_trends(self):
+        if self.df is None or len(self.df) == 0:
+            QMessageBox.warning(self, "No Data", "No data available for analysis")
+            return
+            
+        # Trends are cached per dataset version, so repeated requests don't rescan the reviews
+        trends = self.trend_cache.trends(self.df, self.dataset_version, freq="D", window=7)
+        if trends.empty:
+            QMessageBox.warning(self, "No Data", "No scored reviews with a valid date found")
+            return
+            
+        self.status_label.setText("📈 Generating sentiment trend chart...")
+        latest = trends.iloc[-1]
+        
+        # With several sources, the busiest ones (from the running per-source counts) get their own score
+        source_lines = []
+        source_totals = self.aggregates.source_breakdown().sum(axis=1).sort_values(ascending=False)
+        if len(source_totals) > 1:
+            scores = self.trend_cache.trends(self.df, self.dataset_version, freq="D", window=7, by_source=True)["score"]
+            for source, total in source_totals.head(5).items():
+                score = scores[source].dropna() if source in scores.columns else scores.iloc[:0, 0]
+                source_lines.append(f"• {source}: {total} reviews, weighted score "
+                                    f"{f'{score.iloc[-1]:.2f}' if len(score) else 'n/a'}")
+        filename = "sentiment_trends.png"
+        message = (f"Sentiment trend chart has been saved as '{filename}'\n\n"
+                   f"Summary:\n"
+                   f"• Period: {trends.index[0]:%Y-%m-%d} to {trends.index[-1]:%Y-%m-%d}\n"
+                   f"• Positive share (last 7 days): {latest['positive_ratio']*100:.1f}%\n"
+                   f"• Negative share (last 7 days): {latest['negative_ratio']*100:.1f}%\n"
+                   f"• Weighted score (last 7 days): {latest['score']:.2f}" +
+                   ("\n\nBy source (latest 7 days with reviews):\n" + "\n".join(source_lines) if source_lines else ""))
+        
+        key = ("trends", self.dataset_version, CHART_DPI)
+        self.render_chart(key, filename, "Trends Complete", message, "✅ Sentiment trends complete",
+                          render_trend_chart, trends, dpi=CHART_DPI)
+        
+    def render_chart(self, key, filename, title, message, status, render, *args, **kwargs):
+        """Save a chart from the cache, or render it on a worker thread first"""
+        data = self.chart_cache.get(key)
+        if data is not None:
+            self.save_chart(data, filename, title, message, status)
+            return
+            
+        thread = ChartRenderThread(key, render, *args, **kwargs)
+        thread.finished_signal.connect(
+            lambda key, data: self.handle_chart_rendered(key, data, filename, title, message, status))
+        thread.error_signal.connect(self.handle_chart_error)
+        thread.finished.connect(lambda: self.chart_threads.discard(thread))
+        self.chart_threads.add(thread)
+        thread.start()
+        
+    def handle_chart_rendered(self, key, data, filename, title, message, status):
+        self.chart_cache.put(key, data)
+        self.save_chart(data, filename, title, message, status)
+        
+    def save_chart(self, data, filename, title, message, status):
+        with open(filename, "wb") as f:
+            f.write(data)
+        self.status_label.setText(status)
+        QMessageBox.information(self, title, message)
+        
+    def handle_chart_error(self, error_message):
+        self.status_label.setText("❌ Chart generation failed")
+        QMessageBox.critical(self, "Error", error_message)
         
     def export_results(self):
         if self.df is None or len(self.df) == 0:
             QMessageBox.warning(self, "No Data", "No data available to export")
             return
             
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self, 
             "Save Results", 
             f"sentiment_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv", 
-            "CSV Files (*.csv);;All Files (*)"
+            EXPORT_DIALOG_FILTER
         )
         if not file_path:
             return
+        file_path = with_selected_extension(file_path, selected_filter)
             
         try:
             self.status_label.setText("💾 Exporting results...")
-            self.df.to_csv(file_path, index=False)
+            write_reviews(self.df, file_path)
             self.status_label.setText("✅ Export complete")
             QMessageBox.information(self, "Export Complete", 
                                    f"Results successfully exported to:\n{file_path}")
@@ -979,56 +1278,23 @@ class SentimentAnalysisApp(QMainWindow):
             
         self.status_label.setText(f"☁️ Generating {choice.lower()} word cloud...")
         
-        # Filter data based on choice
-        if choice == "ALL":
-            text = " ".join(self.df["text"])
-        else:
-            filtered_df = self.df[self.df["sentiment"] == choice]
-            if len(filtered_df) == 0:
-                QMessageBox.warning(self, "No Data", f"No {choice.lower()} reviews found")
-                return
-            text = " ".join(filtered_df["text"])
-            
-        # Generate word cloud with better styling
-        stopwords = set(STOPWORDS)
-        common_words = {"one", "will", "get", "also", "us", "may", "even", "much", "many", "would", "could", "though"}
-        stopwords.update(common_words)
-        
-        # Choose color scheme based on sentiment
-        if choice == "POSITIVE":
-            colormap = "Greens"
-        elif choice == "NEGATIVE":
-            colormap = "Reds"
-        else:
-            colormap = "viridis"
-        
-        wordcloud = WordCloud(
-            width=1200, height=600, 
-            background_color="white",
-            stopwords=stopwords, 
-            max_words=150,
-            colormap=colormap,
-            relative_scaling=0.5,
-            min_font_size=10
-        ).generate(text)
-                             
-        # Create figure
-        plt.figure(figsize=(15, 8))
-        plt.imshow(wordcloud, interpolation="bilinear")
-        plt.axis("off")
-        plt.title(f"Word Cloud - {choice.title()} Reviews", fontsize=16, fontweight='bold', pad=20)
-        plt.tight_layout()
-        
-        # Save and show the figure
         filename = f"wordcloud_{choice.lower()}.png"
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        self.status_label.setText("✅ Word cloud generated")
+        message = (f"Word cloud has been saved as '{filename}'\n\n"
+                   f"The visualization shows the most frequently used words in {choice.lower()} reviews.")
+        key = ("wordcloud", self.dataset_version, choice, CHART_DPI)
+        cached = self.chart_cache.get(key)
+        if cached is not None:
+            self.save_chart(cached, filename, "Word Cloud Generated", message, "✅ Word cloud generated")
+            return
         
-        QMessageBox.information(self, "Word Cloud Generated", 
-                               f"Word cloud has been saved as '{filename}'\n\n"
-                               f"The visualization shows the most frequently used words in {choice.lower()} reviews.")
+        # Token counts were collected when the reviews came in, so no text is re-tokenized here
+        frequencies = self.word_index.frequencies(None if choice == "ALL" else choice)
+        if not frequencies:
+            QMessageBox.warning(self, "No Data", f"No {choice.lower()} reviews found")
+            return
+            
+        self.render_chart(key, filename, "Word Cloud Generated", message, "✅ Word cloud generated",
+                          render_wordcloud, frequencies, choice, dpi=CHART_DPI)
         
     def summarize_reviews(self):
         if self.df is None or len(self.df) == 0:
@@ -1039,21 +1305,15 @@ class SentimentAnalysisApp(QMainWindow):
         choice_map = {"All Reviews": "ALL", "Positive Only": "POSITIVE", "Negative Only": "NEGATIVE"}
         choice = choice_map[self.wordcloud_type.currentText()]
         
-        # Filter data based on choice
-        if choice == "ALL":
-            reviews = self.df["text"].tolist()
-        else:
-            filtered_df = self.df[self.df["sentiment"] == choice]
-            if len(filtered_df) == 0:
-                QMessageBox.warning(self, "No Data", f"No {choice.lower()} reviews found")
-                return
-            reviews = filtered_df["text"].tolist()
-        
-        # Combine reviews into a single text (limit to prevent memory issues)
-        combined_text = " ".join(reviews[:50])  # Limit to first 50 reviews
+        # Filter data based on choice, keeping reviews grouped by sentiment for the extractive pass
+        groups = self.review_groups(None if choice == "ALL" else choice)
+        if not any(groups.values()):
+            QMessageBox.warning(self, "No Data", f"No {choice.lower()} reviews found")
+            return
+        word_count = sum(len(text.split()) for reviews in groups.values() for text in reviews if text)
         
         # Check if we have enough text to summarize
-        if len(combined_text.strip()) < 100:
+        if sum(len(text.strip()) for reviews in groups.values() for text in reviews if text) < 100:
             QMessageBox.warning(self, "Insufficient Data", 
                                "Not enough text content to generate a meaningful summary.")
             return
@@ -1068,12 +1328,11 @@ class SentimentAnalysisApp(QMainWindow):
         length_map = {"Short": (50, 20), "Medium": (150, 30), "Long": (250, 50)}
         max_length, min_length = length_map[self.summary_length.currentText()]
         
-        word_count = len(combined_text.split())
         max_length = min(max_length, max(50, word_count // 4))
         min_length = min(min_length, max_length - 20)
     
         # Create and start the summarizer thread
-        self.summarizer_thread = SummarizerThread(combined_text, max_length, min_length)
+        self.summarizer_thread = SummarizerThread(groups, max_length, min_length, cache=self.summary_cache)
         self.summarizer_thread.progress_signal.connect(self.progress_bar.setValue)
         self.summarizer_thread.finished_signal.connect(self.handle_summary_result)
         self.summarizer_thread.error_signal.connect(self.handle_summary_error)
@@ -1104,6 +1363,162 @@ class SentimentAnalysisApp(QMainWindow):
         # Show summary in a custom dialog
         self.show_summary_dialog(formatted_summary, filename)
 
+    def ask_question(self):
+        if self.df is None or len(self.df) == 0:
+            QMessageBox.warning(self, "No Data", "No data available to search")
+            return
+            
+        question, ok = QInputDialog.getText(self, "Ask the Reviews", "What would you like to know from the reviews?")
+        question = question.strip()
+        if not ok or not question:
+            return
+            
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("❓ Searching the reviews..." if self.qa_index is not None
+                                  else "❓ Indexing the reviews for search...")
+        self.ask_button.setEnabled(False)
+        
+        # The index only depends on the review texts, so it is kept until another dataset is loaded
+        texts = None if self.qa_index is not None else self.df["text"].astype(object).tolist()
+        self.qa_thread = CorpusQAThread(question, texts, index=self.qa_index)
+        self.qa_thread.index_signal.connect(lambda index, df=self.df: self.handle_qa_index(index, df))
+        self.qa_thread.progress_signal.connect(self.progress_bar.setValue)
+        self.qa_thread.finished_signal.connect(lambda answers, df=self.df: self.handle_answers(question, answers, df))
+        self.qa_thread.error_signal.connect(self.handle_qa_error)
+        self.qa_thread.start()
+        
+    def handle_qa_index(self, index, df):
+        # Ignore an index finished after another dataset was loaded
+        if df is self.df:
+            self.qa_index = index
+        
+    def handle_answers(self, question, answers, df):
+        self.progress_bar.setVisible(False)
+        self.ask_button.setEnabled(True)
+        # Answers point at row positions of the dataset the question was asked about
+        if df is not self.df:
+            self.status_label.setText("Question answered for a dataset that has since been replaced")
+            return
+        if not answers:
+            self.status_label.setText("❓ No answer found")
+            QMessageBox.information(self, "No Answer", "The reviews don't seem to answer that question.")
+            return
+        self.status_label.setText(f"✅ Found {len(answers)} answers")
+        
+        details = []
+        for rank, answer in enumerate(answers, 1):
+            row = self.df.iloc[answer["review"]] if answer["review"] < len(self.df) else None
+            sentiment = row["sentiment"] if row is not None and pd.notna(row["sentiment"]) else None
+            details.append(f"{rank}. {answer['answer']}  (confidence {answer['score']:.2f}"
+                           f"{', ' + str(sentiment).lower() + ' review' if sentiment is not None else ''})\n"
+                           f"   \"{textwrap.shorten(answer['passage'], width=300)}\"")
+        
+        dialog = QMessageBox(self)
+        dialog.setWindowTitle("❓ Answers from the Reviews")
+        dialog.setIcon(QMessageBox.Information)
+        dialog.setText(f"Q: {question}\n\nBest answer: {answers[0]['answer']}")
+        dialog.setInformativeText("Show details to see every answer with the review it came from.")
+        dialog.setDetailedText("\n\n".join(details))
+        dialog.exec_()
+        
+    def handle_qa_error(self, error_message):
+        self.progress_bar.setVisible(False)
+        self.ask_button.setEnabled(True)
+        self.status_label.setText("❌ Question answering failed")
+        QMessageBox.critical(self, "Q&A Error", error_message)
+
+    def find_similar_reviews(self):
+        if self.df is None or len(self.df) == 0:
+            QMessageBox.warning(self, "No Data", "No data available to search")
+            return
+            
+        query, ok = QInputDialog.getMultiLineText(self, "Find Similar Reviews", "Find reviews similar to:")
+        query = query.strip()
+        if not ok or not query:
+            return
+        self.start_embedding_search("🔎 Searching for similar reviews...",
+                                    lambda result, df: self.handle_similar_reviews(query, result, df), query=query)
+        
+    def show_review_themes(self):
+        if self.df is None or len(self.df) == 0:
+            QMessageBox.warning(self, "No Data", "No data available to analyze")
+            return
+        self.start_embedding_search("🧩 Grouping reviews into themes...", self.handle_review_themes)
+        
+    def start_embedding_search(self, status, handler, query=None):
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.status_label.setText(status)
+        self.similar_button.setEnabled(False)
+        self.themes_button.setEnabled(False)
+        
+        # Reviews encoded during scoring or earlier searches are read from the store, not re-encoded
+        self.embedding_thread = EmbeddingSearchThread(self.embedding_store, self.df["text"].astype(object).tolist(),
+                                                      query=query)
+        self.embedding_thread.progress_signal.connect(self.progress_bar.setValue)
+        # Results are row positions in this dataset and are ignored if another one was loaded meanwhile
+        self.embedding_thread.finished_signal.connect(lambda result, df=self.df: handler(result, df))
+        self.embedding_thread.error_signal.connect(self.handle_embedding_error)
+        self.embedding_thread.start()
+        
+    def close_embedding_progress(self):
+        self.progress_bar.setVisible(False)
+        self.similar_button.setEnabled(True)
+        self.themes_button.setEnabled(True)
+        
+    def review_label(self, position):
+        """Sentiment and shortened text of the review at a row position, for result dialogs"""
+        text, sentiment = self.df[["text", "sentiment"]].iloc[position]
+        label = str(sentiment).lower() if pd.notna(sentiment) else "unscored"
+        return f"[{label}] {textwrap.shorten(str(text), width=200)}"
+        
+    def handle_similar_reviews(self, query, matches, df):
+        self.close_embedding_progress()
+        if df is not self.df:
+            self.status_label.setText("Search finished for a dataset that has since been replaced")
+            return
+        self.status_label.setText(f"✅ Found {len(matches)} similar reviews")
+        details = [f"{rank}. ({score:.2f}) {self.review_label(position)}"
+                   for rank, (position, score) in enumerate(matches, 1)]
+        
+        dialog = QMessageBox(self)
+        dialog.setWindowTitle("🔎 Similar Reviews")
+        dialog.setIcon(QMessageBox.Information)
+        dialog.setText(f"Reviews most similar to:\n\"{textwrap.shorten(query, width=150)}\"")
+        dialog.setInformativeText("Show details to see the matching reviews with their similarity.")
+        dialog.setDetailedText("\n\n".join(details))
+        dialog.exec_()
+        
+    def handle_review_themes(self, themes, df):
+        self.close_embedding_progress()
+        if df is not self.df:
+            self.status_label.setText("Theme search finished for a dataset that has since been replaced")
+            return
+        self.status_label.setText(f"✅ Found {len(themes)} review themes")
+        sentiments = self.df["sentiment"].astype(object).to_numpy()
+        details = []
+        for number, theme in enumerate(themes, 1):
+            labels = pd.Series(sentiments[theme["members"]]).value_counts(normalize=True)
+            shares = ", ".join(f"{label.lower()} {share*100:.0f}%" for label, share in labels.items())
+            details.append(f"Theme {number}: {theme['size']} reviews ({shares or 'unscored'})\n"
+                           f"   {self.review_label(theme['representative'])}")
+        
+        dialog = QMessageBox(self)
+        dialog.setWindowTitle("🧩 Review Themes")
+        dialog.setIcon(QMessageBox.Information)
+        dialog.setText(f"Reviews were grouped into {len(themes)} themes by meaning.")
+        dialog.setInformativeText("Show details to see each theme's size, sentiment mix and most typical review.")
+        dialog.setDetailedText("\n\n".join(details))
+        dialog.exec_()
+        
+    def handle_embedding_error(self, error_message):
+        self.close_embedding_progress()
+        self.status_label.setText("❌ Review search failed")
+        QMessageBox.critical(self, "Search Error", error_message)
+
     def show_summary_dialog(self, summary, filename):
         dialog = QMessageBox(self)
         dialog.setWindowTitle("📝 AI-Generated Summary")
@@ -1,31 +1,52 @@
 import re
+import functools
 import threading
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
 from models import model_loader
+from aspects import find_aspect_mentions, combine_aspects
+from sentiment_windows import window_texts, aggregate_windows
 
 # Initialize thread-local storage
 thread_local = threading.local()
 
-def get_transformer_sentiment(text):
+# Long reviews are scored in overlapping token windows, combined by this rule (see WINDOW_RULES)
+SENTIMENT_WINDOW_RULE = "mean"
+# At most this many windows per review, so very long reviews cost a bounded number of model inputs
+MAX_SENTIMENT_WINDOWS = 8
+
+def _rule_based_sentiment(text):
+    """Sentiment for texts that don't need the model, or None if the model should decide"""
+    # Skip empty text or text that's just metadata
+    if not text or len(text.strip()) < 10 or text.count('\n') > text.count(' '):
+        return "NEUTRAL", 0.5
+        
+    # Handle user metadata without actual review content
+    if re.match(r'^[A-Z]{1,2}\s*\n*[A-Za-z\s]+\s*\n*[A-Z]{2}\s*\n*•\s*\d+\s*reviews*\s*\n*(\d+\s*(days|hours|minutes)\s*ago)?$', text.strip()):
+        return "NEUTRAL", 0.5
+        
+    # Handle rating statistics
+    if re.search(r'(star|reviews|total|\d+%)', text) and not re.search(r'(good|bad|love|hate|terrible|excellent)', text.lower()):
+        return "NEUTRAL", 0.5
+    return None
+
+def get_transformer_sentiment(text, result=None):
+    """Sentiment label and confidence for one review.
+    
+    result can be the model's output for this text when it was already computed in a batch.
+    """
     try:
-        # Skip empty text or text that's just metadata
-        if not text or len(text.strip()) < 10 or text.count('\n') > text.count(' '):
-            return "NEUTRAL", 0.5
-            
-        # Handle user metadata without actual review content
-        if re.match(r'^[A-Z]{1,2}\s*\n*[A-Za-z\s]+\s*\n*[A-Z]{2}\s*\n*•\s*\d+\s*reviews*\s*\n*(\d+\s*(days|hours|minutes)\s*ago)?$', text.strip()):
-            return "NEUTRAL", 0.5
-            
-        # Handle rating statistics
-        if re.search(r'(star|reviews|total|\d+%)', text) and not re.search(r'(good|bad|love|hate|terrible|excellent)', text.lower()):
-            return "NEUTRAL", 0.5
+        rule_result = _rule_based_sentiment(text)
+        if rule_result is not None:
+            return rule_result
         
         # Get raw sentiment from model
-        result = model_loader.sentiment_transformer(text[:512])[0]
+        if result is None:
+            result = sentiment_model_outputs([text])[0]
         score = float(result['score'])
         label = result['label']
         
@@ -124,39 +145,147 @@ def get_transformer_sentiment(text):
         print(f"Error in sentiment analysis: {str(e)}")
         return "NEUTRAL", 0.5
 
+def sentiment_model_outputs(texts, batch_size=32, window_rule=SENTIMENT_WINDOW_RULE, max_windows=MAX_SENTIMENT_WINDOWS):
+    """
+    Raw model result ({"label", "score"}) for each text, reading the whole text instead of its opening.
+    
+    Texts longer than the model's input are split into overlapping token windows; the windows of
+    all texts go through the pipeline together and are combined per text by window_rule.
+    """
+    sentiment = model_loader.sentiment_transformer
+    tokenizer = sentiment.tokenizer
+    max_tokens = (model_loader.sentiment_max_length or 512) - tokenizer.num_special_tokens_to_add()
+    windows, owners = window_texts(texts, tokenizer, max_tokens, max_windows=max_windows)
+    outputs = sentiment(windows, batch_size=batch_size, top_k=None)
+    return aggregate_windows(outputs, owners, len(texts), window_rule)
+
+def get_transformer_sentiment_batch(texts, batch_size=32, window_rule=SENTIMENT_WINDOW_RULE,
+                                    max_windows=MAX_SENTIMENT_WINDOWS):
+    """
+    Score a list of reviews, running the model once over every text the rules can't decide.
+    
+    Args:
+        texts (list): Review texts
+        batch_size (int): Number of texts the pipeline runs through the model at a time
+        window_rule (str): How the windows of a long review are combined (see WINDOW_RULES)
+        max_windows (int): Most windows scored per review
+    
+    Returns:
+        list: (sentiment, confidence) tuples in the same order as texts
+    """
+    results = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        try:
+            results[i] = _rule_based_sentiment(text)
+        except Exception:
+            results[i] = ("NEUTRAL", 0.5)
+        if results[i] is None:
+            pending.append(i)
+            
+    if pending:
+        try:
+            outputs = sentiment_model_outputs([texts[i] for i in pending], batch_size, window_rule, max_windows)
+        except Exception as e:
+            # Fall back to scoring the texts one at a time
+            print(f"Error in batch sentiment analysis: {str(e)}")
+            outputs = [None] * len(pending)
+        for i, output in zip(pending, outputs):
+            results[i] = get_transformer_sentiment(texts[i], result=output)
+    return results
+
+def get_aspect_sentiment_batch(texts, batch_size=32, window_rule=SENTIMENT_WINDOW_RULE,
+                               max_windows=MAX_SENTIMENT_WINDOWS):
+    """
+    Score a list of reviews and the aspects (delivery, price, quality, support) they mention.
+
+    Aspect sentences are found with the aspect lexicon and scored in the same model pass as the
+    reviews; a single-sentence review is scored only once.
+
+    Returns:
+        tuple: ((sentiment, confidence) per review, aspects column value per review)
+    """
+    mentions = find_aspect_mentions(texts)
+    inputs = list(texts)
+    positions = {text: i for i, text in enumerate(inputs)}
+    for _, _, sentence in mentions:
+        if sentence not in positions:
+            positions[sentence] = len(inputs)
+            inputs.append(sentence)
+    scores = get_transformer_sentiment_batch(inputs, batch_size, window_rule, max_windows)
+    aspects = combine_aspects(mentions, [scores[positions[sentence]] for _, _, sentence in mentions], len(texts))
+    return scores[:len(texts)], aspects
+
 # VADER sentiment function removed
 
+# Common patterns in non-review content, all anchored at the start of the text
+NON_REVIEW_PATTERNS = [
+    r'^Certified Buyer$',
+    r'^\d+ months? ago$',
+    r'^[0-5]★$',
+    r'^\d+\.\d+★$',
+    r'^Most (?:Helpful|Recent)$',
+    r'^ABOUT Contact Us$',
+    r'^Terms Of Use$',
+    r'^Privacy$',
+    r'^Copyright ©',
+    r'^All Rights Reserved$',
+]
+NON_REVIEW_REGEX = re.compile(
+    '|'.join(f'(?:{pattern[1:]})' for pattern in NON_REVIEW_PATTERNS), re.IGNORECASE
+)
+
+# Common website navigation elements (only non-reviews if they appear alone)
+NAVIGATION_ELEMENTS = {
+    'home', 'about', 'contact', 'login', 'register', 'cart', 'checkout',
+    'account', 'profile', 'settings', 'help', 'support', 'faq', 'search',
+    'menu', 'categories', 'products', 'services', 'blog', 'news'
+}
+
+@functools.lru_cache(maxsize=None)
+def _min_words_regex(count):
+    """Regex that matches when a text has at least count whitespace-separated words"""
+    return re.compile(r'\s*(?:\S+\s+){%d}\S' % (count - 1))
+
+@functools.lru_cache(maxsize=None)
+def _alpha_table():
+    """Lookup table of str.isalpha() for every code point, built on first use"""
+    return np.fromiter((chr(i).isalpha() for i in range(0x110000)), dtype=bool, count=0x110000)
+
+def alpha_counts(texts, chunk_rows=50_000):
+    """
+    Number of alphabetic characters in each text, counted with numpy instead of per character.
+    
+    Each chunk of texts is encoded to one UTF-32 buffer so its code points can be looked up
+    in a table, and the per-text totals come from a cumulative sum over the text boundaries.
+    
+    Args:
+        texts (list): Strings to count
+    
+    Returns:
+        ndarray: Alphabetic character count per text
+    """
+    table = _alpha_table()
+    counts = np.zeros(len(texts), dtype=np.int64)
+    for start in range(0, len(texts), chunk_rows):
+        chunk = texts[start:start + chunk_rows]
+        buffer = ''.join(chunk).encode('utf-32-le', errors='surrogatepass')
+        is_alpha = table[np.frombuffer(buffer, dtype=np.uint32)]
+        totals = np.concatenate(([0], np.cumsum(is_alpha)))
+        lengths = np.fromiter(map(len, chunk), dtype=np.int64, count=len(chunk))
+        ends = np.cumsum(lengths)
+        counts[start:start + len(chunk)] = totals[ends] - totals[ends - lengths]
+    return counts
+
 def is_non_review_content(text):
     """Check if text is likely not a review but website navigation, footer, etc."""
-    # Common patterns in non-review content
-    non_review_patterns = [
-        r'^Certified Buyer$',
-        r'^\d+ months? ago$',
-        r'^[0-5]★$',
-        r'^\d+\.\d+★$',
-        r'^Most (Helpful|Recent)$',
-        r'^ABOUT Contact Us$',
-        r'^Terms Of Use$',
-        r'^Privacy$',
-        r'^Copyright ©',
-        r'^All Rights Reserved$',
-    ]
-    
     # Check if text matches any non-review pattern
-    for pattern in non_review_patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return True
-    
-    # Check for common website navigation elements (only if they appear alone)
-    navigation_elements = [
-        'home', 'about', 'contact', 'login', 'register', 'cart', 'checkout',
-        'account', 'profile', 'settings', 'help', 'support', 'faq', 'search',
-        'menu', 'categories', 'products', 'services', 'blog', 'news'
-    ]
+    if NON_REVIEW_REGEX.match(text):
+        return True
     
     # If text consists only of navigation elements, it's likely not a review
     words = text.lower().split()
-    if words and len(words) <= 2 and all(word in navigation_elements for word in words):
+    if words and len(words) <= 2 and all(word in NAVIGATION_ELEMENTS for word in words):
         return True
             
     # Check if text is too short to be a meaningful review
@@ -170,6 +299,156 @@ def is_non_review_content(text):
     
     return False
 
+def is_non_review_series(texts):
+    """
+    Vectorized is_non_review_content for a whole column of texts.
+    
+    Args:
+        texts (Series): Review texts; non-string entries count as non-reviews
+    
+    Returns:
+        Series: Boolean mask, True where the entry is not a review
+    """
+    mask = pd.Series(True, index=texts.index)
+    if pd.api.types.is_object_dtype(texts):
+        is_str = texts.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    else:
+        is_str = texts.notna().to_numpy(dtype=bool)
+    text = texts[is_str].astype(object).reset_index(drop=True)
+    if len(text) == 0:
+        return mask
+    
+    flagged = text.str.match(NON_REVIEW_REGEX).to_numpy(dtype=bool, copy=True)
+    # Navigation-only texts have at most two words, so the word count check covers them
+    flagged |= ~text.str.match(_min_words_regex(4)).to_numpy(dtype=bool)
+    
+    # Alpha ratio only matters for longer texts that haven't been flagged yet
+    lengths = text.str.len().to_numpy()
+    pending = ~flagged & (lengths > 20)
+    if pending.any():
+        flagged[pending] = alpha_counts(text[pending].tolist()) / lengths[pending] < 0.4
+    
+    mask[is_str] = flagged
+    return mask
+
+def drop_non_reviews(texts):
+    """Return the texts that look like reviews, in their original order"""
+    texts = pd.Series(list(texts), dtype=object)
+    return texts[~is_non_review_series(texts)].tolist()
+
+# Patterns for scraped content that isn't a review
+CSV_NON_REVIEW_PATTERNS = [
+    # Navigation and category patterns
+    r'^Shop by (?:Price|Features|Identity)',
+    r'Under \d+',
+    r'Above \d+',
+    # Product listings
+    r'^[a-zA-Z]+ (?:Headphones|Speakers|Earbuds|Soundbars|Smartwatch|Power Bank)',
+    r'^\w+ [A-Z]\w+ \d+',
+    # Footer content
+    r'^© \d+ .* All Rights Reserved',
+    r'^Address Unit No',
+    r'^For Consumer Complaints',
+    # Q&A sections that aren't reviews
+    r'^Q\.\s',
+    # Product specifications
+    r'^Net Content \d+ UNIT',
+    # Promotional content
+    r'^Get \d+% OFF',
+    r'^Redeem upto \d+% off',
+    # Sort options and filters
+    r'^Most Recent Highest Rating Lowest Rating',
+    # Download instructions
+    r'^Download user manual',
+]
+
+# Anchored patterns only need one match attempt at the start of the text, so they are
+# kept apart from the few that can match anywhere (a single alternation of all of them
+# is tried at every position and is much slower)
+CSV_ANCHORED_REGEX = re.compile('|'.join(
+    f'(?:{pattern[1:]})' for pattern in CSV_NON_REVIEW_PATTERNS if pattern.startswith('^')
+))
+CSV_UNANCHORED_REGEX = re.compile('|'.join(
+    f'(?:{pattern})' for pattern in CSV_NON_REVIEW_PATTERNS if not pattern.startswith('^')
+))
+
+PRODUCT_SPEC_INDICATORS = ['equipped with', 'designed for', 'features', 'technology', 'battery capacity']
+CSV_NAV_ELEMENTS = ['home', 'about', 'contact', 'login', 'register', 'cart', 'checkout', 'search']
+
+# Whole-word match of a navigation element, using the same whitespace rules as str.split()
+CSV_NAV_REGEX = re.compile(r'(?:^|\s)(?:' + '|'.join(CSV_NAV_ELEMENTS) + r')(?=\s|$)')
+SPEC_INDICATOR_REGEX = re.compile('|'.join(re.escape(indicator) for indicator in PRODUCT_SPEC_INDICATORS))
+
+def _flag(text, flagged, check):
+    """Run check on the entries not flagged yet and flag the ones it matches"""
+    pending = ~flagged
+    if pending.any():
+        flagged[pending] = check(text[pending]).to_numpy(dtype=bool)
+
+def _narrow(check, *conditions):
+    """Chain checks so each one only runs on the entries that passed the previous ones"""
+    def run(text):
+        result = pd.Series(True, index=text.index)
+        for condition in (check,) + conditions:
+            if not result.any():
+                break
+            result[result] = condition(text[result]).to_numpy(dtype=bool)
+        return result
+    return run
+
+def non_review_mask(texts):
+    """
+    Vectorized check for scraped entries that are not reviews.
+    
+    Each check only runs on the entries that earlier checks haven't already flagged.
+    
+    Args:
+        texts (Series): Review texts; non-string entries count as non-reviews
+    
+    Returns:
+        Series: Boolean mask, True where the entry is not a review
+    """
+    mask = pd.Series(True, index=texts.index)
+    if not (pd.api.types.is_object_dtype(texts) or pd.api.types.is_string_dtype(texts)):
+        return mask
+        
+    if pd.api.types.is_object_dtype(texts):
+        is_str = texts.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    else:
+        is_str = texts.notna().to_numpy(dtype=bool)
+    # Object dtype keeps Python's re semantics (e.g. Unicode \s) even for Arrow-backed strings
+    text = texts[is_str].astype(object).reset_index(drop=True)
+    if len(text) == 0:
+        return mask
+    flagged = np.zeros(len(text), dtype=bool)
+    
+    # Check against patterns
+    _flag(text, flagged, lambda t: t.str.match(CSV_ANCHORED_REGEX))
+    _flag(text, flagged, lambda t: t.str.contains(CSV_UNANCHORED_REGEX))
+    
+    # Check if it's a product description (long text with specifications)
+    _flag(text, flagged, _narrow(
+        lambda t: t.str.len() > 100,
+        lambda t: t.str.contains('mAh|Bluetooth'),
+        lambda t: t.str.lower().str.contains('hours|playback'),
+        lambda t: t.str.lower().str.contains(SPEC_INDICATOR_REGEX),
+    ))
+    
+    # Check for website navigation elements (counting words only where one is present)
+    _flag(text, flagged, _narrow(
+        lambda t: t.str.lower().str.contains(CSV_NAV_REGEX),
+        lambda t: t.str.split().str.len() <= 3,
+    ))
+    
+    # Check for product categories
+    _flag(text, flagged, _narrow(
+        lambda t: t.str.contains('|', regex=False),
+        lambda t: t.str.lower().str.contains('wireless|bluetooth'),
+    ))
+    
+    mask[is_str] = flagged
+    return mask
+
 def clean_csv_data(df):
     """
     Clean DataFrame by removing entries that are likely not reviews.
@@ -182,105 +461,78 @@ def clean_csv_data(df):
     """
     if df is None or len(df) == 0:
         return df, 0
-        
-    # Define patterns for non-review content
-    non_review_patterns = [
-        # Navigation and category patterns
-        r'^Shop by (Price|Features|Identity)',
-        r'Under \d+',
-        r'Above \d+',
-        # Product listings
-        r'^[a-zA-Z]+ (Headphones|Speakers|Earbuds|Soundbars|Smartwatch|Power Bank)',
-        r'^\w+ [A-Z]\w+ \d+',
-        # Footer content
-        r'^© \d+ .* All Rights Reserved',
-        r'^Address Unit No',
-        r'^For Consumer Complaints',
-        # Q&A sections that aren't reviews
-        r'^Q\.\s',
-        # Product specifications
-        r'^Net Content \d+ UNIT',
-        # Promotional content
-        r'^Get \d+% OFF',
-        r'^Redeem upto \d+% off',
-        # Sort options and filters
-        r'^Most Recent Highest Rating Lowest Rating',
-        # Download instructions
-        r'^Download user manual',
-    ]
-    
-    # Function to check if a text matches any non-review pattern
-    def is_not_review(text):
-        if not isinstance(text, str):
-            return True
-            
-        # Check against patterns
-        for pattern in non_review_patterns:
-            if re.search(pattern, text):
-                return True
-            
-        # Check if it's a product description (long text with specifications)
-        if len(text) > 100 and ('mAh' in text or 'Bluetooth' in text) and ('hours' in text.lower() or 'playback' in text.lower()):
-            product_spec_indicators = ['equipped with', 'designed for', 'features', 'technology', 'battery capacity']
-            if any(indicator in text.lower() for indicator in product_spec_indicators):
-                return True
-            
-        # Check for website navigation elements
-        nav_elements = ['home', 'about', 'contact', 'login', 'register', 'cart', 'checkout', 'search']
-        words = text.lower().split()
-        if len(words) <= 3 and any(word in nav_elements for word in words):
-            return True
-            
-        # Check for product categories
-        if text.count('|') > 0 and ('wireless' in text.lower() or 'bluetooth' in text.lower()):
-            return True
-            
-        return False
     
     # Filter out non-review content
     original_count = len(df)
-    df_cleaned = df[~df['text'].apply(is_not_review)]
+    df_cleaned = df[~non_review_mask(df['text'])]
     removed_count = original_count - len(df_cleaned)
     
     return df_cleaned, removed_count
 
+# Metadata stripped from scraped review text
+REVIEW_METADATA_PATTERNS = [
+    # User identifiers like "BO Bonnie US • 1 review 13 hours ago"
+    re.compile(r'^[A-Z]{1,2}\s+[\w\s]+•\s+\d+\s+reviews?\s+.*?ago'),
+    # Date of experience
+    re.compile(r'Date of experience:.*?$'),
+    # "Useful Share" and similar endings
+    re.compile(r'Useful\s+Share\s*$'),
+]
+# Literal text each metadata pattern requires, used to skip texts none of them can match
+REVIEW_METADATA_MARKERS = re.compile('•|Date of experience:|Useful')
+
 def clean_text(text):
     """Clean review text by removing metadata and formatting"""
-    # Remove user identifiers like "BO Bonnie US • 1 review 13 hours ago"
-    text = re.sub(r'^[A-Z]{1,2}\s+[\w\s]+•\s+\d+\s+reviews?\s+.*?ago', '', text)
-    # Remove date of experience
-    text = re.sub(r'Date of experience:.*?$', '', text)
-    # Remove "Useful Share" and similar endings
-    text = re.sub(r'Useful\s+Share\s*$', '', text)
+    for pattern in REVIEW_METADATA_PATTERNS:
+        text = pattern.sub('', text)
     # Remove any remaining leading/trailing whitespace
     text = text.strip()
     return text
 
+def clean_text_series(texts):
+    """Vectorized clean_text for a whole column of texts (non-strings become NaN)"""
+    texts = texts.astype(object)
+    # Only texts containing one of the metadata markers need the substitutions
+    has_metadata = texts.str.contains(REVIEW_METADATA_MARKERS).fillna(False).to_numpy(dtype=bool)
+    if has_metadata.any():
+        subset = texts[has_metadata]
+        for pattern in REVIEW_METADATA_PATTERNS:
+            subset = subset.str.replace(pattern, '', regex=True)
+        texts = texts.copy()
+        texts[has_metadata] = subset
+    return texts.str.strip()
+
 def process_review_batch(reviews, source_url):
     """Process a batch of reviews and analyze their sentiment"""
     results = []
-    for review in reviews:
-        # Clean the review text first
-        cleaned_review = clean_text(review)
-        
-        # Skip if the review is too short after cleaning
-        if len(cleaned_review.split()) < 5:
-            continue
-            
-        try:
-            # Use the existing transformer sentiment function
-            sentiment, confidence = get_transformer_sentiment(cleaned_review)
-            
+    reviews = pd.Series(list(reviews), dtype=object)
+    # Clean the whole batch first
+    cleaned_reviews = clean_text_series(reviews)
+    
+    # Skip reviews that are too short after cleaning
+    long_enough = cleaned_reviews.str.match(_min_words_regex(5)).fillna(False).to_numpy(dtype=bool)
+    reviews = reviews[long_enough].tolist()
+    if not reviews:
+        return results
+    
+    try:
+        # Score the whole batch and its aspect sentences with one model call
+        scores, aspects = get_aspect_sentiment_batch(cleaned_reviews[long_enough].tolist())
+        model_version = model_loader.model_version
+        scored_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for review, (sentiment, confidence), review_aspects in zip(reviews, scores, aspects):
             results.append([
                 review,
                 sentiment,
                 source_url,
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                scored_at,
                 "Unknown",
                 "Unknown",
-                confidence
+                confidence,
+                model_version,
+                review_aspects
             ])
-        except Exception as e:
-            print(f"Error processing review: {str(e)}")
+    except Exception as e:
+        print(f"Error processing reviews: {str(e)}")
     
     return results
@@ -0,0 +1,150 @@
+from collections import Counter
+import numpy as np
+import pandas as pd
+from wordcloud import STOPWORDS
+
+# Same word pattern WordCloud uses when tokenizing text itself
+TOKEN_PATTERN = r"\w[\w']+"
+
+# Lowercased once here instead of on every word cloud
+WORDCLOUD_STOPWORDS = frozenset(word.lower() for word in set(STOPWORDS) | {
+    "one", "will", "get", "also", "us", "may", "even", "much", "many", "would", "could", "though"
+})
+
+def iter_tokens(texts, chunk_rows=20_000):
+    """
+    Tokenize a Series of texts the way the word cloud counts words, a chunk of rows at a time.
+    
+    Tokens are lowercased and lose a trailing "'s", and stopwords and pure numbers are dropped,
+    roughly as WordCloud.process_text does.
+    
+    Yields:
+        Series: One token per entry, indexed by the position of the text it came from
+    """
+    texts = texts.reset_index(drop=True)
+    for start in range(0, len(texts), chunk_rows):
+        chunk = texts.iloc[start:start + chunk_rows].dropna().astype(str)
+        tokens = chunk.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+        tokens = tokens.str.replace(r"'s$", "", regex=True)
+        tokens = tokens[~tokens.isin(WORDCLOUD_STOPWORDS) & ~tokens.str.isdigit()]
+        if len(tokens):
+            yield tokens
+
+class CountMinTopK:
+    """Count-min sketch with a heavy-hitter table, for token streams too large to count exactly.
+
+    Estimates never undercount; the table keeps the k tokens with the highest estimates.
+    """
+
+    def __init__(self, width=2 ** 16, depth=4, k=2000, seed=0):
+        self.width = width
+        self.depth = depth
+        self.k = k
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        # Odd multipliers for multiply-shift hashing into a power-of-two width
+        self.multipliers = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) | np.uint64(1)
+        self.shift = np.uint64(64 - int(np.log2(width)))
+        self.top = {}
+
+    def _columns(self, tokens):
+        hashes = np.fromiter((hash(token) for token in tokens), dtype=np.int64, count=len(tokens)).view(np.uint64)
+        with np.errstate(over="ignore"):
+            return (hashes[None, :] * self.multipliers[:, None]) >> self.shift
+
+    def estimate(self, tokens):
+        columns = self._columns(tokens)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def update(self, counts, sign=1):
+        """Add (or with sign=-1, remove) a mapping of token -> count"""
+        tokens = list(counts.keys())
+        if not tokens:
+            return
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(tokens)) * sign
+        columns = self._columns(tokens)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row].astype(np.int64), values)
+
+        # Refresh the heavy hitters touched by this update
+        candidates = set(tokens) | set(self.top)
+        candidates = list(candidates)
+        estimates = self.estimate(candidates)
+        self.top = {token: int(value) for token, value in zip(candidates, estimates) if value > 0}
+        if len(self.top) > self.k:
+            self.top = dict(Counter(self.top).most_common(self.k))
+
+    def most_common(self, n=None):
+        return Counter(self.top).most_common(n)
+
+    def __len__(self):
+        return len(self.top)
+
+class WordFrequencyIndex:
+    """Token frequencies per sentiment and per source, kept up to date as reviews are added or removed"""
+
+    def __init__(self, max_vocabulary=200_000):
+        self.max_vocabulary = max_vocabulary
+        self.by_sentiment = {}
+        self.by_source = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        index = cls()
+        index.add_frame(df)
+        return index
+
+    def add_frame(self, df):
+        self._update(df, 1)
+
+    def remove_frame(self, df):
+        self._update(df, -1)
+
+    def _update(self, df, sign):
+        if df is None or len(df) == 0:
+            return
+        groupings = [
+            (df[column].astype(object).fillna("UNKNOWN").to_numpy(), tables)
+            for column, tables in (("sentiment", self.by_sentiment), ("source", self.by_source))
+        ]
+        # Texts are tokenized once; the tokens are then counted per sentiment and per source
+        for tokens in iter_tokens(df["text"]):
+            positions = tokens.index.to_numpy()
+            words = tokens.to_numpy()
+            for keys, tables in groupings:
+                counts = pd.Series(1, index=[keys[positions], words]).groupby(level=[0, 1], sort=False).sum()
+                for key in counts.index.get_level_values(0).unique():
+                    group = counts.xs(key, level=0)
+                    self._apply(tables, key, dict(zip(group.index, group.to_numpy().tolist())), sign)
+
+    def _apply(self, tables, key, counts, sign):
+        table = tables.get(key)
+        if isinstance(table, CountMinTopK):
+            table.update(counts, sign)
+            return
+        table = tables.setdefault(key, Counter())
+        if sign > 0:
+            table.update(counts)
+        else:
+            table.subtract(counts)
+            for token in [token for token in counts if table[token] <= 0]:
+                del table[token]
+        # Switch to the sketch once the exact table's vocabulary grows too large
+        if len(table) > self.max_vocabulary:
+            sketch = CountMinTopK()
+            sketch.update(table)
+            tables[key] = sketch
+
+    def frequencies(self, sentiment=None, source=None, top=1000):
+        """Most common tokens for one sentiment, one source, or all reviews, as a dict for WordCloud"""
+        if source is not None:
+            tables = [self.by_source.get(source)]
+        elif sentiment is not None:
+            tables = [self.by_sentiment.get(sentiment)]
+        else:
+            tables = list(self.by_sentiment.values())
+        merged = Counter()
+        for table in tables:
+            if table is not None:
+                merged.update(dict(table.most_common(top if len(tables) == 1 else None)))
+        return dict(merged.most_common(top))